@@ -0,0 +1,66 @@
+# benchmarks/bench_article_memory.py
+"""
+Article 内存占用基准：对比旧版（实例 __dict__、标签不驻留）与当前实现的每篇文章字节数
+
+用法: python -m benchmarks.bench_article_memory [--data article_data.json] [--repeat N]
+"""
+import argparse
+import json
+import tracemalloc
+from typing import Dict, List
+
+from core.article import Article
+from core.json_stream import iter_json_array
+
+
+class LegacyArticle:
+    """旧版 Article 的等价实现，仅用于对比"""
+
+    def __init__(self, title: str, tags: List[str] = None, article_id: str = None):
+        self.id = article_id
+        self.title = title
+        self.tags = []
+        seen = set()
+        for tag in (tags or []):
+            if tag and tag not in seen:
+                seen.add(tag)
+                self.tags.append(tag)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'LegacyArticle':
+        return cls(title=data.get("title", ""), tags=data.get("tags", []),
+                   article_id=data.get("id"))
+
+
+def measure(cls, records: List[str]) -> int:
+    """从 JSON 文本逐条构建文章，返回构建完成后仍被持有的内存字节数"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    articles = [cls.from_dict(json.loads(record)) for record in records]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    assert len(articles) == len(records)
+    return after - before
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Article 内存占用基准")
+    parser.add_argument("--data", default="article_data.json", help="数据文件路径")
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="语料重复次数（重复的标签可体现字符串驻留的效果）")
+    args = parser.parse_args()
+
+    with open(args.data, 'r', encoding='utf-8') as f:
+        base = [json.dumps(item, ensure_ascii=False) for item in iter_json_array(f, "articles")]
+    records = base * args.repeat
+
+    result = {"articles": len(records)}
+    for name, cls in (("legacy", LegacyArticle), ("current", Article)):
+        total = measure(cls, records)
+        result[name] = {"bytes_total": total, "bytes_per_article": round(total / len(records), 1)}
+    result["saving_ratio"] = round(1 - result["current"]["bytes_total"] / result["legacy"]["bytes_total"], 3)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
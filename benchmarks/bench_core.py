@@ -0,0 +1,162 @@
+# benchmarks/bench_core.py
+"""
+核心路径基准：在合成语料上测量加载、保存、按 ID 查找、精确/模糊标签搜索、
+标题搜索与零标签列表，输出吞吐量、p50/p99 延迟与峰值内存（JSON）
+
+用法:
+    python -m benchmarks.bench_core --sizes 1000 10000 -o bench.json
+    python -m benchmarks.bench_core --sizes 1000 --compare bench.json   # 与上次结果对比
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Sequence
+
+from core.article import Article
+from core.data_manager import DataManager
+
+from .corpus import generate_articles, sample_keywords, write_corpus
+
+# 测峰值内存时最多重复的次数（tracemalloc 本身很慢，不参与计时）
+MEMORY_SAMPLES = 20
+
+
+def _percentile(sorted_values: Sequence[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def measure(operation: Callable[[int], object], iterations: int,
+            memory_samples: int = MEMORY_SAMPLES) -> Dict:
+    """执行 operation(i) 若干次，返回延迟分布、吞吐量与峰值内存"""
+    latencies = []
+    start = time.perf_counter()
+    for i in range(iterations):
+        t0 = time.perf_counter()
+        operation(i)
+        latencies.append(time.perf_counter() - t0)
+    total = time.perf_counter() - start
+
+    tracemalloc.start()
+    for i in range(min(iterations, memory_samples)):
+        operation(i)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        "iterations": iterations,
+        "total_s": round(total, 6),
+        "ops_per_s": round(iterations / total, 2) if total else None,
+        "p50_ms": round(_percentile(latencies, 50) * 1000, 4),
+        "p99_ms": round(_percentile(latencies, 99) * 1000, 4),
+        "peak_mem_bytes": peak,
+    }
+
+
+def bench_size(size: int, queries: int, workdir: str) -> Dict[str, Dict]:
+    data_file = os.path.join(workdir, f"corpus_{size}.json")
+    write_corpus(data_file, size)
+    sample = list(generate_articles(min(size, 5000)))
+    keyword_queries = sample_keywords(sample, queries)
+    rng = random.Random(2)
+    ids = [f"{rng.randrange(size):08x}" for _ in range(queries)]
+    exact_tags = [[rng.choice(a["tags"])] for a in rng.sample(sample, min(queries, len(sample))) if a["tags"]]
+    title_keywords = [[kws[0][:3]] for kws in keyword_queries]
+
+    quiet = io.StringIO()
+    results: Dict[str, Dict] = {}
+    holder: Dict[str, DataManager] = {}
+
+    def load(_):
+        holder["dm"] = DataManager(data_file, log_stream=quiet)
+
+    results["load"] = measure(load, 3, memory_samples=1)
+    dm = holder["dm"]
+
+    results["save"] = measure(lambda _: dm.save_data(), 3, memory_samples=1)
+    results["find_by_id"] = measure(lambda i: dm.find_article_by_id(ids[i % len(ids)]), queries)
+    results["exact_tag_search"] = measure(
+        lambda i: dm.search_articles_by_tags(exact_tags[i % len(exact_tags)]), queries)
+    results["fuzzy_tag_search"] = measure(
+        lambda i: dm.fuzzy_search_by_tags(keyword_queries[i % len(keyword_queries)]), queries)
+    results["title_search"] = measure(
+        lambda i: dm.search_titles(title_keywords[i % len(title_keywords)]), queries)
+    results["zero_tag_list"] = measure(lambda _: dm.get_zero_tag_articles(), max(10, queries // 10))
+
+    target = dm.find_article_by_id(ids[0])
+    results["update_tags"] = measure(
+        lambda i: dm.update_article_tags(target, [f"基准测试标签{i}"]), max(10, queries // 10))
+    results["add_article"] = measure(
+        lambda i: dm.add_article(Article(f"基准测试文章{i}", ["基准测试"], existing_ids=dm)),
+        max(10, queries // 10))
+    return results
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(old: Dict, new: Dict) -> None:
+    """打印两次结果的 p50 延迟变化（正数表示变慢）"""
+    print(f"{'size':>8} {'operation':<18} {'old p50 ms':>12} {'new p50 ms':>12} {'change':>8}")
+    for size, ops in new["results"].items():
+        for op, stats in ops.items():
+            old_stats = old.get("results", {}).get(size, {}).get(op)
+            if not old_stats or not old_stats["p50_ms"]:
+                continue
+            change = stats["p50_ms"] / old_stats["p50_ms"] - 1
+            print(f"{size:>8} {op:<18} {old_stats['p50_ms']:>12.4f} {stats['p50_ms']:>12.4f} {change:>+8.1%}")
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="DataManager 核心路径基准")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000],
+                        help="语料规模（文章数），可给多个，如 1000 100000 1000000")
+    parser.add_argument("--queries", type=int, default=200, help="每种查询的次数")
+    parser.add_argument("-o", "--output", help="结果 JSON 输出文件，默认打印到标准输出")
+    parser.add_argument("--compare", help="与之前保存的结果 JSON 对比")
+    args = parser.parse_args(argv)
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": {},
+    }
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in args.sizes:
+            print(f"正在测试 {size} 篇文章的语料...", file=sys.stderr)
+            report["results"][str(size)] = bench_size(size, args.queries, workdir)
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            compare(json.load(f), report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# benchmarks/bench_parallel_search.py
+"""
+并行搜索基准：在合成语料上对比单进程模糊搜索（n-gram / 标题缓冲区索引）
+与不同工作进程数的分片搜索，输出延迟、吞吐量及相对 1 个工作进程的加速比（JSON）
+
+用法:
+    python -m benchmarks.bench_parallel_search --size 200000 --workers 1 2 4 8 -o parallel.json
+"""
+import argparse
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+from core.data_manager import DataManager
+from core.parallel_search import ShardedSearchExecutor
+from core.title_search import normalize_text
+
+from .bench_core import measure
+from .corpus import generate_articles, sample_keywords, write_corpus
+
+
+def bench(size: int, worker_counts: List[int], queries: int, workdir: str) -> Dict:
+    data_file = os.path.join(workdir, f"corpus_{size}.json")
+    write_corpus(data_file, size)
+    raw = list(generate_articles(size))
+    dm = DataManager(data_file, log_stream=io.StringIO())
+    tag_queries = sample_keywords(raw, queries, seed=5)
+    title_queries = [[normalize_text(kw[:3]) for kw in keywords] for keywords in sample_keywords(raw, queries, seed=6)]
+
+    def single_tags(i: int) -> None:
+        dm.search_cache.clear()
+        dm.fuzzy_search_by_tags(tag_queries[i % queries])
+
+    def single_titles(i: int) -> None:
+        dm.search_cache.clear()
+        dm.search_titles(title_queries[i % queries])
+
+    results: Dict[str, Dict] = {
+        "single_process": {
+            "fuzzy_tags": measure(single_tags, queries, memory_samples=1),
+            "title": measure(single_titles, queries, memory_samples=1),
+        }
+    }
+    entries = [(a.id, dm.title_index.normalized_title(a.id), a.tags) for a in dm.iter_articles()]
+    for workers in worker_counts:
+        print(f"  {workers} 个工作进程...", file=sys.stderr)
+        with ShardedSearchExecutor(workers) as executor:
+            start = time.perf_counter()
+            executor.load(entries, dm.revision)
+            load_s = time.perf_counter() - start
+            results[f"workers_{workers}"] = {
+                "load_s": round(load_s, 4),
+                "fuzzy_tags": measure(lambda i: executor.search("tags", tag_queries[i % queries]),
+                                      queries, memory_samples=1),
+                "title": measure(lambda i: executor.search("title", title_queries[i % queries]),
+                                 queries, memory_samples=1),
+            }
+
+    baseline = results.get(f"workers_{worker_counts[0]}")
+    for workers in worker_counts:
+        entry = results[f"workers_{workers}"]
+        entry["speedup"] = {
+            kind: round(baseline[kind]["p50_ms"] / entry[kind]["p50_ms"], 2) if entry[kind]["p50_ms"] else None
+            for kind in ("fuzzy_tags", "title")
+        }
+    dm.close()
+    return results
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="分片并行模糊搜索基准")
+    parser.add_argument("--size", type=int, default=200000, help="语料规模（文章数）")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1],
+                        help="要测试的工作进程数，加速比以第一个为基准")
+    parser.add_argument("--queries", type=int, default=100, help="每项查询次数")
+    parser.add_argument("-o", "--output", help="结果 JSON 输出文件，默认打印到标准输出")
+    args = parser.parse_args(argv)
+
+    worker_counts = sorted(set(args.workers), key=args.workers.index)
+    print(f"正在测试 {args.size} 篇文章的并行搜索...", file=sys.stderr)
+    with tempfile.TemporaryDirectory() as workdir:
+        results = bench(args.size, worker_counts, args.queries, workdir)
+    report = {"cpu_count": os.cpu_count(), "corpus_size": args.size, "results": results}
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
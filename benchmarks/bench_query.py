@@ -0,0 +1,105 @@
+# benchmarks/bench_query.py
+"""
+查询语言基准：在合成语料上对比查询语言（索引裁剪 + 单趟校验）与用现有接口多次搜索再组合的写法，
+输出各类查询的延迟（JSON）；结果缓存每次清空，测的是实际计算
+
+    and_not   "a" NOT tag:=t         对照：模糊标签搜索 a 后逐篇排除含标签 t 的文章
+    or_tags   tag:"a" OR tag:"b"     对照：两次模糊标签搜索后按显示顺序合并
+    mixed     tag:"a" title:"b"      对照：标签搜索与标题搜索各一次后求交
+
+用法:
+    python -m benchmarks.bench_query --size 100000 --queries 100 -o query.json
+"""
+import argparse
+import io
+import json
+import os
+import sys
+import tempfile
+from typing import Callable, Dict, List
+
+from core.data_manager import DataManager
+
+from .bench_core import measure
+from .corpus import generate_articles, sample_keywords, write_corpus
+
+
+def _quote(keyword: str) -> str:
+    return '"' + keyword.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def bench(size: int, queries: int, workdir: str) -> Dict:
+    data_file = os.path.join(workdir, f"corpus_{size}.json")
+    write_corpus(data_file, size)
+    raw = list(generate_articles(size))
+    dm = DataManager(data_file, log_stream=io.StringIO())
+    # 标签 n-gram 索引首次搜索时才构建，不计入查询耗时
+    dm.tag_index
+    pairs = [(keywords[0], keywords[-1]) for keywords in sample_keywords(raw, queries, seed=7)]
+    whole_tags = [article["tags"][0] for article in raw[:queries] if article["tags"]] or [""]
+
+    def and_not_baseline(i: int) -> List:
+        tag = whole_tags[i % len(whole_tags)]
+        return [a for a in dm.fuzzy_search_by_tags([pairs[i % queries][0]]) if not a.has_tag(tag)]
+
+    def or_baseline(i: int) -> List:
+        a, b = pairs[i % queries]
+        found = {article.id for article in dm.fuzzy_search_by_tags([a]) + dm.fuzzy_search_by_tags([b])}
+        return [article for article in dm.iter_articles() if article.id in found]
+
+    def mixed_baseline(i: int) -> List:
+        a, b = pairs[i % queries]
+        titles = {article.id for article in dm.search_titles([b])}
+        return [article for article in dm.fuzzy_search_by_tags([a]) if article.id in titles]
+
+    cases: Dict[str, tuple] = {
+        "and_not": (lambda i: f"{_quote(pairs[i % queries][0])} NOT tag:={_quote(whole_tags[i % len(whole_tags)])}",
+                    and_not_baseline),
+        "or_tags": (lambda i: f"tag:{_quote(pairs[i % queries][0])} OR tag:{_quote(pairs[i % queries][1])}",
+                    or_baseline),
+        "mixed": (lambda i: f"tag:{_quote(pairs[i % queries][0])} title:{_quote(pairs[i % queries][1])}",
+                  mixed_baseline),
+    }
+
+    def uncached(operation: Callable[[int], object]) -> Callable[[int], object]:
+        def run(i: int) -> object:
+            dm.search_cache.clear()
+            return operation(i)
+        return run
+
+    results = {}
+    for name, (make_query, baseline) in cases.items():
+        print(f"  {name}...", file=sys.stderr)
+        explain = dm.explain_query(make_query(0))
+        results[name] = {
+            "example": explain["query"],
+            "example_steps": explain["steps"],
+            "query_language": measure(uncached(lambda i: dm.query(make_query(i))), queries, memory_samples=1),
+            "separate_searches": measure(uncached(baseline), queries, memory_samples=1),
+        }
+    dm.close()
+    return results
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="查询语言基准")
+    parser.add_argument("--size", type=int, default=100000, help="语料规模（文章数）")
+    parser.add_argument("--queries", type=int, default=100, help="每类查询次数")
+    parser.add_argument("-o", "--output", help="结果 JSON 输出文件，默认打印到标准输出")
+    args = parser.parse_args(argv)
+
+    print(f"正在测试 {args.size} 篇文章的查询语言...", file=sys.stderr)
+    with tempfile.TemporaryDirectory() as workdir:
+        results = bench(args.size, args.queries, workdir)
+    report = {"corpus_size": args.size, "results": results}
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+# benchmarks/bench_snapshot.py
+"""
+快照格式基准：对比 JSON 快照（indent=4）与二进制快照的文件大小、完整加载耗时，
+二进制快照内存映射打开、按序号/ID 访问单篇文章的耗时，
+以及 DataManager 分别以两种快照启动的耗时、启动后仍占用的内存与已解码成 Article 的篇数（JSON 输出）
+
+用法:
+    python -m benchmarks.bench_snapshot --sizes 10000 100000 -o snapshot.json
+"""
+import argparse
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import tracemalloc
+from typing import Dict, List
+
+from core.article import Article
+from core.binary_snapshot import BinarySnapshot, SnapshotArticles
+from core.data_manager import DataManager
+from core.storage import BinaryStorage, JsonStorage
+
+from .bench_core import measure
+from .corpus import generate_articles
+
+
+def _retained_after_startup(path: str, quiet: io.StringIO) -> Dict[str, int]:
+    """启动 DataManager 后仍占用的内存，以及其中已解码成 Article 的篇数"""
+    tracemalloc.start()
+    dm = DataManager(path, log_stream=quiet)
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    try:
+        articles = dm._articles
+        decoded = articles.decoded_count if isinstance(articles, SnapshotArticles) else len(articles)
+        return {"retained_mem_bytes": retained, "articles_decoded": decoded}
+    finally:
+        dm.close()
+
+
+def bench_size(size: int, queries: int, workdir: str) -> Dict[str, Dict]:
+    articles = [Article.from_dict(data) for data in generate_articles(size)]
+    quiet = io.StringIO()
+
+    def log(message: str) -> None:
+        print(message, file=quiet)
+
+    json_storage = JsonStorage(os.path.join(workdir, f"corpus_{size}.json"), journaled=False, log=log)
+    binary_storage = BinaryStorage(os.path.join(workdir, f"corpus_{size}.snap"), journaled=False, log=log)
+    results: Dict[str, Dict] = {}
+    results["json_save"] = measure(lambda _: json_storage.save_all(articles), 3, memory_samples=1)
+    results["binary_save"] = measure(lambda _: binary_storage.save_all(articles), 3, memory_samples=1)
+    results["json_load"] = measure(lambda _: list(json_storage.load_snapshot()), 3, memory_samples=1)
+    results["binary_load"] = measure(lambda _: list(binary_storage.load_snapshot()), 3, memory_samples=1)
+
+    rng = random.Random(3)
+    numbers = [rng.randrange(size) for _ in range(queries)]
+    ids = [articles[number].id for number in numbers]
+    results["binary_open"] = measure(lambda _: BinarySnapshot(binary_storage.path).close(), queries)
+    with BinarySnapshot(binary_storage.path) as snapshot:
+        results["binary_get_by_index"] = measure(lambda i: snapshot[numbers[i % len(numbers)]], queries)
+    with BinarySnapshot(binary_storage.path) as snapshot:
+        results["binary_find_by_id"] = measure(lambda i: snapshot.find(ids[i % len(ids)]), queries)
+
+    for name, path in (("json", json_storage.path), ("binary", binary_storage.path)):
+        results[f"{name}_startup"] = measure(lambda _: DataManager(path, log_stream=quiet).close(), 3, memory_samples=0)
+        results[f"{name}_startup"].update(_retained_after_startup(path, quiet))
+
+    results["file_size"] = {
+        "json_bytes": os.path.getsize(json_storage.path),
+        "binary_bytes": os.path.getsize(binary_storage.path),
+    }
+    return results
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="JSON 与二进制快照格式对比基准")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000], help="语料规模（文章数）")
+    parser.add_argument("--queries", type=int, default=200, help="单篇访问的次数")
+    parser.add_argument("-o", "--output", help="结果 JSON 输出文件，默认打印到标准输出")
+    args = parser.parse_args(argv)
+
+    report = {"results": {}}
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in args.sizes:
+            print(f"正在测试 {size} 篇文章的快照...", file=sys.stderr)
+            report["results"][str(size)] = bench_size(size, args.queries, workdir)
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+# benchmarks/bench_startup.py
+"""
+启动耗时基准：在合成语料上启动交互程序（main.py），测量
+    time_to_first_prompt  从启动进程到出现第一个菜单提示
+    time_to_data          从启动进程到第一个需要数据的操作（统计信息）输出结果
+默认模式（后台加载）与 ARTICLE_EAGER_LOAD=1（先加载再显示菜单）各测若干次，输出 JSON。
+给出 --budget-ms 时，任一规模下默认模式的首个提示中位数超出预算即以状态码 1 退出。
+
+用法:
+    python -m benchmarks.bench_startup --sizes 1000 100000 --budget-ms 300 -o startup.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+from .bench_core import _percentile
+from .corpus import write_corpus
+
+MAIN = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py")
+PROMPT = "请选择: ".encode("utf-8")
+STATS_HEADING = "语料统计".encode("utf-8")
+
+
+def _read_until(process: subprocess.Popen, marker: bytes, buffer: bytearray) -> None:
+    while marker not in buffer:
+        chunk = os.read(process.stdout.fileno(), 65536)
+        if not chunk:
+            raise RuntimeError("程序在出现预期输出前退出了")
+        buffer.extend(chunk)
+
+
+def run_once(workdir: str, eager: bool) -> Dict[str, float]:
+    env = dict(os.environ, ARTICLE_EAGER_LOAD="1" if eager else "0")
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, MAIN], cwd=workdir, env=env,
+                               stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    try:
+        buffer = bytearray()
+        _read_until(process, PROMPT, buffer)
+        first_prompt = time.perf_counter() - start
+        # 立即查看统计信息：后台模式下需要等待加载完成
+        process.stdin.write("6\n0\n".encode("utf-8"))
+        process.stdin.flush()
+        del buffer[:]
+        _read_until(process, STATS_HEADING, buffer)
+        data_ready = time.perf_counter() - start
+        process.stdin.close()
+        process.wait(timeout=60)
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+    return {"time_to_first_prompt": first_prompt, "time_to_data": data_ready}
+
+
+def bench_size(size: int, repeats: int, workdir: str) -> Dict[str, Dict]:
+    write_corpus(os.path.join(workdir, "article_data.json"), size)
+    results = {}
+    for mode, eager in (("background", False), ("eager", True)):
+        samples = [run_once(workdir, eager) for _ in range(repeats)]
+        results[mode] = {}
+        for key in ("time_to_first_prompt", "time_to_data"):
+            values = sorted(sample[key] for sample in samples)
+            results[mode][key] = {
+                "p50_ms": round(_percentile(values, 50) * 1000, 1),
+                "max_ms": round(values[-1] * 1000, 1),
+            }
+    return results
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="交互程序启动耗时基准")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000], help="语料规模（文章数）")
+    parser.add_argument("--repeats", type=int, default=5, help="每种模式启动的次数")
+    parser.add_argument("--budget-ms", type=float, help="后台加载模式下首个提示的耗时预算（中位数，毫秒）")
+    parser.add_argument("-o", "--output", help="结果 JSON 输出文件，默认打印到标准输出")
+    args = parser.parse_args(argv)
+
+    report = {"budget_ms": args.budget_ms, "results": {}}
+    for size in args.sizes:
+        print(f"正在测试 {size} 篇文章的启动耗时...", file=sys.stderr)
+        with tempfile.TemporaryDirectory() as workdir:
+            report["results"][str(size)] = bench_size(size, args.repeats, workdir)
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.budget_ms is not None:
+        over = {size: result["background"]["time_to_first_prompt"]["p50_ms"]
+                for size, result in report["results"].items()
+                if result["background"]["time_to_first_prompt"]["p50_ms"] > args.budget_ms}
+        for size, value in over.items():
+            print(f"超出预算：{size} 篇文章时首个提示耗时 {value} ms > {args.budget_ms} ms", file=sys.stderr)
+        return 1 if over else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
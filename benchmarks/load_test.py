@@ -0,0 +1,138 @@
+# benchmarks/load_test.py
+"""
+HTTP 查询服务压测：多个并发连接（HTTP/1.1 长连接）循环发送混合读请求，
+报告每秒请求数与 p50/p99 延迟（JSON 输出）
+
+用法:
+    python main.py serve --port 8080 &
+    python -m benchmarks.load_test --url http://127.0.0.1:8080 --concurrency 32 --duration 10
+
+    # 自动生成合成语料并在本地启动一个服务实例
+    python -m benchmarks.load_test --spawn 10000
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+from urllib.parse import quote, urlsplit
+
+from .bench_core import _percentile
+from .corpus import generate_articles, sample_keywords, write_corpus
+
+
+def build_requests(count: int, seed: int = 4) -> List[str]:
+    """按合成语料构造混合查询路径：标签、标题、相关度、按 ID、零标签"""
+    sample = list(generate_articles(2000, seed=0))
+    keywords = sample_keywords(sample, count, seed=seed)
+    rng = random.Random(seed)
+    paths = []
+    for i in range(count):
+        kind = i % 5
+        if kind == 0:
+            paths.append("/search/tags?" + "&".join(f"q={quote(kw)}" for kw in keywords[i]))
+        elif kind == 1:
+            paths.append(f"/search/title?q={quote(keywords[i][0][:3])}")
+        elif kind == 2:
+            paths.append(f"/search/rank?top=10&q={quote(keywords[i][0])}")
+        elif kind == 3:
+            paths.append(f"/articles/{rng.choice(sample)['id']}")
+        else:
+            paths.append("/zero-tags")
+    return paths
+
+
+async def _client(host: str, port: int, paths: List[str], deadline: float,
+                  latencies: List[float], statuses: Dict[int, int]) -> None:
+    reader, writer = await asyncio.open_connection(host, port)
+    i = random.randrange(len(paths))
+    try:
+        while time.perf_counter() < deadline:
+            path = paths[i % len(paths)]
+            i += 1
+            start = time.perf_counter()
+            writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode("latin-1"))
+            await writer.drain()
+            status_line = await reader.readline()
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                if name.lower() == "content-length":
+                    length = int(value)
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+            status = int(status_line.split()[1])
+            statuses[status] = statuses.get(status, 0) + 1
+    finally:
+        writer.close()
+
+
+async def run_load(url: str, concurrency: int, duration: float, paths: List[str]) -> Dict:
+    parts = urlsplit(url)
+    latencies: List[float] = []
+    statuses: Dict[int, int] = {}
+    start = time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(*(_client(parts.hostname, parts.port or 80, paths, deadline, latencies, statuses)
+                           for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "concurrency": concurrency,
+        "duration_s": round(elapsed, 3),
+        "requests_per_s": round(len(latencies) / elapsed, 2),
+        "p50_ms": round(_percentile(latencies, 50) * 1000, 3),
+        "p99_ms": round(_percentile(latencies, 99) * 1000, 3),
+        "statuses": statuses,
+    }
+
+
+def _spawn_server(size: int, workdir: str, port: int) -> subprocess.Popen:
+    data_file = os.path.join(workdir, "corpus.json")
+    write_corpus(data_file, size)
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(root, "main.py"), "--data", data_file, "serve", "--port", str(port)],
+        stderr=subprocess.PIPE, text=True)
+    # 等待服务打印启动提示
+    for line in process.stderr:
+        if "服务已启动" in line:
+            return process
+    raise RuntimeError("服务启动失败")
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="HTTP 查询服务压测")
+    parser.add_argument("--url", default="http://127.0.0.1:8080", help="服务地址")
+    parser.add_argument("--concurrency", type=int, default=16, help="并发连接数")
+    parser.add_argument("--duration", type=float, default=5.0, help="压测时长（秒）")
+    parser.add_argument("--spawn", type=int, metavar="N", help="生成 N 篇文章的合成语料并在本地启动服务")
+    args = parser.parse_args(argv)
+
+    paths = build_requests(500)
+    if args.spawn is None:
+        print(json.dumps(asyncio.run(run_load(args.url, args.concurrency, args.duration, paths)), indent=2))
+        return
+    with tempfile.TemporaryDirectory() as workdir:
+        port = urlsplit(args.url).port or 8080
+        process = _spawn_server(args.spawn, workdir, port)
+        try:
+            report = asyncio.run(run_load(f"http://127.0.0.1:{port}", args.concurrency, args.duration, paths))
+        finally:
+            process.terminate()
+            process.wait()
+    report["corpus_size"] = args.spawn
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,63 +1,111 @@
 # core/article.py
+import sys
 import uuid
-from typing import List, Dict, Optional
+from typing import Container, List, Dict, Optional, Tuple
 
 class Article:
     """文章实体类（支持关键句标签，保持输入顺序）"""
     
-    def __init__(self, title: str, tags: List[str] = None, article_id: str = None):
+    # 不使用实例 __dict__，大语料下每篇文章可省下一个字典的开销
+    __slots__ = ("id", "title", "_tags", "revision", "modified")
+    
+    def __init__(self, title: str, tags: List[str] = None, article_id: str = None,
+                 existing_ids: Optional[Container[str]] = None, revision: int = 0, modified: int = 0):
         """
         初始化文章对象，标签保持输入顺序，仅去重
+
+        Args:
+            existing_ids: 已占用的 ID（如 DataManager），自动生成 ID 时避开冲突
+            revision: 本地修订号，每次修改（含同步进来的修改）由 DataManager 分配，用于增量导出
+            modified: 最后一次编辑的时间戳（毫秒），随文章一起同步，用于合并时解决冲突；0 表示未知
         """
-        self.id = article_id or str(uuid.uuid4())[:8]
+        self.id = article_id or self.generate_id(existing_ids)
         self.title = title
-        
-        # 保持顺序的去重
-        self.tags = []
-        seen = set()
-        for tag in (tags or []):
-            if tag and tag not in seen:  # 忽略空字符串
-                seen.add(tag)
-                self.tags.append(tag)
+        self.revision = revision
+        self.modified = modified
+        # 标签存为元组：比列表、dict 都省内存。每篇文章的标签很少，线性判断成员已足够；
+        # 跨全部文章的精确标签查询走 DataManager 的标签倒排表（TagPostingIndex）
+        self._tags: Tuple[str, ...] = ()
+        self.set_tags(tags or [])
+    
+    @staticmethod
+    def generate_id(existing_ids: Optional[Container[str]] = None) -> str:
+        """生成 8 位短 ID，并确保不与已有 ID 冲突"""
+        while True:
+            new_id = str(uuid.uuid4())[:8]
+            if existing_ids is None or new_id not in existing_ids:
+                return new_id
+    
+    @property
+    def tags(self) -> List[str]:
+        """按输入顺序返回标签（新列表，请通过 set_tags/add_tag/remove_tag 修改）"""
+        return list(self._tags)
+    
+    @tags.setter
+    def tags(self, tags: List[str]) -> None:
+        self.set_tags(tags)
+    
+    @property
+    def tag_tuple(self) -> Tuple[str, ...]:
+        """按输入顺序的标签元组（只读，不复制），供索引与搜索等只读取标签的热点路径使用"""
+        return self._tags
+    
+    def set_tags(self, tags: List[str]) -> None:
+        """替换全部标签（保持顺序，仅去重；标签字符串驻留，相同标签在文章间共享同一对象）"""
+        # 忽略空字符串
+        self._tags = tuple(dict.fromkeys(sys.intern(tag) for tag in tags if tag))
     
     def add_tag(self, tag: str) -> None:
         """添加标签（保持顺序，仅去重）"""
-        if tag and tag not in self.tags:
-            self.tags.append(tag)
+        if tag and tag not in self._tags:
+            self._tags += (sys.intern(tag),)
     
     def remove_tag(self, tag: str) -> bool:
         """移除标签"""
-        if tag in self.tags:
-            self.tags.remove(tag)
+        if tag in self._tags:
+            self._tags = tuple(t for t in self._tags if t != tag)
             return True
         return False
     
     def has_tag(self, tag: str) -> bool:
         """检查是否包含指定标签（精确匹配）"""
-        return tag in self.tags
+        return tag in self._tags
     
     def has_all_tags(self, tags: List[str]) -> bool:
         """检查是否包含所有指定标签（精确匹配 AND）"""
-        return all(tag in self.tags for tag in tags)
+        return all(tag in self._tags for tag in tags)
     
     def to_dict(self) -> Dict:
-        return {
+        data = {
             "id": self.id,
             "title": self.title,
             "tags": self.tags
         }
+        # 从未修改过的旧文章不写修订信息，旧数据文件保持原样
+        if self.revision:
+            data["revision"] = self.revision
+        if self.modified:
+            data["modified"] = self.modified
+        return data
     
     @classmethod
     def from_dict(cls, data: Dict) -> 'Article':
         return cls(
             title=data.get("title", ""),
             tags=data.get("tags", []),
-            article_id=data.get("id")
+            article_id=data.get("id"),
+            revision=data.get("revision", 0),
+            modified=data.get("modified", 0)
         )
     
+    def summary_line(self, title_width: int = 40) -> str:
+        """紧凑的单行表示：ID、截断后的标题与标签数"""
+        title = self.title if len(self.title) <= title_width else self.title[:title_width - 1] + "…"
+        return f"[{self.id}] {title} （{len(self._tags)} 个标签）"
+    
     def __str__(self) -> str:
-        if self.tags:
-            tags_display = "\n      ".join(self.tags)  # 每个标签缩进显示
+        if self._tags:
+            tags_display = "\n      ".join(self._tags)  # 每个标签缩进显示
             return f"ID: {self.id}\n   标题: {self.title}\n   标签:\n      {tags_display}"
         else:
             return f"ID: {self.id}\n   标题: {self.title}\n   标签: 无"
\ No newline at end of file
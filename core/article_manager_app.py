@@ -13,22 +13,31 @@ class ArticleManagerApp:
         Args:
             data_file: 数据文件路径
         """
-        self.data_manager = DataManager(data_file)
+        # 修改由后台线程延迟写入：累计 20 次或 2 秒后落盘
+        self.data_manager = DataManager(data_file, flush_every=20, flush_interval=2.0)
         self.ui = UserInterface(self.data_manager)
     
     def run(self) -> None:
-        """运行主程序"""
-        self.main_menu()
+        """运行主程序；无论如何退出都会写入剩余修改"""
+        try:
+            self.main_menu()
+        finally:
+            self.data_manager.close()
     
     def main_menu(self) -> None:
         menu_options: Dict[str, tuple[str, Callable]] = {
             '1': ('文章管理', self.article_menu),
             '2': ('按标签搜索文章', self.ui.search_by_tags_interactive),
             '3': ('按标题搜索文章', self.ui.search_by_title_interactive),
-            '4': ('查看零标签文章', self.ui.handle_zero_tag_articles_interactive)
+            '4': ('查看零标签文章', self.ui.handle_zero_tag_articles_interactive),
+            '5': ('相关度排序搜索', self.ui.ranked_search_interactive),
+            '6': ('查看统计信息', self.ui.show_statistics),
+            '7': ('查看已保存的搜索', self.ui.show_saved_searches),
+            '8': ('高级查询（AND/OR/NOT、正则）', self.ui.query_search_interactive),
         }
         
         while True:
+            self.ui.sync_external_changes()
             print("\n======= 文章标签搜索工具 =======")
             for key, (text, _) in menu_options.items():
                 print(f"{key}. {text}")
@@ -38,8 +47,9 @@ class ArticleManagerApp:
             choice = input("请输入选项: ").strip()
             
             if choice == '0':
-                print("正在保存数据...")
-                self.data_manager.save_data()
+                if self.data_manager.dirty:
+                    print("正在保存数据...")
+                    self.data_manager.flush()
                 print("程序已退出。")
                 break
             elif choice in menu_options:
@@ -57,6 +67,7 @@ class ArticleManagerApp:
         }
         
         while True:
+            self.ui.sync_external_changes()
             print("\n--- 文章管理 ---")
             print("1. 查看所有文章")
             print("2. 添加新文章")
@@ -0,0 +1,49 @@
+# core/background_loader.py
+import threading
+import time
+from typing import Callable, Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class BackgroundLoader(Generic[T]):
+    """在后台线程中执行耗时的初始化（如加载语料），首次使用时再等待结果"""
+
+    def __init__(self, factory: Callable[[], T]):
+        self._factory = factory
+        self._value: Optional[T] = None
+        self._error: Optional[BaseException] = None
+        self._done = threading.Event()
+        self.started_at = 0.0
+        # 守护线程：加载尚未完成就退出时不阻塞解释器（加载过程只读，写入均为原子替换）
+        self._thread = threading.Thread(target=self._run, name="BackgroundLoader", daemon=True)
+
+    def start(self) -> 'BackgroundLoader[T]':
+        self.started_at = time.monotonic()
+        self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        try:
+            self._value = self._factory()
+        except BaseException as e:
+            self._error = e
+        finally:
+            self._done.set()
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def result(self, on_wait: Optional[Callable[[float], None]] = None, interval: float = 0.2) -> T:
+        """
+        等待加载完成并返回结果；加载失败时在调用方线程重新抛出异常
+
+        Args:
+            on_wait: 尚未完成时每隔 interval 秒调用一次，参数为已耗时秒数（用于显示进度）
+        """
+        while not self._done.wait(interval if on_wait else None):
+            on_wait(time.monotonic() - self.started_at)
+        if self._error is not None:
+            raise self._error
+        return self._value
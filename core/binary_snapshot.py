@@ -0,0 +1,326 @@
+# core/binary_snapshot.py
+"""
+紧凑二进制快照格式（小端序）
+
+    文件头     magic(8) 数据版本(u64) 文章数(u32) 字符串数(u32) 各段起始偏移(5 x u64)
+    字符串表   (字符串数 + 1) 个 u64 字节偏移，随后是全部 UTF-8 字符串首尾相接的数据块
+    记录区     u32 数组；每篇文章依次为 [ID 串号, 标题串号, 标签数, 标签串号...]
+    记录索引   每篇文章在记录区中的起始位置（u32），按显示顺序
+    ID 索引    按 ID 排序的文章序号（u32），用于二分查找
+    修订信息   每篇文章的 (修订号, 修改时间戳) 两个 u64，按显示顺序
+
+第 1 版文件（magic 为 ATAGSNP1）没有修订信息段，文件头只有 4 个偏移，仍可读取。
+
+ID、标题与标签都存放在去重后的字符串表中，相同标签只存一份。
+文件可以内存映射打开：只解析文件头，文章在被访问时才解码。
+"""
+import mmap
+import struct
+import sys
+from array import array
+from collections.abc import MutableMapping
+from typing import BinaryIO, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from .article import Article
+
+MAGIC = b"ATAGSNP2"
+MAGIC_V1 = b"ATAGSNP1"
+_HEADER = struct.Struct("<8sQII5Q")
+_HEADER_V1 = struct.Struct("<8sQII4Q")
+_U32 = struct.Struct("<I")
+_U64_PAIR = struct.Struct("<2Q")
+
+
+def _to_little_endian(values: array) -> bytes:
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_little_endian(typecode: str, data) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+class ArticleRow(NamedTuple):
+    """快照中一篇文章的只读内容，字段名与 Article 的属性相同，供只读取内容的遍历使用（不创建 Article）"""
+    id: str
+    title: str
+    tag_tuple: Tuple[str, ...]
+    revision: int
+    modified: int
+
+    def has_tag(self, tag: str) -> bool:
+        return tag in self.tag_tuple
+
+    def to_article(self) -> Article:
+        return Article(self.title, list(self.tag_tuple), article_id=self.id,
+                       revision=self.revision, modified=self.modified)
+
+    def to_dict(self) -> Dict:
+        return self.to_article().to_dict()
+
+
+def write_snapshot(f: BinaryIO, articles: Iterable[Article], version: int = 0) -> None:
+    """把文章按显示顺序写成二进制快照"""
+    string_ids: Dict[str, int] = {}
+
+    def string_id(text: str) -> int:
+        index = string_ids.get(text)
+        if index is None:
+            index = string_ids[text] = len(string_ids)
+        return index
+
+    records = array("I")
+    starts = array("I")
+    stamps = array("Q")
+    id_refs: List[int] = []
+    for article in articles:
+        starts.append(len(records))
+        stamps.extend((article.revision, article.modified))
+        tags = article.tag_tuple
+        id_ref = string_id(article.id)
+        id_refs.append(id_ref)
+        records.extend((id_ref, string_id(article.title), len(tags)))
+        records.extend(string_id(tag) for tag in tags)
+
+    encoded = [text.encode("utf-8") for text in string_ids]
+    offsets = array("Q", [0])
+    for data in encoded:
+        offsets.append(offsets[-1] + len(data))
+    ids = list(string_ids)
+    id_order = array("I", sorted(range(len(id_refs)), key=lambda i: ids[id_refs[i]]))
+
+    offsets_at = _HEADER.size
+    records_at = offsets_at + offsets.itemsize * len(offsets) + offsets[-1]
+    starts_at = records_at + records.itemsize * len(records)
+    id_order_at = starts_at + starts.itemsize * len(starts)
+    stamps_at = id_order_at + id_order.itemsize * len(id_order)
+    f.write(_HEADER.pack(MAGIC, version, len(starts), len(encoded),
+                         offsets_at, records_at, starts_at, id_order_at, stamps_at))
+    f.write(_to_little_endian(offsets))
+    for data in encoded:
+        f.write(data)
+    f.write(_to_little_endian(records))
+    f.write(_to_little_endian(starts))
+    f.write(_to_little_endian(id_order))
+    f.write(_to_little_endian(stamps))
+
+
+class BinarySnapshot:
+    """
+    以内存映射方式打开的二进制快照
+
+    打开时只读取文件头；按序号或 ID 访问时才解码对应的文章，
+    遍历全部文章时则一次性解码字符串表和记录区，速度最快。
+    """
+
+    def __init__(self, path: str, in_memory: bool = False):
+        """
+        Args:
+            in_memory: 把文件读入内存而不是映射；Windows 上被映射的文件不能被替换，
+                需要在打开期间整体重写快照时使用
+        """
+        self.path = path
+        with open(path, "rb") as f:
+            if in_memory:
+                self._map = f.read()
+            else:
+                try:
+                    # 映射持有自己的文件句柄，文件可以随即关闭
+                    self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                except ValueError:  # 空文件无法映射
+                    raise ValueError(f"{path} 不是有效的二进制快照")
+        magic = self._map[:len(MAGIC)]
+        if magic == MAGIC and len(self._map) >= _HEADER.size:
+            (_, self.version, self._count, self._string_count, self._offsets_at,
+             self._records_at, self._starts_at, self._id_order_at, self._stamps_at) = _HEADER.unpack_from(self._map, 0)
+        elif magic == MAGIC_V1 and len(self._map) >= _HEADER_V1.size:
+            (_, self.version, self._count, self._string_count, self._offsets_at,
+             self._records_at, self._starts_at, self._id_order_at) = _HEADER_V1.unpack_from(self._map, 0)
+            self._stamps_at = None
+        else:
+            self.close()
+            raise ValueError(f"{path} 不是有效的二进制快照")
+        self._blob_at = self._offsets_at + 8 * (self._string_count + 1)
+        self._strings: Dict[int, str] = {}
+
+    def __enter__(self) -> 'BinarySnapshot':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if isinstance(self._map, mmap.mmap) and not self._map.closed:
+            self._map.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _string(self, index: int) -> str:
+        text = self._strings.get(index)
+        if text is None:
+            start, end = _U64_PAIR.unpack_from(self._map, self._offsets_at + 8 * index)
+            text = self._strings[index] = self._map[self._blob_at + start:self._blob_at + end].decode("utf-8")
+        return text
+
+    def _u32(self, position: int) -> int:
+        return _U32.unpack_from(self._map, position)[0]
+
+    def _article_id(self, number: int) -> str:
+        start = self._u32(self._starts_at + 4 * number)
+        return self._string(self._u32(self._records_at + 4 * start))
+
+    def __getitem__(self, number: int) -> Article:
+        """按显示顺序的第 number 篇文章（只解码这一篇）"""
+        return self.row(number).to_article()
+
+    def row(self, number: int) -> ArticleRow:
+        """按显示顺序的第 number 篇文章的内容（只解码这一篇）"""
+        if number < 0:
+            number += self._count
+        if not 0 <= number < self._count:
+            raise IndexError(number)
+        position = self._records_at + 4 * self._u32(self._starts_at + 4 * number)
+        id_ref, title_ref, tag_count = struct.unpack_from("<3I", self._map, position)
+        tag_refs = struct.unpack_from(f"<{tag_count}I", self._map, position + 12)
+        revision, modified = self._stamps(number)
+        return ArticleRow(self._string(id_ref), self._string(title_ref),
+                          tuple(self._string(ref) for ref in tag_refs), revision, modified)
+
+    def _stamps(self, number: int):
+        if self._stamps_at is None:
+            return 0, 0
+        return _U64_PAIR.unpack_from(self._map, self._stamps_at + 16 * number)
+
+    def find(self, article_id: str) -> Optional[Article]:
+        """在 ID 索引上二分查找，只解码 O(log n) 个 ID 和命中的文章"""
+        low, high = 0, self._count
+        while low < high:
+            mid = (low + high) // 2
+            number = self._u32(self._id_order_at + 4 * mid)
+            if self._article_id(number) < article_id:
+                low = mid + 1
+            else:
+                high = mid
+        if low < self._count:
+            number = self._u32(self._id_order_at + 4 * low)
+            if self._article_id(number) == article_id:
+                return self[number]
+        return None
+
+    def _decode_strings(self) -> List[str]:
+        offsets = _from_little_endian("Q", self._map[self._offsets_at:self._blob_at])
+        blob = self._map[self._blob_at:self._blob_at + offsets[-1]]
+        return [blob[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(self._string_count)]
+
+    def ids(self) -> List[str]:
+        """按显示顺序的全部 ID（只解码 ID，不解码标题与标签）"""
+        data = self._map
+        starts = _from_little_endian("I", data[self._starts_at:self._starts_at + 4 * self._count])
+        ids = []
+        for start in starts:
+            id_ref = _U32.unpack_from(data, self._records_at + 4 * start)[0]
+            begin, end = _U64_PAIR.unpack_from(data, self._offsets_at + 8 * id_ref)
+            ids.append(data[self._blob_at + begin:self._blob_at + end].decode("utf-8"))
+        return ids
+
+    def rows(self) -> Iterator[ArticleRow]:
+        """按显示顺序解码全部文章的内容（一次性解码字符串表和记录区，不创建 Article）"""
+        strings = self._decode_strings()
+        records = _from_little_endian("I", self._map[self._records_at:self._starts_at])
+        if self._stamps_at is None:
+            stamps = array("Q", bytes(16 * self._count))
+        else:
+            stamps = _from_little_endian("Q", self._map[self._stamps_at:self._stamps_at + 16 * self._count])
+        position = 0
+        for number in range(self._count):
+            id_ref, title_ref, tag_count = records[position:position + 3]
+            tags_end = position + 3 + tag_count
+            yield ArticleRow(strings[id_ref], strings[title_ref],
+                             tuple([strings[ref] for ref in records[position + 3:tags_end]]),
+                             stamps[2 * number], stamps[2 * number + 1])
+            position = tags_end
+
+    def __iter__(self) -> Iterator[Article]:
+        """按显示顺序解码全部文章"""
+        for row in self.rows():
+            yield row.to_article()
+
+
+class SnapshotArticles(MutableMapping):
+    """
+    以打开的快照为底的 id -> Article 映射，保持显示顺序（替换时保留原有位置）
+
+    快照中的文章第一次按 ID 取出时才解码成 Article 并缓存，之后总是返回同一个对象；
+    新增与替换的文章直接存放。只读取内容的遍历用 peek_values()，不创建 Article。
+    快照随映射一起释放；其文件被整体重写后，尚未解码的文章仍读取打开时的内容。
+    """
+
+    def __init__(self, snapshot: BinarySnapshot):
+        """快照中有重复 ID 时抛出 ValueError"""
+        self.snapshot = snapshot
+        # 值为快照中的序号（尚未解码）或 Article
+        self._entries: Dict[str, Union[int, Article]] = dict(zip(snapshot.ids(), range(len(snapshot))))
+        if len(self._entries) != len(snapshot):
+            raise ValueError(f"{snapshot.path} 中有重复的文章 ID")
+
+    def __getitem__(self, article_id: str) -> Article:
+        entry = self._entries[article_id]
+        if isinstance(entry, int):
+            entry = self._entries[article_id] = self.snapshot[entry]
+        return entry
+
+    def get(self, article_id: str, default=None):
+        return self[article_id] if article_id in self._entries else default
+
+    def peek(self, article_id: str) -> Union[Article, ArticleRow]:
+        """只读取内容：已有 Article 时给出它，否则只解码出 ArticleRow（不缓存）"""
+        entry = self._entries[article_id]
+        return self.snapshot.row(entry) if isinstance(entry, int) else entry
+
+    def __setitem__(self, article_id: str, article: Article) -> None:
+        self._entries[article_id] = article
+
+    def __delitem__(self, article_id: str) -> None:
+        del self._entries[article_id]
+
+    def __contains__(self, article_id) -> bool:
+        return article_id in self._entries
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def decoded_count(self) -> int:
+        """已解码成 Article 或新存放的文章数"""
+        return sum(1 for entry in self._entries.values() if not isinstance(entry, int))
+
+    def peek_values(self) -> Iterator[Union[Article, ArticleRow]]:
+        """
+        按显示顺序只读遍历全部文章：已有 Article 的给出 Article，其余给出 ArticleRow（不缓存）
+
+        尚未解码的条目在字典中的顺序就是快照中的顺序，因此只需顺序解码一遍快照。
+        给出的 ID 是映射中的键本身，索引保存它时不会多出一份相同的字符串。
+        """
+        rows = None
+        number = -1
+        row = None
+        for article_id, entry in self._entries.items():
+            if not isinstance(entry, int):
+                yield entry
+                continue
+            if rows is None:
+                rows = self.snapshot.rows()
+            while number < entry:
+                row = next(rows)
+                number += 1
+            yield ArticleRow(article_id, row.title, row.tag_tuple, row.revision, row.modified)
@@ -0,0 +1,342 @@
+# core/cli.py
+"""
+非交互命令行模式：批量导入/导出与查询，结果以 JSON Lines 输出到标准输出
+
+示例:
+    python main.py import new_articles.jsonl
+    python main.py tags 注意力 轻量级
+    cat queries.txt | python main.py title
+    python main.py export --format jsonl -o backup.jsonl
+    python main.py migrate article_data.json articles.db
+    python main.py serve --port 8080
+    python main.py --metrics metrics.prom --profile search.tags tags 注意力
+"""
+import argparse
+import csv
+import json
+import os
+import sqlite3
+import sys
+from typing import Callable, Dict, Iterator, List, Optional, TextIO
+
+from .article import Article
+from .data_manager import DataManager
+from .json_stream import iter_json_array
+from .metrics import metrics
+from .storage import open_storage
+
+FORMATS = ("json", "jsonl", "csv")
+
+
+def _guess_format(path: str, default: str = "jsonl") -> str:
+    ext = os.path.splitext(path)[1].lstrip(".").lower()
+    return ext if ext in FORMATS else default
+
+
+def _read_records(f: TextIO, fmt: str, tag_sep: str) -> Iterator[Dict]:
+    """按格式逐条读取待导入的文章记录"""
+    if fmt == "json":
+        yield from iter_json_array(f, "articles")
+    elif fmt == "jsonl":
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"第 {line_no} 行不是合法的 JSON: {e}") from e
+    else:
+        for row in csv.DictReader(f):
+            tags = row.get("tags") or ""
+            yield {
+                "id": row.get("id") or None,
+                "title": row.get("title") or "",
+                "tags": [tag.strip() for tag in tags.split(tag_sep) if tag.strip()],
+            }
+
+
+def _write_article(out: TextIO, article: Article, extra: Optional[Dict] = None) -> None:
+    record = article.to_dict()
+    if extra:
+        record.update(extra)
+    out.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def _queries(args: argparse.Namespace) -> Iterator[List[str]]:
+    """命令行参数给出关键词时执行一次查询，否则从标准输入逐行读取（每行一个查询）"""
+    if args.keywords:
+        yield args.keywords
+        return
+    for line in sys.stdin:
+        keywords = [kw.strip() for kw in line.rstrip("\n").split(args.sep) if kw.strip()]
+        if keywords:
+            yield keywords
+
+
+def cmd_import(dm: DataManager, args: argparse.Namespace) -> int:
+    fmt = args.format or _guess_format(args.file)
+    added = updated = 0
+    # 整批导入只在结束时保存一次；任一记录出错则整批回滚
+    with dm.batch():
+        with open(args.file, 'r', encoding='utf-8', newline='') as f:
+            for record in _read_records(f, fmt, args.tag_sep):
+                article = Article.from_dict(record)
+                if not article.title:
+                    continue
+                existing = dm.find_article_by_id(article.id) if record.get("id") else None
+                if existing is not None and args.replace:
+                    dm.update_article_title(existing, article.title)
+                    dm.update_article_tags(existing, article.tags)
+                    updated += 1
+                else:
+                    dm.add_article(article)
+                    added += 1
+    print(f"导入完成：新增 {added} 篇，更新 {updated} 篇。", file=sys.stderr)
+    return 0
+
+
+def cmd_export(dm: DataManager, args: argparse.Namespace) -> int:
+    out = open(args.output, 'w', encoding='utf-8', newline='') if args.output else sys.stdout
+    fmt = args.format or (_guess_format(args.output) if args.output else "jsonl")
+    try:
+        if fmt == "json":
+            json.dump({"articles": [a.to_dict() for a in dm.articles]}, out,
+                      ensure_ascii=False, indent=4)
+            out.write("\n")
+        elif fmt == "jsonl":
+            for article in dm.articles:
+                _write_article(out, article)
+        else:
+            writer = csv.writer(out)
+            writer.writerow(["id", "title", "tags"])
+            for article in dm.articles:
+                writer.writerow([article.id, article.title, args.tag_sep.join(article.tags)])
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+def cmd_migrate(dm: DataManager, args: argparse.Namespace) -> int:
+    """把 dm（已从源文件加载）的全部文章写入目标存储，后端按扩展名选择"""
+    target = open_storage(args.target, log=lambda message: print(message, file=sys.stderr))
+    try:
+        if target.exists() and not args.force:
+            raise ValueError(f"目标文件 {args.target} 已存在，如需覆盖请加 --force")
+        target.save_all(dm.iter_articles(), tombstones=dm.tombstones)
+    finally:
+        target.close()
+    print(f"迁移完成：已将 {len(dm)} 篇文章从 {args.source} 写入 {args.target}。", file=sys.stderr)
+    return 0
+
+
+def cmd_export_changes(dm: DataManager, args: argparse.Namespace) -> int:
+    """导出增量变更集；检查点（until）同时打印到标准错误，下次用 --since 传入"""
+    changes = dm.export_changes(args.since)
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        json.dump(changes, out, ensure_ascii=False, separators=(',', ':'))
+        out.write("\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(f"已导出 {len(changes['articles'])} 篇文章、{len(changes['deleted'])} 条删除记录，"
+          f"检查点 {changes['until']}。", file=sys.stderr)
+    return 0
+
+
+def cmd_apply_changes(dm: DataManager, args: argparse.Namespace) -> int:
+    if args.file == "-":
+        changes = json.load(sys.stdin)
+    else:
+        with open(args.file, 'r', encoding='utf-8') as f:
+            changes = json.load(f)
+    counts = dm.apply_changes(changes)
+    print(f"合并完成：新增 {counts['added']} 篇，更新 {counts['updated']} 篇，删除 {counts['deleted']} 篇，"
+          f"跳过 {counts['skipped']} 条。", file=sys.stderr)
+    return 0
+
+
+def cmd_tags(dm: DataManager, args: argparse.Namespace) -> int:
+    for keywords in _queries(args):
+        if args.exact:
+            results = dm.search_articles_by_tags(keywords)
+        else:
+            results = dm.fuzzy_search_by_tags(keywords)
+        for article in results:
+            _write_article(sys.stdout, article, {"query": keywords})
+    return 0
+
+
+def cmd_title(dm: DataManager, args: argparse.Namespace) -> int:
+    for keywords in _queries(args):
+        for article in dm.search_titles(keywords):
+            _write_article(sys.stdout, article, {"query": keywords})
+    return 0
+
+
+def cmd_rank(dm: DataManager, args: argparse.Namespace) -> int:
+    for keywords in _queries(args):
+        query = " ".join(keywords)
+        for article, score in dm.ranked_search(query, args.top):
+            _write_article(sys.stdout, article, {"query": query, "score": round(score, 4)})
+    return 0
+
+
+def cmd_query(dm: DataManager, args: argparse.Namespace) -> int:
+    """执行查询语言的查询；未给出查询时从标准输入逐行读取，--explain 输出执行计划而不是文章"""
+    queries = [" ".join(args.query)] if args.query else (line.strip() for line in sys.stdin)
+    for query in queries:
+        if not query:
+            continue
+        if args.explain:
+            print(json.dumps(dm.explain_query(query), ensure_ascii=False))
+            continue
+        for article in dm.query(query):
+            _write_article(sys.stdout, article, {"query": query})
+    return 0
+
+
+def _write_found(article_ids: List[str], find: Callable[[str], Optional[Article]]) -> int:
+    missing = 0
+    for article_id in article_ids:
+        article = find(article_id)
+        if article is None:
+            print(f"未找到 ID 为 '{article_id}' 的文章。", file=sys.stderr)
+            missing += 1
+        else:
+            _write_article(sys.stdout, article)
+    return 1 if missing else 0
+
+
+def cmd_get(dm: DataManager, args: argparse.Namespace) -> int:
+    return _write_found(args.ids, dm.find_article_by_id)
+
+
+def _find_without_loading(data_file: str, article_ids: List[str]) -> Optional[Dict[str, Optional[Article]]]:
+    """
+    按 ID 查看时先让存储后端直接读取（二进制快照二分查找、SQLite 按主键读取），不加载全部文章；
+    后端不支持或读取出错时返回 None，改为完整加载
+    """
+    if not os.path.exists(data_file):
+        return None
+    try:
+        storage = open_storage(data_file, log=lambda message: print(message, file=sys.stderr))
+        try:
+            return storage.find_articles(article_ids)
+        finally:
+            storage.close()
+    except (OSError, ValueError, sqlite3.Error):
+        return None
+
+
+def cmd_zero_tags(dm: DataManager, args: argparse.Namespace) -> int:
+    for article in dm.get_zero_tag_articles():
+        _write_article(sys.stdout, article)
+    return 0
+
+
+def cmd_serve(dm: DataManager, args: argparse.Namespace) -> int:
+    from .server import run_server
+    run_server(dm, args.host, args.port, args.refresh_interval)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="main.py", description="文章关键句标签管理系统（命令行模式）")
+    parser.add_argument("--data", default="article_data.json",
+                        help="数据文件路径（.db/.sqlite 使用 SQLite 存储，.snap 使用二进制快照）")
+    parser.add_argument("--search-workers", type=int, default=0, metavar="N",
+                        help=f"大语料（至少 {DataManager.PARALLEL_SEARCH_MIN} 篇）上用 N 个进程并行模糊搜索（默认不启用）")
+    parser.add_argument("--metrics", metavar="FILE",
+                        help="记录各操作耗时与计数，退出时写入 FILE（.prom 为 Prometheus 格式，否则 JSON）")
+    parser.add_argument("--profile", metavar="SPAN", help="用 cProfile 采集指定区间，如 load、search.tags")
+    parser.add_argument("--profile-out", metavar="FILE", help="cProfile 结果文件（默认 profile_<区间名>.prof）")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("import", help="从 JSON/JSONL/CSV 批量导入文章（只保存一次）")
+    p.add_argument("file", help="待导入文件")
+    p.add_argument("--format", choices=FORMATS, help="文件格式，默认按扩展名判断")
+    p.add_argument("--tag-sep", default="|", help="CSV 中标签的分隔符（默认 |）")
+    p.add_argument("--replace", action="store_true", help="ID 已存在时覆盖原文章，而不是作为新文章添加")
+    p.set_defaults(func=cmd_import)
+
+    p = sub.add_parser("export", help="导出全部文章")
+    p.add_argument("-o", "--output", help="输出文件，默认为标准输出")
+    p.add_argument("--format", choices=FORMATS, help="输出格式，默认按扩展名判断（标准输出为 jsonl）")
+    p.add_argument("--tag-sep", default="|", help="CSV 中标签的分隔符（默认 |）")
+    p.set_defaults(func=cmd_export)
+
+    p = sub.add_parser("migrate", help="在 JSON 与 SQLite 存储之间迁移数据（按扩展名判断格式）")
+    p.add_argument("source", help="源数据文件，如 article_data.json")
+    p.add_argument("target", help="目标数据文件，如 articles.db")
+    p.add_argument("--force", action="store_true", help="目标文件已存在时覆盖")
+    p.set_defaults(func=cmd_migrate)
+
+    p = sub.add_parser("export-changes", help="导出增量变更集（新增、修改与删除的文章），用于机器间同步")
+    p.add_argument("--since", type=int, help="上一次导出的检查点；省略时导出全部")
+    p.add_argument("-o", "--output", help="输出文件，默认为标准输出")
+    p.set_defaults(func=cmd_export_changes)
+
+    p = sub.add_parser("apply-changes", help="合并 export-changes 导出的变更集（按修改时间解决冲突）")
+    p.add_argument("file", help="变更集文件，- 表示标准输入")
+    p.set_defaults(func=cmd_apply_changes)
+
+    for name, func, help_text in (
+        ("tags", cmd_tags, "按标签搜索（默认模糊 AND）"),
+        ("title", cmd_title, "按标题搜索（模糊 AND）"),
+        ("rank", cmd_rank, "按相关度排序搜索"),
+    ):
+        p = sub.add_parser(name, help=help_text)
+        p.add_argument("keywords", nargs="*", help="关键词；省略时从标准输入逐行读取查询")
+        p.add_argument("--sep", default="\t", help="标准输入中同一行多个关键词的分隔符（默认制表符）")
+        p.set_defaults(func=func)
+        if name == "tags":
+            p.add_argument("--exact", action="store_true", help="精确匹配完整标签")
+        elif name == "rank":
+            p.add_argument("--top", type=int, default=10, help="返回前几条（默认 10）")
+
+    p = sub.add_parser("query", help="查询语言搜索（AND/OR/NOT、\"短语\"、/正则/、title:/tag: 字段限定）")
+    p.add_argument("query", nargs="*", help="查询语句；省略时从标准输入逐行读取")
+    p.add_argument("--explain", action="store_true", help="输出执行计划（各步骤的候选数）而不是文章")
+    p.set_defaults(func=cmd_query)
+
+    p = sub.add_parser("get", help="按 ID 查看文章")
+    p.add_argument("ids", nargs="+", help="文章 ID")
+    p.set_defaults(func=cmd_get)
+
+    p = sub.add_parser("zero-tags", help="列出零标签文章")
+    p.set_defaults(func=cmd_zero_tags)
+
+    p = sub.add_parser("serve", help="启动 HTTP/JSON 查询服务")
+    p.add_argument("--host", default="127.0.0.1", help="监听地址（默认 127.0.0.1）")
+    p.add_argument("--port", type=int, default=8080, help="监听端口（默认 8080）")
+    p.add_argument("--refresh-interval", type=float, default=2.0,
+                   help="合并其他进程修改的间隔秒数，0 表示不合并（默认 2）")
+    p.set_defaults(func=cmd_serve)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    # 提示信息走标准错误，标准输出只留给结果数据
+    data_file = args.source if args.command == "migrate" else args.data
+    if args.metrics or args.profile:
+        metrics.configure(args.metrics, args.profile, args.profile_out)
+    if args.command == "get":
+        found = _find_without_loading(data_file, args.ids)
+        if found is not None:
+            return _write_found(args.ids, found.get)
+    dm = DataManager(data_file, log_stream=sys.stderr, search_workers=args.search_workers)
+    try:
+        return args.func(dm, args)
+    except BrokenPipeError:
+        # 下游提前关闭管道（如 | head）时静默退出，避免解释器退出时再次报错
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+    except (OSError, ValueError) as e:
+        print(f"错误：{e}", file=sys.stderr)
+        return 1
+    finally:
+        dm.close()
@@ -0,0 +1,119 @@
+# core/completion.py
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional
+
+
+class _TrieNode:
+    __slots__ = ("children", "top")
+
+    def __init__(self):
+        self.children: Dict[str, '_TrieNode'] = {}
+        # 以该节点为前缀的词条中频次最高的若干个（已排序）
+        self.top: List[str] = []
+
+
+class CompletionIndex:
+    """
+    前缀补全索引：浅层用带 Top-N 缓存的前缀树，较长前缀用有序数组二分查找
+
+    前缀树只建到 max_depth 层，长句子标签不会产生大量节点；
+    超过该长度的前缀在有序数组中对应的区间已经很小，直接扫描即可。
+    """
+
+    def __init__(self, top_n: int = 10, max_depth: int = 12):
+        self.top_n = top_n
+        self.max_depth = max_depth
+        self._counts: Dict[str, int] = {}
+        self._sorted: List[str] = []
+        self._root = _TrieNode()
+
+    def _rank_key(self, term: str):
+        return (-self._counts.get(term, 0), term)
+
+    def _path(self, term: str, create: bool) -> List[_TrieNode]:
+        """返回从根到 term 前 max_depth 个字符的节点路径"""
+        node = self._root
+        path = [node]
+        for char in term[:self.max_depth]:
+            child = node.children.get(char)
+            if child is None:
+                if not create:
+                    break
+                child = node.children[char] = _TrieNode()
+            node = child
+            path.append(node)
+        return path
+
+    def add(self, term: str) -> None:
+        """词条频次 +1"""
+        if not term:
+            return
+        if term not in self._counts:
+            self._counts[term] = 0
+            insort(self._sorted, term)
+        self._counts[term] += 1
+        # 频次只增不减：在路径上每个节点的 Top-N 中更新该词条即可
+        for node in self._path(term, create=True):
+            if term not in node.top:
+                node.top.append(term)
+            node.top.sort(key=self._rank_key)
+            del node.top[self.top_n:]
+
+    def discard(self, term: str) -> None:
+        """词条频次 -1，降到 0 时移除"""
+        count = self._counts.get(term)
+        if not count:
+            return
+        if count == 1:
+            del self._counts[term]
+            del self._sorted[bisect_left(self._sorted, term)]
+        else:
+            self._counts[term] = count - 1
+
+        path = self._path(term, create=False)
+        # 自底向上：只有 Top-N 中含该词条的节点需要由子节点重新汇总
+        for depth in range(len(path) - 1, -1, -1):
+            node = path[depth]
+            if term not in node.top:
+                continue
+            candidates = set()
+            for child in node.children.values():
+                candidates.update(child.top)
+            # 恰好在该节点结束的词条（长度等于深度）
+            if depth < self.max_depth:
+                prefix_end = term[:depth]
+                if prefix_end in self._counts:
+                    candidates.add(prefix_end)
+            else:
+                # 截断深度上的节点直接汇总所有以此为前缀的词条
+                candidates.update(self._range(term[:depth]))
+            node.top = sorted(candidates, key=self._rank_key)[:self.top_n]
+            if depth > 0 and not node.top and not node.children:
+                del path[depth - 1].children[term[depth - 1]]
+
+    def _range(self, prefix: str) -> List[str]:
+        """有序数组中以 prefix 开头的全部词条"""
+        start = bisect_left(self._sorted, prefix)
+        result = []
+        for term in self._sorted[start:]:
+            if not term.startswith(prefix):
+                break
+            result.append(term)
+        return result
+
+    def clear(self) -> None:
+        self._counts.clear()
+        self._sorted.clear()
+        self._root = _TrieNode()
+
+    def complete(self, prefix: str, limit: Optional[int] = None) -> List[str]:
+        """按频次降序返回以 prefix 开头的词条（最多 limit 个，不超过 top_n）"""
+        limit = self.top_n if limit is None else min(limit, self.top_n)
+        if len(prefix) > self.max_depth:
+            return sorted(self._range(prefix), key=self._rank_key)[:limit]
+        node = self._root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return []
+        return node.top[:limit]
@@ -0,0 +1,61 @@
+# core/corpus_stats.py
+from collections import Counter
+from typing import Dict, Iterable, List, Set
+
+
+class CorpusStats:
+    """随修改增量维护的语料统计：零标签文章、标签数分布、重复标题分组"""
+
+    def __init__(self):
+        self.zero_tag_ids: Set[str] = set()
+        # 标签数 -> 文章篇数
+        self.tag_count_histogram: Counter = Counter()
+        self.total_tags = 0
+        # 标题 -> 文章 ID 集合；以及出现多于一次的标题
+        self._title_groups: Dict[str, Set[str]] = {}
+        self._duplicate_titles: Set[str] = set()
+
+    def add(self, article_id: str, title: str, tags: Iterable[str]) -> None:
+        tag_count = sum(1 for _ in tags)
+        if tag_count == 0:
+            self.zero_tag_ids.add(article_id)
+        self.tag_count_histogram[tag_count] += 1
+        self.total_tags += tag_count
+
+        group = self._title_groups.setdefault(title, set())
+        group.add(article_id)
+        if len(group) > 1:
+            self._duplicate_titles.add(title)
+
+    def remove(self, article_id: str, title: str, tags: Iterable[str]) -> None:
+        """移除文章；title/tags 须与 add 时一致"""
+        tag_count = sum(1 for _ in tags)
+        self.zero_tag_ids.discard(article_id)
+        self.tag_count_histogram[tag_count] -= 1
+        if self.tag_count_histogram[tag_count] <= 0:
+            del self.tag_count_histogram[tag_count]
+        self.total_tags -= tag_count
+
+        group = self._title_groups.get(title)
+        if group is None:
+            return
+        group.discard(article_id)
+        if len(group) <= 1:
+            self._duplicate_titles.discard(title)
+        if not group:
+            del self._title_groups[title]
+
+    def clear(self) -> None:
+        self.zero_tag_ids.clear()
+        self.tag_count_histogram.clear()
+        self.total_tags = 0
+        self._title_groups.clear()
+        self._duplicate_titles.clear()
+
+    def ids_with_title(self, title: str) -> Set[str]:
+        """标题完全相同的文章 ID 集合"""
+        return self._title_groups.get(title, set())
+
+    def duplicate_title_groups(self) -> Dict[str, List[str]]:
+        """所有重复标题及其文章 ID（耗时只与重复组数量有关）"""
+        return {title: list(self._title_groups[title]) for title in self._duplicate_titles}
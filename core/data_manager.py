@@ -1,74 +1,1310 @@
 # core/data_manager.py
+import atexit
 import json
-import os
-from typing import List, Dict, Optional
+import sys
+import heapq
+import threading
+import time
+from bisect import bisect_left, insort
+from contextlib import contextmanager
+from operator import itemgetter
+from typing import Callable, List, Dict, Iterable, Iterator, MutableMapping, Optional, Sequence, Set, TextIO, Tuple, Union
 
 from .article import Article
+from .binary_snapshot import ArticleRow, SnapshotArticles
+from .completion import CompletionIndex
+from .corpus_stats import CorpusStats
+from .metrics import metrics
+from .query import TAG_SEPARATOR, QueryIndexes, QueryPlan, compile_query
+from .ranking import BM25Index
+from .search_cache import SearchCache
+from .storage import StorageBackend, open_storage
+from .tag_index import TagNgramIndex, TagPostingIndex, TagQuery
+from .title_dedup import TitleDedupIndex
+from .title_search import TitleSearchIndex, normalize_text
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+class ConflictError(Exception):
+    """要修改的文章已被其他进程修改或删除"""
+
 
 class DataManager:
     """数据管理类（无全局标签池，完全动态）"""
     
-    def __init__(self, data_file: str = "article_data.json"):
+    # 启用并行搜索时，语料至少要有这么多篇文章才值得分发到工作进程
+    PARALLEL_SEARCH_MIN = 20000
+    LOAD_PROGRESS_STEP = 5000
+    # 增量变更集的格式标识
+    CHANGES_FORMAT = "article-changes/1"
+    
+    def __init__(self, data_file: str = "article_data.json", journaled: bool = True,
+                 compact_threshold: int = 200, log_stream: Optional[TextIO] = None,
+                 storage: Optional[StorageBackend] = None,
+                 flush_every: int = 0, flush_interval: float = 0, search_workers: int = 0,
+                 on_progress: Optional[Callable[[str, int], None]] = None):
+        """
+        Args:
+            data_file: 数据文件路径；扩展名为 .db/.sqlite/.sqlite3 时使用 SQLite 后端
+            journaled: （JSON 后端）是否启用追加式日志；关闭时每次修改都整体重写快照
+            compact_threshold: （JSON 后端）日志累计多少条记录后压缩进快照
+            log_stream: 提示信息的输出流，默认为标准输出（命令行模式下改为标准错误）
+            storage: 显式指定的存储后端，给出时忽略以上与存储相关的参数
+            flush_every: 延迟写入：累计多少次修改后写入一次（0 表示不按次数触发）
+            flush_interval: 延迟写入：首个未写入的修改之后最多等待多少秒（0 表示不按时间触发）
+                两者都为 0 时每次修改立即同步写入；否则由后台线程写入，退出前须调用 close()
+            search_workers: 标签/标题模糊搜索的并行工作进程数（0 表示不启用）；
+                语料按显示顺序分片常驻在各进程中，修改后在下次搜索时重新分片
+            on_progress: 加载进度回调，参数为 (阶段说明, 已读取的篇数)；
+                读取快照期间每 LOAD_PROGRESS_STEP 篇调用一次，开始建立索引时再调用一次
+        """
         self.data_file = data_file
-        self.articles: List[Article] = []
+        self.log_stream = log_stream
+        # 批量模式嵌套层数及期间是否有未保存的修改
+        self._batch_depth = 0
+        self._batch_dirty = False
+        # 尚未写入存储的变更记录；写入失败后需要整体保存时置位
+        self._pending: List[Dict] = []
+        self._first_pending_at = 0.0
+        self._needs_full_save = False
+        # 有未写入修改的文章在第一次修改前的 (标题, 标签)，与其他进程的修改冲突时据此三方合并；None 表示本地新增
+        self._pending_base: Dict[str, Optional[Tuple[str, List[str]]]] = {}
+        # 已从存储读出、尚未合并到内存的其他进程的变更（后台写入线程只读取不合并，由调用方线程合并）；
+        # 与 _reload_needed 一样只在持有存储锁时读写
+        self._incoming: List[Dict] = []
+        self._reload_needed = False
+        # 与其他进程的修改冲突时的说明，由界面取出后提示用户
+        self.conflicts: List[str] = []
+        # 保护内存数据与待写队列，后台写入线程与修改操作互斥。
+        # 加锁顺序固定为先 _lock 后存储锁：持有存储锁时不能再等待 _lock
+        self._lock = threading.RLock()
+        self._wakeup = threading.Condition(self._lock)
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._writer: Optional[threading.Thread] = None
+        self._closing = False
+        # id -> Article（保持插入顺序，即显示顺序）；二进制快照为 SnapshotArticles，文章被取出时才解码
+        self._articles: MutableMapping[str, Article] = {}
+        # id -> 插入序号，用于把候选集合按显示顺序排序
+        self._order: Dict[str, int] = {}
+        self._next_order = 0
+        self.tag_postings = TagPostingIndex()
+        self.title_index = TitleSearchIndex()
+        self.stats = CorpusStats()
+        # 标签 n-gram 索引与相关度索引构建代价最高，首次搜索时才构建，之后随修改增量更新
+        self._tag_ngrams: Optional[TagNgramIndex] = None
+        self._rank_index: Optional[BM25Index] = None
+        # 语料版本号：内存中的文章每次变化都递增，搜索缓存据此失效
+        self._revision = 0
+        # 持久化的修订号：每次修改文章或删除文章时分配，增量导出以此为检查点
+        self._max_revision = 0
+        # 已删除文章的 ID -> (修订号, 删除时间戳)
+        self._tombstones: Dict[str, Tuple[int, int]] = {}
+        # (修订号, ID) 的有序列表，首次增量导出时构建；修改后旧条目不删除，导出时按当前修订号过滤
+        self._revision_index: Optional[List[Tuple[int, str]]] = None
+        self.search_cache = SearchCache()
+        self.search_workers = search_workers
+        self._search_executor = None
+        self.on_progress = on_progress
+        # 补全索引与查重索引在首次使用时才构建，之后随修改增量更新
+        self._tag_completion: Optional[CompletionIndex] = None
+        self._title_completion: Optional[CompletionIndex] = None
+        self._title_dedup: Optional[TitleDedupIndex] = None
+        self.storage = storage or open_storage(data_file, journaled, compact_threshold, log=self._log)
         self.load_data()
+        if flush_every > 0 or flush_interval > 0:
+            self._writer = threading.Thread(target=self._writer_loop, name="DataManagerWriter", daemon=True)
+            self._writer.start()
+            # 解释器正常退出时补写剩余修改
+            atexit.register(self.close)
+    
+    def _log(self, message: str) -> None:
+        print(message, file=self.log_stream)
+    
+    @property
+    def articles(self) -> List[Article]:
+        """按显示顺序返回全部文章（新列表，修改它不会影响数据）"""
+        return list(self._articles.values())
+    
+    def iter_articles(self) -> Iterator[Article]:
+        """按显示顺序逐篇遍历文章，不复制列表（遍历期间不要修改数据）"""
+        return iter(self._articles.values())
+    
+    def __len__(self) -> int:
+        return len(self._articles)
+    
+    def __contains__(self, article_id: str) -> bool:
+        return article_id in self._articles
     
+    @metrics.timed("load")
     def load_data(self) -> None:
-        if os.path.exists(self.data_file):
+        with self._lock, self.storage.lock():
+            self._load()
+    
+    def _load(self) -> None:
+        self._articles = {}
+        self._order = {}
+        self._next_order = 0
+        self._tombstones = {}
+        loaded: List[Article] = []
+        if self.storage.exists():
             try:
-                with open(self.data_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.articles = [Article.from_dict(article_data) 
-                                   for article_data in data.get("articles", [])]
-                    print(f"成功从 {self.data_file} 加载数据。")
-            except json.JSONDecodeError:
-                print(f"错误：{self.data_file} 文件格式错误，将使用空数据启动。")
-                self.articles = []
+                start = time.perf_counter()
+                opened = self.storage.open_articles()
+                if opened is None:
+                    for article in self.storage.load_snapshot():
+                        loaded.append(article)
+                        if self.on_progress is not None and len(loaded) % self.LOAD_PROGRESS_STEP == 0:
+                            self.on_progress("正在读取数据", len(loaded))
+                else:
+                    # 快照中的 ID 不重复，直接按快照顺序编号
+                    self._articles = opened
+                    self._order = dict(zip(opened, range(len(opened))))
+                    self._next_order = len(opened)
+                elapsed = time.perf_counter() - start
+                self._log(f"成功从 {self.data_file} 加载数据"
+                          f"（{len(loaded) + len(self._articles)} 篇文章，耗时 {elapsed:.2f} 秒{self._peak_memory_text()}）。")
+            except ValueError:  # 含 json.JSONDecodeError 与二进制快照格式错误
+                self._log(f"错误：{self.data_file} 文件格式错误，将使用空数据启动。")
+                self._articles, self._order, self._next_order = {}, {}, 0
+                loaded = []
             except Exception as e:
-                print(f"加载数据时发生未知错误：{e}，将使用空数据启动。")
-                self.articles = []
+                self._log(f"加载数据时发生未知错误：{e}，将使用空数据启动。")
+                self._articles, self._order, self._next_order = {}, {}, 0
+                loaded = []
         else:
-            print(f"未找到数据文件 {self.data_file}，将创建新文件。")
-            self.articles = []
+            self._log(f"未找到数据文件 {self.data_file}，将创建新文件。")
+        
+        needs_compact = False
+        for article in loaded:
+            if article.id in self._articles:
+                old_id = article.id
+                article.id = Article.generate_id(self._articles)
+                self._log(f"警告：文章 ID '{old_id}' 重复，已为 '{article.title}' 重新分配 ID {article.id}。")
+                needs_compact = True
+            self._put(article)
+        
+        self._replay_changes()
+        try:
+            for article_id, stamp in self.storage.load_tombstones().items():
+                self._tombstones.setdefault(article_id, stamp)
+        except (OSError, ValueError) as e:
+            self._log(f"读取删除记录时出错: {e}")
+        needs_compact = needs_compact or self.storage.needs_compact
+        if self.on_progress is not None:
+            self.on_progress("正在建立索引", len(self._articles))
+        self._rebuild_indexes()
+        
+        if needs_compact:
+            self.save_data()
+    
+    @property
+    def dirty(self) -> bool:
+        """是否有尚未写入存储的修改"""
+        return bool(self._pending) or self._batch_dirty or self._needs_full_save
+    
+    def close(self) -> None:
+        """停止后台写入线程、写入剩余修改并释放存储后端占用的资源（可重复调用）"""
+        if self._closing:
+            return
+        with self._lock:
+            self._closing = True
+            self._wakeup.notify()
+        if self._writer is not None:
+            self._writer.join()
+            atexit.unregister(self.close)
+        self.flush()
+        if self._search_executor is not None:
+            self._search_executor.close()
+        self.storage.close()
+    
+    @staticmethod
+    def _peak_memory_text() -> str:
+        """进程峰值内存（仅在提供 resource 模块的平台上可用）"""
+        if resource is None:
+            return ""
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux 以 KB 为单位，macOS 以字节为单位
+        peak_mb = peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+        return f"，峰值内存 {peak_mb:.1f} MB"
+    
+    def _put(self, article: Article) -> None:
+        """插入或替换文章；替换时保留原有位置"""
+        if article.id not in self._order:
+            self._order[article.id] = self._next_order
+            self._next_order += 1
+        self._articles[article.id] = article
+    
+    def _pop(self, article_id: str) -> Optional[Article]:
+        self._order.pop(article_id, None)
+        return self._articles.pop(article_id, None)
+    
+    def _article_rows(self) -> Iterable[Union[Article, ArticleRow]]:
+        """
+        按显示顺序只读遍历全部文章的内容（id/title/tag_tuple/revision/modified），供建立索引、整体保存与全量扫描使用；
+        二进制快照中尚未取出的文章给出 ArticleRow，不解码成 Article
+        """
+        if isinstance(self._articles, SnapshotArticles):
+            return self._articles.peek_values()
+        return self._articles.values()
+    
+    def _replay_changes(self) -> None:
+        """在快照之上重放后端的变更记录；记录均为幂等的 upsert/remove，可重复重放"""
+        for record in self.storage.replay():
+            op = record.get("op")
+            if op in ("add", "update"):
+                self._put(Article.from_dict(record.get("article", {})))
+            elif op == "remove":
+                self._pop(record.get("id"))
+                if "revision" in record:
+                    self._tombstones[record["id"]] = (record["revision"], record.get("modified", 0))
+    
+    @staticmethod
+    def _record_id(record: Dict) -> Optional[str]:
+        if record.get("op") == "remove":
+            return record.get("id")
+        return record.get("article", {}).get("id")
+    
+    def _apply_record(self, record: Dict) -> None:
+        """把一条变更记录应用到内存并维护索引；已有文章原地修改，调用方持有的对象保持有效"""
+        op = record.get("op")
+        if op == "remove":
+            article = self._pop(record.get("id"))
+            if article is not None:
+                self._unindex_article(article)
+            if "revision" in record:
+                self._set_tombstone(record["id"], record["revision"], record.get("modified", 0))
+        elif op in ("add", "update"):
+            data = record.get("article", {})
+            article = self._articles.get(data.get("id"))
+            if article is None:
+                article = Article.from_dict(data)
+                self._put(article)
+            else:
+                self._unindex_article(article)
+                article.title = data.get("title", "")
+                article.set_tags(data.get("tags", []))
+                article.revision = data.get("revision", 0)
+                article.modified = data.get("modified", 0)
+            self._index_article(article)
+    
+    def _fetch_external(self) -> None:
+        """读取其他进程写入的变更暂存到 self._incoming，不修改内存数据（调用方须持有存储锁）"""
+        if self._reload_needed:
+            return
+        try:
+            records = self.storage.changes()
+        except Exception as e:
+            self._log(f"读取其他进程的修改时出错: {e}")
+            return
+        if records is None:
+            self._reload_needed = True
+            self._incoming = []
+        else:
+            self._incoming.extend(records)
+    
+    def _merge_external(self) -> Optional[Set[str]]:
+        """
+        合并其他进程写入的变更（调用方须持有 self._lock 与存储锁）
+
+        其他进程修改了本进程也有未写入修改的文章时，按 _resolve_conflict 的规则合并，说明记入 self.conflicts。
+
+        Returns:
+            被其他进程修改的文章 ID；None 表示数据已被整体重写，已重新加载
+        """
+        self._fetch_external()
+        if self._reload_needed:
+            self._reload_needed = False
+            self._log(f"{self.data_file} 已被其他进程整体改写，正在重新加载...")
+            pending, self._pending = self._pending, []
+            self.load_data()
+            for record in pending:
+                self._apply_record(record)
+            self._pending = pending
+            return None
+        records, self._incoming = self._incoming, []
+        touched: Set[str] = set()
+        for record in records:
+            article_id = self._record_id(record)
+            if article_id in self._pending_ids():
+                self._resolve_conflict(record)
+            else:
+                self._apply_record(record)
+            touched.add(article_id)
+        return touched
+    
+    def _pending_ids(self) -> Set[str]:
+        return {self._record_id(record) for record in self._pending}
+    
+    def _remember_base(self, article: Optional[Article], article_id: str) -> None:
+        """本地修改文章前调用：记下第一次未写入的修改之前的内容"""
+        if not self._batch_depth and article_id not in self._pending_base:
+            self._pending_base[article_id] = None if article is None else (article.title, article.tags)
+    
+    def _drop_pending(self, article_id: str) -> None:
+        self._pending = [record for record in self._pending if self._record_id(record) != article_id]
+        self._pending_base.pop(article_id, None)
+    
+    def _resolve_conflict(self, record: Dict) -> None:
+        """
+        其他进程的修改与本进程未写入的修改落在同一篇文章上时合并两者
+
+        规则：
+            双方都是修改时按字段三方合并（以本地第一次修改前的内容为基准），只有一方改动的字段取改动后的值；
+            双方改成不同值的字段取修改时间较新的一方（相同时比较内容，结果确定）。
+            一方删除、一方修改时，修改时间较新者胜出，时间相同时删除胜出（与 apply_changes 一致）。
+        合并结果以新的修订号重新排入待写队列；每次冲突的说明记入 self.conflicts。
+        """
+        article_id = self._record_id(record)
+        local = self._articles.get(article_id)
+        if record.get("op") == "remove":
+            if local is None:
+                self._apply_record(record)
+            elif record.get("modified", 0) >= local.modified:
+                self._drop_pending(article_id)
+                self._apply_record(record)
+                self.conflicts.append(f"文章 {article_id}「{local.title}」已被其他进程删除，本进程未保存的修改已放弃。")
+            else:
+                self.conflicts.append(f"文章 {article_id}「{local.title}」已被其他进程删除，"
+                                      f"但本进程的修改较新，已保留本进程的版本。")
+            return
+
+        data = record.get("article", {})
+        incoming_modified = data.get("modified", 0)
+        if local is None:
+            # 本进程删除了这篇文章，尚未写入
+            if incoming_modified > self._tombstones.get(article_id, (0, 0))[1]:
+                self._drop_pending(article_id)
+                self._apply_record(record)
+                self.conflicts.append(f"本进程删除的文章 {article_id} 随后被其他进程修改，已恢复为其他进程的版本。")
+            else:
+                self.conflicts.append(f"文章 {article_id} 已在本进程删除，其他进程较早的修改已忽略。")
+            return
+
+        theirs = (data.get("title", ""), list(dict.fromkeys(tag for tag in data.get("tags", []) if tag)))
+        mine = (local.title, local.tags)
+        base = self._pending_base.get(article_id)
+        mine_newer = ((local.modified, self._content_key(*mine))
+                      >= (incoming_modified, self._content_key(*theirs)))
+        merged = []
+        clashed = []
+        for field, label in enumerate(("标题", "标签")):
+            if theirs[field] == mine[field] or (base is not None and theirs[field] == base[field]):
+                merged.append(mine[field])
+            elif base is not None and mine[field] == base[field]:
+                merged.append(theirs[field])
+            else:
+                merged.append(mine[field] if mine_newer else theirs[field])
+                clashed.append(label)
+        # 之后的修改以其他进程的版本（已在存储中）为基准
+        self._pending_base[article_id] = theirs
+        if tuple(merged) == theirs:
+            self._drop_pending(article_id)
+            self._apply_record(record)
+        else:
+            self._unindex_article(local)
+            merged_title, merged_tags = merged
+            local.title = merged_title
+            local.set_tags(merged_tags)
+            local.revision, local.modified = self._next_stamp(max(local.modified, incoming_modified))
+            self._index_article(local)
+            self._pending = [r for r in self._pending if self._record_id(r) != article_id]
+            self._pending.append({"op": "update", "article": local.to_dict()})
+        if clashed:
+            kept = "本进程" if mine_newer else "其他进程"
+            self.conflicts.append(f"文章 {article_id}「{merged[0]}」的{'与'.join(clashed)}同时被其他进程修改，"
+                                  f"已保留修改时间较新的{kept}的版本。")
+        else:
+            self.conflicts.append(f"已把其他进程对文章 {article_id}「{merged[0]}」的修改与本进程的修改合并。")
+    
+    def take_conflicts(self) -> List[str]:
+        """取出（并清空）合并时产生的冲突说明"""
+        with self._lock:
+            conflicts, self.conflicts = self.conflicts, []
+        return conflicts
+    
+    @metrics.timed("refresh")
+    def refresh(self) -> int:
+        """
+        合并其他进程写入的修改（只读取新增的变更记录，无需重新解析整个数据文件）
+
+        Returns:
+            受影响的文章数；数据被整体重写而重新加载时返回全部文章数
+        """
+        with self._lock:
+            try:
+                with self.storage.lock():
+                    touched = self._merge_external()
+            except OSError as e:
+                self._log(f"同步 {self.data_file} 时出错: {e}")
+                return 0
+        return len(self._articles) if touched is None else len(touched)
+    
+    def _sync_for_change(self, article: Optional[Article] = None) -> None:
+        """
+        修改前合并其他进程的修改；要修改的文章已被其他进程改动或删除时抛出 ConflictError
+
+        启用后台写入时不等待存储锁：锁正被后台写入线程或其他进程持有时跳过合并，
+        其他进程的修改留到下次合并，与本进程未写入修改的冲突由 _resolve_conflict 处理
+        """
+        if self._batch_depth:
+            # 批量修改期间一直持有存储锁，开始时已合并过
+            return
+        try:
+            with self.storage.lock(blocking=self._writer is None):
+                touched = self._merge_external()
+        except BlockingIOError:
+            return
+        except OSError as e:
+            self._log(f"同步 {self.data_file} 时出错: {e}")
+            return
+        if article is None:
+            return
+        if touched is None or article.id in touched or self._articles.get(article.id) is not article:
+            raise ConflictError(f"文章 {article.id} 已被其他进程修改或删除，已载入最新内容，请重新操作。")
     
     def save_data(self) -> None:
+        """将全部文章整体写入存储后端（JSON 后端为原子替换快照并轮转日志）"""
+        self._save(compacting=False)
+    
+    @metrics.timed("save")
+    def _save(self, compacting: bool) -> None:
+        with self._lock:
+            try:
+                with self.storage.lock():
+                    # 先合并其他进程的修改，整体写入时才不会覆盖它们
+                    self._merge_external()
+                    self.storage.save_all(self._article_rows(), compacting, tombstones=self._live_tombstones())
+            except Exception as e:
+                self._log(f"保存数据到 {self.data_file} 时出错: {e}")
+                # 保留脏标记，下次写入时重试整体保存
+                self._needs_full_save = True
+                return
+            # 整体保存已包含所有待写的修改
+            self._pending = []
+            self._pending_base = {}
+            self._needs_full_save = False
+    
+    def flush(self, background: bool = False) -> bool:
+        """
+        立即写入全部未写入的修改；没有修改时不做任何磁盘操作，返回是否写入
+
+        Args:
+            background: 由后台写入线程调用，见 _flush_background
+        """
+        if background:
+            return self._flush_background()
+        with self._lock:
+            if not (self._pending or self._needs_full_save):
+                return False
+            try:
+                with self.storage.lock():
+                    self._merge_external()
+                    return self._write_pending()
+            except OSError as e:
+                # 如无法加锁：保留待写记录，下次再试
+                self._log(f"写入数据到 {self.data_file} 时出错: {e}")
+                return False
+    
+    @metrics.timed("flush")
+    def _write_pending(self) -> bool:
+        """逐条写入待写的变更记录，由后端决定何时需要整体保存（调用方持有 self._lock 与存储锁且已合并），返回是否写入"""
+        needs_save = self._needs_full_save
+        # 所有记录都已写入后的整体保存只是压缩日志，版本不变
+        compacting = not needs_save
+        if not needs_save:
+            for record in self._pending:
+                try:
+                    needs_save = self.storage.append(record) or needs_save
+                except Exception as e:
+                    self._log(f"写入变更记录到 {self.data_file} 时出错: {e}，改为完整保存。")
+                    needs_save = True
+                    compacting = False
+                    break
+        if needs_save:
+            self._save(compacting)
+            return True
+        self._pending = []
+        self._pending_base = {}
+        return True
+    
+    @metrics.timed("flush")
+    def _flush_background(self) -> bool:
+        """
+        后台写入线程的写入，返回是否写入了记录
+
+        只在取出待写记录（及复制文章内容）和记下写入结果时短暂持有 self._lock；等待存储锁、
+        逐条追加（每条 fsync）、日志压缩与整体保存期间都不持有，界面线程的修改不必等待磁盘。
+        其他进程的变更只读取不合并（界面线程可能正在遍历），涉及的文章暂不写入，由调用方线程合并后再写
+        """
+        with self._lock:
+            if not (self._pending or self._needs_full_save):
+                return False
+            batch = list(self._pending)
+            if self._needs_full_save:
+                # 此前追加失败：整体保存复制下来的内容，其中已包含这批待写的修改
+                copy = self._copy_articles()
+                return copy is not None and self._save_copy(copy, compacting=False, saved=batch)
+        written: List[Dict] = []
+        failed = compact = False
+        try:
+            with self.storage.lock():
+                self._fetch_external()
+                if self._reload_needed:
+                    return False
+                # 等待存储锁期间调用方线程可能已写入或合并掉其中的记录，只写仍在待写队列中的；
+                # 移出待写队列只发生在持有存储锁时，这里读取是安全的
+                live = {id(record) for record in self._pending}
+                # 尚未合并的其他进程变更涉及的文章暂不写入，合并（解决冲突）之后再写
+                held = {self._record_id(record) for record in self._incoming}
+                for record in batch:
+                    if id(record) not in live or self._record_id(record) in held:
+                        continue
+                    try:
+                        compact = self.storage.append(record) or compact
+                    except Exception as e:
+                        self._log(f"写入变更记录到 {self.data_file} 时出错: {e}，改为完整保存。")
+                        failed = True
+                        break
+                    written.append(record)
+        except OSError as e:
+            # 如无法加锁：保留待写记录，下次再试
+            self._log(f"写入数据到 {self.data_file} 时出错: {e}")
+        with self._lock:
+            self._drop_written(written)
+            if failed:
+                # 下一次写入时整体保存（已写入的记录会被整体保存覆盖，重复写入无害）
+                self._needs_full_save = True
+        if compact and not failed:
+            with self._lock:
+                copy = self._copy_articles()
+            if copy is not None:
+                self._save_copy(copy, compacting=True)
+        return bool(written)
+    
+    def _copy_articles(self) -> Optional[Tuple]:
+        """
+        复制当前的文章内容、删除记录与存储版本号，供后台线程在不持有 self._lock 时整体写入（调用方持有 self._lock）；
+        有已读取但尚未合并的其他进程变更时返回 None（整体写入会覆盖它们）
+        """
+        # 界面线程读取与合并其他进程的变更时都持有 self._lock，这里读取 _incoming 是安全的
+        if self._incoming or self._reload_needed:
+            return None
+        rows = [(article.id, article.title, article.tag_tuple, article.revision, article.modified)
+                for article in self._article_rows()]
+        return rows, self._live_tombstones(), self.storage.version
+    
+    def _save_copy(self, copy: Tuple, compacting: bool, saved: Sequence[Dict] = ()) -> bool:
+        """
+        后台线程整体写入 _copy_articles() 复制的内容，只持有存储锁，返回是否写入
+
+        复制的内容可能已包含尚未写入日志的本进程修改，这些记录之后照常追加（重复应用无害）；
+        复制之后存储又有写入（其他进程的变更或调用方线程的写入）时放弃，留到下一次写入。
+        saved 为复制时已在待写队列中的记录，整体保存成功后移出队列
+        """
+        rows, tombstones, version = copy
         try:
-            with open(self.data_file, 'w', encoding='utf-8') as f:
-                data = {
-                    "articles": [article.to_dict() for article in self.articles]
-                }
-                json.dump(data, f, ensure_ascii=False, indent=4)
+            with self.storage.lock():
+                self._fetch_external()
+                if self._incoming or self._reload_needed or self.storage.version != version:
+                    return False
+                self.storage.save_all((Article(title, list(tags), article_id=article_id,
+                                               revision=revision, modified=modified)
+                                       for article_id, title, tags, revision, modified in rows),
+                                      compacting, tombstones=tombstones)
         except Exception as e:
-            print(f"保存数据到 {self.data_file} 时出错: {e}")
+            self._log(f"保存数据到 {self.data_file} 时出错: {e}")
+            return False
+        if not compacting:
+            with self._lock:
+                self._drop_written(saved)
+                self._needs_full_save = False
+        return True
+    
+    def _drop_written(self, written: Sequence[Dict]) -> None:
+        """后台写入成功后把已写入的记录移出待写队列（调用方持有 self._lock），写入期间新增的记录保留"""
+        done = {id(record) for record in written}
+        self._pending = [record for record in self._pending if id(record) not in done]
+        pending_ids = self._pending_ids()
+        # 写入期间又被修改的文章，三方合并的基准改为已写入的最后一版
+        for record in written:
+            article_id = self._record_id(record)
+            if article_id in pending_ids:
+                data = record.get("article")
+                self._pending_base[article_id] = None if data is None else (data["title"], data["tags"])
+        self._pending_base = {article_id: base for article_id, base in self._pending_base.items()
+                              if article_id in pending_ids}
+    
+    def _writer_loop(self) -> None:
+        """后台写入线程：累计到 flush_every 次修改或等待满 flush_interval 秒后写入（写入时不持有 self._lock）"""
+        while True:
+            with self._lock:
+                if self._closing:
+                    return
+                if not self._pending:
+                    self._wakeup.wait()
+                    continue
+                if not (self.flush_every and len(self._pending) >= self.flush_every):
+                    if not self.flush_interval:
+                        self._wakeup.wait()
+                        continue
+                    remaining = self._first_pending_at + self.flush_interval - time.monotonic()
+                    if remaining > 0:
+                        self._wakeup.wait(remaining)
+                        continue
+            if not self.flush(background=True):
+                with self._lock:
+                    # 写入失败（已记录日志）或有修改需等调用方线程合并后再写时稍后重试，避免忙等
+                    if not self._closing:
+                        self._wakeup.wait(max(self.flush_interval, 1.0))
+    
+    def _persist(self, op: str, article: Article) -> None:
+        """持久化一次修改：生成一条变更记录，同步写入或交给后台线程延迟写入"""
+        if self._batch_depth:
+            self._batch_dirty = True
+            return
+        if op == "remove":
+            revision, modified = self._tombstones[article.id]
+            record = {"op": op, "id": article.id, "revision": revision, "modified": modified}
+        else:
+            record = {"op": op, "article": article.to_dict()}
+        if not self._pending:
+            self._first_pending_at = time.monotonic()
+        self._pending.append(record)
+        if self._writer is None:
+            self.flush()
+        else:
+            self._wakeup.notify()
+    
+    @contextmanager
+    def batch(self) -> Iterator['DataManager']:
+        """
+        批量修改：期间不逐条持久化，正常结束时只保存一次快照；
+        发生异常时丢弃这批修改并从磁盘重新加载，相当于一次事务。
+        期间持有存储锁，其他进程的写入会等待这批修改完成
+        """
+        if self._batch_depth:
+            self._batch_depth += 1
+            try:
+                yield self
+            finally:
+                self._batch_depth -= 1
+            return
+        with self._lock, self.storage.lock():
+            # 先写入此前延迟的修改并合并其他进程的修改，回滚时重新加载的才是批量开始前的状态
+            self.flush()
+            self._merge_external()
+            self._batch_depth = 1
+            try:
+                yield self
+            except BaseException:
+                self._batch_depth = 0
+                if self._batch_dirty:
+                    self._batch_dirty = False
+                    self.load_data()
+                raise
+            self._batch_depth = 0
+            if self._batch_dirty:
+                self._batch_dirty = False
+                self.save_data()
     
+    def _rebuild_indexes(self) -> None:
+        self._revision += 1
+        self._max_revision = max((revision for revision, _ in self._tombstones.values()), default=0)
+        self._revision_index = None
+        self._tag_ngrams = None
+        self._rank_index = None
+        self.tag_postings.clear()
+        self.title_index.clear()
+        self.stats.clear()
+        self._tag_completion = None
+        self._title_completion = None
+        self._title_dedup = None
+        for article in self._article_rows():
+            self._index_article(article)
+    
+    def _index_article(self, article: Article) -> None:
+        self._revision += 1
+        if article.revision:
+            if article.revision > self._max_revision:
+                self._max_revision = article.revision
+            if self._revision_index is not None:
+                self._add_revision_entry(article.revision, article.id)
+        tags = article.tag_tuple
+        if self._tag_ngrams is not None:
+            self._tag_ngrams.add(article.id, tags)
+        self.tag_postings.add(article.id, tags)
+        self.title_index.add(article.id, article.title)
+        if self._rank_index is not None:
+            self._rank_index.add(article.id, article.title, tags)
+        self.stats.add(article.id, article.title, tags)
+        if self._tag_completion is not None:
+            for tag in tags:
+                self._tag_completion.add(tag)
+            self._title_completion.add(article.title)
+        if self._title_dedup is not None:
+            self._title_dedup.add(article.id, article.title)
+    
+    def _unindex_article(self, article: Article) -> None:
+        self._revision += 1
+        tags = article.tag_tuple
+        if self._tag_ngrams is not None:
+            self._tag_ngrams.remove(article.id, tags)
+        self.tag_postings.remove(article.id, tags)
+        self.title_index.remove(article.id)
+        if self._rank_index is not None:
+            self._rank_index.remove(article.id, article.title, tags)
+        self.stats.remove(article.id, article.title, tags)
+        if self._tag_completion is not None:
+            for tag in tags:
+                self._tag_completion.discard(tag)
+            self._title_completion.discard(article.title)
+        if self._title_dedup is not None:
+            self._title_dedup.remove(article.id, article.title)
+    
+    def _next_stamp(self, previous_modified: int = 0) -> Tuple[int, int]:
+        """分配下一个 (修订号, 修改时间戳)；时间戳保证大于上一次，时钟回拨时也不倒退"""
+        self._max_revision += 1
+        return self._max_revision, max(int(time.time() * 1000), previous_modified + 1)
+    
+    def _stamp(self, article: Article) -> None:
+        """本地编辑文章时调用（在重新建立索引之前）"""
+        article.revision, article.modified = self._next_stamp(article.modified)
+    
+    def _set_tombstone(self, article_id: str, revision: int, modified: int) -> None:
+        self._tombstones[article_id] = (revision, modified)
+        if revision > self._max_revision:
+            self._max_revision = revision
+        if self._revision_index is not None:
+            self._add_revision_entry(revision, article_id)
+    
+    def _add_revision_entry(self, revision: int, article_id: str) -> None:
+        index = self._revision_index
+        if len(index) > 2 * (len(self._articles) + len(self._tombstones)) + 1000:
+            # 过期条目太多时丢弃，下次导出时重建
+            self._revision_index = None
+            return
+        if not index or index[-1][0] <= revision:
+            # 本地修改的修订号单调递增，绝大多数情况直接追加
+            index.append((revision, article_id))
+        else:
+            insort(index, (revision, article_id))
+    
+    def _live_tombstones(self) -> Dict[str, Tuple[int, int]]:
+        """仍需保留的删除记录：之后又被重新添加的文章不再需要"""
+        return {article_id: stamp for article_id, stamp in self._tombstones.items()
+                if article_id not in self._articles}
+    
+    @property
+    def max_revision(self) -> int:
+        """当前最大的修订号，可作为下一次增量导出的检查点"""
+        return self._max_revision
+    
+    @property
+    def tombstones(self) -> Dict[str, Tuple[int, int]]:
+        """已删除文章的 ID -> (修订号, 删除时间戳)（新字典）"""
+        return self._live_tombstones()
+    
+    @property
+    def tag_index(self) -> TagNgramIndex:
+        """标签 n-gram 索引（首次访问时构建）"""
+        if self._tag_ngrams is None:
+            index = TagNgramIndex()
+            for article in self._article_rows():
+                index.add(article.id, article.tag_tuple)
+            self._tag_ngrams = index
+        return self._tag_ngrams
+    
+    @property
+    def rank_index(self) -> BM25Index:
+        """BM25 相关度索引（首次访问时构建）"""
+        if self._rank_index is None:
+            index = BM25Index()
+            for article in self._article_rows():
+                index.add(article.id, article.title, article.tag_tuple)
+            self._rank_index = index
+        return self._rank_index
+    
+    def _in_display_order(self, article_ids: Iterable[str]) -> List[Article]:
+        """把一组文章 ID 按显示顺序转换为文章列表（耗时只与集合大小有关）"""
+        return [self._articles[article_id]
+                for article_id in sorted(article_ids, key=self._order.__getitem__)]
+    
+    def _peek_in_display_order(self, article_ids: Iterable[str]) -> List[Union[Article, ArticleRow]]:
+        """同 _in_display_order，但只读取内容：二进制快照中尚未取出的文章给出 ArticleRow，不解码成 Article"""
+        ordered = sorted(article_ids, key=self._order.__getitem__)
+        if isinstance(self._articles, SnapshotArticles):
+            return [self._articles.peek(article_id) for article_id in ordered]
+        return [self._articles[article_id] for article_id in ordered]
+    
+    @metrics.timed("mutation.add")
     def add_article(self, article: Article) -> None:
-        self.articles.append(article)
-        self.save_data()
+        with self._lock:
+            self._sync_for_change()
+            if article.id in self._articles:
+                old_id = article.id
+                article.id = Article.generate_id(self._articles)
+                self._log(f"警告：文章 ID '{old_id}' 已存在，已重新分配 ID {article.id}。")
+            self._remember_base(None, article.id)
+            self._stamp(article)
+            self._put(article)
+            self._index_article(article)
+            self._persist("add", article)
     
+    @metrics.timed("mutation.remove")
     def remove_article(self, article_id: str) -> bool:
-        for i, article in enumerate(self.articles):
-            if article.id == article_id:
-                self.articles.pop(i)
-                self.save_data()
-                return True
-        return False
+        with self._lock:
+            self._sync_for_change()
+            article = self._pop(article_id)
+            if article is None:
+                return False
+            self._remember_base(article, article_id)
+            self._unindex_article(article)
+            self._set_tombstone(article_id, *self._next_stamp(article.modified))
+            self._persist("remove", article)
+            return True
+    
+    @metrics.timed("mutation.update_title")
+    def update_article_title(self, article: Article, new_title: str) -> None:
+        """修改文章标题（经由此方法修改以保持索引一致）"""
+        with self._lock:
+            self._sync_for_change(article)
+            self._remember_base(article, article.id)
+            self._unindex_article(article)
+            article.title = new_title
+            self._stamp(article)
+            self._index_article(article)
+            self._persist("update", article)
+    
+    @metrics.timed("mutation.update_tags")
+    def update_article_tags(self, article: Article, new_tags: List[str]) -> None:
+        """替换文章标签（经由此方法修改以保持索引一致）"""
+        with self._lock:
+            self._sync_for_change(article)
+            self._remember_base(article, article.id)
+            self._unindex_article(article)
+            article.set_tags(new_tags)
+            self._stamp(article)
+            self._index_article(article)
+            self._persist("update", article)
     
     def find_article_by_id(self, article_id: str) -> Optional[Article]:
-        for article in self.articles:
-            if article.id == article_id:
-                return article
-        return None
+        return self._articles.get(article_id)
     
     def search_articles_by_tags(self, search_tags: List[str]) -> List[Article]:
         """根据标签列表搜索（AND 精确匹配）"""
-        return [article for article in self.articles 
-                if article.has_all_tags(search_tags)]
+        return self.query_tags(all_of=search_tags)
+    
+    def query_tags(self, all_of: Iterable[str] = (), any_of: Iterable[str] = (),
+                   none_of: Iterable[str] = ()) -> List[Article]:
+        """
+        精确标签组合查询，由标签倒排表求交/并/差，结果保持显示顺序
+
+        Args:
+            all_of: 必须全部包含的标签（AND）
+            any_of: 至少包含其一的标签（OR）
+            none_of: 不得包含的标签（NOT）
+        """
+        query = TagQuery(tuple(all_of), tuple(any_of), tuple(none_of))
+        return self.query_tags_batch([query])[0]
+    
+    @metrics.timed("search.exact_tags")
+    def query_tags_batch(self, queries: List[TagQuery]) -> List[List[Article]]:
+        """一次执行多个精确标签查询，各查询共享同一份倒排表查找结果"""
+        cache: Dict[str, Set[str]] = {}
+        return [self._in_display_order(self.tag_postings.evaluate(query, self._articles, cache))
+                for query in queries]
+    
+    @property
+    def revision(self) -> int:
+        """语料版本号：文章每次被添加、删除或修改都会变化"""
+        return self._revision
+    
+    def _cached(self, key: Tuple, compute) -> Tuple:
+        """按归一化的查询键读取缓存的结果（文章 ID 等），未命中或已失效时重新计算"""
+        value = self.search_cache.get(key, self._revision)
+        if value is None:
+            metrics.count("search.cache_misses")
+            value = tuple(compute())
+            self.search_cache.put(key, self._revision, value)
+        else:
+            metrics.count("search.cache_hits")
+        return value
+    
+    @metrics.timed("search.tags")
+    def fuzzy_search_by_tags(self, keywords: List[str]) -> List[Article]:
+        """
+        标签模糊 AND 搜索：每个关键词至少作为子串出现在文章的某个标签中
+
+        结果按去重排序后的关键词缓存；语料修改后缓存失效
+        """
+        key = ("tags", tuple(sorted(set(keywords))))
+        found_ids = self._cached(key, lambda: (a.id for a in self._fuzzy_search_by_tags(keywords)))
+        return [self._articles[article_id] for article_id in found_ids]
+    
+    def _fuzzy_search_by_tags(self, keywords: List[str]) -> List[Article]:
+        """
+        先用 n-gram 倒排索引求候选集，再对候选文章做子串校验，结果保持文章原顺序；
+        后端提供全文索引（SQLite FTS5）时直接由其给出匹配结果
+        """
+        found_ids = self._storage_search(self.storage.search_tags, keywords)
+        if found_ids is not None:
+            self._count_scan("search.tags", len(found_ids), len(found_ids))
+            return self._in_display_order(found_ids)
+        ordered_ids = self._parallel_search("tags", keywords)
+        if ordered_ids is not None:
+            self._count_scan("search.tags", len(self._articles), len(ordered_ids))
+            return [self._articles[article_id] for article_id in ordered_ids]
+        candidate_ids = self.tag_index.candidates(keywords)
+        if candidate_ids is None:
+            candidates, scanned = self._article_rows(), len(self._articles)
+        else:
+            candidates = self._peek_in_display_order(candidate_ids)
+            scanned = len(candidates)
+        found = [self._articles[article.id] for article in candidates
+                 if all(any(kw in tag for tag in article.tag_tuple) for kw in keywords)]
+        self._count_scan("search.tags", scanned, len(found))
+        return found
+    
+    @staticmethod
+    def _count_scan(name: str, scanned: int, matched: int) -> None:
+        """记录一次搜索校验过的文章数与命中数"""
+        metrics.count(name + ".scanned", scanned)
+        metrics.count(name + ".matched", matched)
+    
+    def _parallel_search(self, field: str, keywords: List[str]) -> Optional[List[str]]:
+        """
+        在工作进程上分片执行 AND 子串搜索，按显示顺序返回命中的 ID；
+        未启用、语料太小或出错时返回 None，由调用方改用单进程搜索
+        """
+        if (self.search_workers <= 0 or len(self._articles) < self.PARALLEL_SEARCH_MIN
+                or not keywords or not all(keywords)):
+            return None
+        try:
+            if self._search_executor is None:
+                # 只在启用时才导入 multiprocessing
+                from .parallel_search import ShardedSearchExecutor
+                self._search_executor = ShardedSearchExecutor(self.search_workers)
+            executor = self._search_executor
+            if executor.revision != self._revision:
+                executor.load([(article.id, self.title_index.normalized_title(article.id), article.tag_tuple)
+                               for article in self._article_rows()], self._revision)
+            return executor.search(field, keywords)
+        except Exception as e:
+            # 工作进程起不来或中途退出时不再反复重试
+            self.search_workers = 0
+            self._log(f"并行搜索出错: {e}，已改用单进程搜索。")
+            return None
+    
+    def _storage_search(self, search, keywords: List[str]) -> Optional[Set[str]]:
+        """用后端的全文索引搜索；有修改尚未写入后端时不可用"""
+        if self.dirty or not keywords:
+            return None
+        try:
+            found_ids = search(keywords)
+        except Exception as e:
+            self._log(f"全文索引查询出错: {e}，改用内存索引。")
+            return None
+        if found_ids is None:
+            return None
+        return {article_id for article_id in found_ids if article_id in self._articles}
     
     def search_articles_by_title(self, keyword: str) -> List[Article]:
-        keyword_lower = keyword.lower()
-        return [article for article in self.articles 
-                if keyword_lower in article.title.lower()]
+        return self.search_titles([keyword])
+    
+    @metrics.timed("search.title")
+    def search_titles(self, keywords: List[str]) -> List[Article]:
+        """
+        标题模糊 AND 搜索：标题须包含全部关键词
+
+        匹配前统一做全角/半角、大小写（及可选的繁简）归一化，结果保持显示顺序；
+        结果按归一化后的关键词缓存
+        """
+        normalized = [kw for kw in map(normalize_text, keywords) if kw]
+        if not normalized:
+            return self.articles
+        
+        def compute() -> Iterable[str]:
+            found_ids = self._storage_search(self.storage.search_titles, normalized)
+            if found_ids is not None:
+                self._count_scan("search.title", len(found_ids), len(found_ids))
+            else:
+                ordered_ids = self._parallel_search("title", normalized)
+                # 标题缓冲区扫描与并行搜索都要扫过全部标题
+                if ordered_ids is not None:
+                    self._count_scan("search.title", len(self._articles), len(ordered_ids))
+                    return ordered_ids
+                found_ids = self.title_index.search(keywords)
+                self._count_scan("search.title", len(self._articles), len(found_ids))
+            return sorted(found_ids, key=self._order.__getitem__)
+        
+        found_ids = self._cached(("title", tuple(sorted(set(normalized)))), compute)
+        return [self._articles[article_id] for article_id in found_ids]
+    
+    @metrics.timed("search.rank")
+    def ranked_search(self, query: str, top_k: int = 10) -> List[Tuple[Article, float]]:
+        """按 BM25 相关度在标题和标签中检索，返回得分最高的 top_k 篇 (文章, 得分)"""
+        key = ("rank", " ".join(query.split()), top_k)
+        results = self._cached(key, lambda: self.rank_index.search(query, top_k))
+        return [(self._articles[article_id], score) for article_id, score in results]
+    
+    @metrics.timed("search.query")
+    def query(self, text: str) -> List[Article]:
+        """
+        按查询语言搜索（AND/OR/NOT、短语、正则、title:/tag: 字段限定，语法见 core.query），结果保持显示顺序
+
+        编译后的查询计划按原始文本缓存，结果按规范化的查询文本缓存；语法错误抛出 QuerySyntaxError
+        """
+        plan = compile_query(text)
+        found_ids = self._cached(("query", plan.text), lambda: self._run_query(plan))
+        return [self._articles[article_id] for article_id in found_ids]
+    
+    def explain_query(self, text: str) -> Dict:
+        """
+        执行查询并返回执行计划：各索引步骤的候选数、逐篇校验的剩余条件、校验篇数与命中数（不读写结果缓存）
+        """
+        plan = compile_query(text)
+        steps: List[Dict] = []
+        found_ids = self._run_query(plan, steps)
+        return {
+            "query": plan.text,
+            "steps": steps,
+            "residual": plan.residual_text,
+            "scanned": steps[-1]["scanned"],
+            "matched": len(found_ids),
+        }
+    
+    def _run_query(self, plan: QueryPlan, explain: Optional[List[Dict]] = None) -> List[str]:
+        """先用索引求候选集，再对候选按显示顺序单趟校验剩余条件"""
+        indexes = QueryIndexes(self.title_index, self.tag_postings, lambda: self.tag_index)
+        candidate_ids = plan.candidates(indexes, explain)
+        if candidate_ids is None:
+            candidates, scanned = self._article_rows(), len(self._articles)
+        elif len(candidate_ids) * 2 > len(self._articles):
+            # 候选占大半时按显示顺序过滤全部文章，比对候选排序更快
+            candidates = [article for article in self._article_rows() if article.id in candidate_ids]
+            scanned = len(candidates)
+        else:
+            candidates = self._peek_in_display_order(candidate_ids)
+            scanned = len(candidates)
+        match = plan.match
+        if match is None:
+            found = [article.id for article in candidates]
+        else:
+            normalized_title, join_tags = self.title_index.normalized_title, TAG_SEPARATOR.join
+            found = [article.id for article in candidates
+                     if match(article, join_tags(article.tag_tuple), normalized_title(article.id))]
+        self._count_scan("search.query", scanned, len(found))
+        if explain is not None:
+            explain.append({"step": "逐篇校验" if match else "无需校验", "detail": plan.residual_text,
+                            "scanned": scanned if match else 0, "candidates": len(found)})
+        return found
+    
+    def _ensure_completion(self) -> None:
+        if self._tag_completion is not None:
+            return
+        self._tag_completion = CompletionIndex()
+        self._title_completion = CompletionIndex()
+        for article in self._article_rows():
+            for tag in article.tag_tuple:
+                self._tag_completion.add(tag)
+            self._title_completion.add(article.title)
+    
+    @metrics.timed("complete.tags")
+    def complete_tags(self, prefix: str, limit: int = 10) -> List[str]:
+        """返回以 prefix 开头、按使用频次降序的标签补全建议"""
+        self._ensure_completion()
+        return self._tag_completion.complete(prefix, limit)
+    
+    @metrics.timed("complete.titles")
+    def complete_titles(self, prefix: str, limit: int = 10) -> List[str]:
+        """返回以 prefix 开头的标题补全建议"""
+        self._ensure_completion()
+        return self._title_completion.complete(prefix, limit)
+    
+    def get_all_tags(self) -> List[str]:
+        """返回全部不重复的标签（按首次出现顺序）"""
+        return self.tag_postings.all_tags()
     
+    @metrics.timed("search.zero_tags")
     def get_zero_tag_articles(self) -> List[Article]:
-        return [article for article in self.articles if not article.tags]
+        return self._in_display_order(self.stats.zero_tag_ids)
     
+    def is_zero_tag(self, article_id: str) -> bool:
+        return article_id in self.stats.zero_tag_ids
+    
+    def find_articles_by_exact_title(self, title: str) -> List[Article]:
+        """标题完全相同的文章（哈希查找）"""
+        return self._in_display_order(self.stats.ids_with_title(title))
+    
+    def find_duplicate_titles(self, title: str) -> Dict[str, List[Article]]:
+        """
+        查找与 title 重复或近似重复的已有文章
+
+        Returns:
+            {"exact": 标题完全相同, "normalized": 去掉会议前缀/标点/大小写后相同,
+             "similar": SimHash 判定为近似} 三组文章，互不重叠
+        """
+        if self._title_dedup is None:
+            self._title_dedup = TitleDedupIndex()
+            for article in self._article_rows():
+                self._title_dedup.add(article.id, article.title)
+        exact_ids = self.stats.ids_with_title(title)
+        same_key_ids, similar_ids = self._title_dedup.find(title)
+        return {
+            "exact": self._in_display_order(exact_ids),
+            "normalized": self._in_display_order(same_key_ids - exact_ids),
+            "similar": self._in_display_order(similar_ids),
+        }
+    
+    def get_statistics(self, top_n: int = 10) -> Dict:
+        """
+        返回语料统计（均为增量维护的结果，无需扫描全部文章）
+
+        Returns:
+            包含文章数、标签数、零标签数、标签数分布、高频标签、重复标题分组的字典
+        """
+        top_tags = heapq.nlargest(top_n, self.tag_postings.frequencies(), key=lambda item: item[1])
+        return {
+            "article_count": len(self._articles),
+            "tag_count": self.stats.total_tags,
+            "distinct_tag_count": len(self.tag_postings),
+            "zero_tag_count": len(self.stats.zero_tag_ids),
+            "tag_count_histogram": dict(sorted(self.stats.tag_count_histogram.items())),
+            "top_tags": top_tags,
+            "duplicate_titles": {title: sorted(article_ids, key=self._order.__getitem__)
+                                 for title, article_ids in self.stats.duplicate_title_groups().items()},
+        }
+    
+    
+    def _ensure_revision_index(self) -> List[Tuple[int, str]]:
+        if self._revision_index is None:
+            entries = [(article.revision, article.id) for article in self._article_rows() if article.revision]
+            entries.extend((revision, article_id) for article_id, (revision, _) in self._live_tombstones().items())
+            entries.sort()
+            self._revision_index = entries
+        return self._revision_index
+    
+    @metrics.timed("sync.export")
+    def export_changes(self, since: Optional[int] = None) -> Dict:
+        """
+        导出修订号大于 since 的文章与删除记录（增量变更集），耗时只与变更数量有关
+
+        Args:
+            since: 上一次导出返回的 until；None 表示导出全部文章与删除记录
+
+        Returns:
+            {"format", "since", "until", "articles": [文章字典，按显示顺序], "deleted": [{"id", "revision", "modified"}]}；
+            对方用 apply_changes() 合并，下次以 until 为 since 继续导出
+        """
+        with self._lock:
+            if since is None:
+                articles = self._article_rows()
+                deleted = self._live_tombstones()
+            else:
+                index = self._ensure_revision_index()
+                changed: Dict[str, Article] = {}
+                deleted = {}
+                for revision, article_id in index[bisect_left(index, (since + 1, "")):]:
+                    article = self._articles.get(article_id)
+                    if article is not None:
+                        if article.revision == revision:
+                            changed[article_id] = article
+                    elif self._tombstones.get(article_id, (None,))[0] == revision:
+                        deleted[article_id] = self._tombstones[article_id]
+                articles = sorted(changed.values(), key=lambda article: self._order[article.id])
+            return {
+                "format": self.CHANGES_FORMAT,
+                "since": since,
+                "until": self._max_revision,
+                "articles": [article.to_dict() for article in articles],
+                "deleted": [{"id": article_id, "revision": revision, "modified": modified}
+                            for article_id, (revision, modified) in sorted(deleted.items(), key=itemgetter(1))],
+            }
+    
+    @staticmethod
+    def _content_key(title: str, tags: List[str]) -> str:
+        return json.dumps([title, tags], ensure_ascii=False)
+    
+    def _resolve_change(self, data: Dict) -> Optional[str]:
+        """
+        判断一篇传入的文章是否应覆盖本地状态，返回 "add"/"update"，不应覆盖时返回 None
+
+        规则（两端合并结果一致，与应用顺序无关）：
+            修改时间戳较新者胜出；时间戳相同且内容不同时，内容（标题与标签）序列化后较大者胜出；
+            本地已删除时，只有晚于删除时间的修改才会恢复该文章
+        """
+        modified = data.get("modified", 0)
+        local = self._articles.get(data.get("id"))
+        if local is None:
+            tombstone = self._tombstones.get(data.get("id"))
+            if tombstone is not None and modified <= tombstone[1]:
+                return None
+            return "add"
+        incoming_key = self._content_key(data.get("title", ""), data.get("tags", []))
+        local_key = self._content_key(local.title, local.tags)
+        if incoming_key == local_key:
+            return None
+        if modified > local.modified or (modified == local.modified and incoming_key > local_key):
+            return "update"
+        return None
+    
+    @metrics.timed("sync.apply")
+    def apply_changes(self, changes: Dict) -> Dict[str, int]:
+        """
+        合并 export_changes() 导出的变更集，冲突按 _resolve_change 的规则确定性地解决；
+        删除记录在不早于本地最后一次修改时生效。采纳的变更分配本地修订号，保留对方的修改时间戳，
+        作为普通变更记录写入（不整体重写数据文件）
+
+        Returns:
+            {"added", "updated", "deleted", "skipped"} 各类条目数
+        """
+        if changes.get("format") != self.CHANGES_FORMAT:
+            raise ValueError(f"不支持的变更集格式: {changes.get('format')}")
+        counts = {"added": 0, "updated": 0, "deleted": 0, "skipped": 0}
+        with self._lock, self.storage.lock():
+            if not self._batch_depth:
+                self._merge_external()
+            records: List[Dict] = []
+            for data in changes.get("articles", []):
+                op = self._resolve_change(data)
+                if op is None:
+                    counts["skipped"] += 1
+                    continue
+                revision = self._max_revision + 1
+                record = {"op": op, "article": {"id": data["id"], "title": data.get("title", ""),
+                                                "tags": data.get("tags", []), "revision": revision,
+                                                "modified": data.get("modified", 0)}}
+                self._apply_record(record)
+                records.append(record)
+                counts["added" if op == "add" else "updated"] += 1
+            for entry in changes.get("deleted", []):
+                article_id, modified = entry["id"], entry.get("modified", 0)
+                local = self._articles.get(article_id)
+                if local is not None:
+                    if modified < local.modified:
+                        counts["skipped"] += 1
+                        continue
+                    counts["deleted"] += 1
+                else:
+                    tombstone = self._tombstones.get(article_id)
+                    if tombstone is not None and modified <= tombstone[1]:
+                        counts["skipped"] += 1
+                        continue
+                    # 本地没有这篇文章也保留删除记录，以便继续同步给其他机器
+                record = {"op": "remove", "id": article_id, "revision": self._max_revision + 1, "modified": modified}
+                self._apply_record(record)
+                records.append(record)
+            if not records:
+                return counts
+            if self._batch_depth:
+                self._batch_dirty = True
+            else:
+                if not self._pending:
+                    self._first_pending_at = time.monotonic()
+                self._pending.extend(records)
+                self._write_pending()
+        return counts
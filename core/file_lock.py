@@ -0,0 +1,86 @@
+# core/file_lock.py
+import os
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    try:
+        import msvcrt
+    except ImportError:
+        msvcrt = None
+
+
+class FileLock:
+    """
+    基于独立锁文件的进程间建议锁（排他），可在同一线程内重入
+
+    只约束同样使用该锁的进程；在既没有 fcntl 也没有 msvcrt 的平台上，
+    或锁文件无法创建（如只读目录，此时写入本身也会失败）时退化为线程锁。
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._thread_lock = threading.RLock()
+        self._fd = None
+        self._depth = 0
+
+    def acquire(self, blocking: bool = True) -> bool:
+        """加锁；blocking 为 False 时锁已被其他线程或进程持有则立即返回 False"""
+        if not self._thread_lock.acquire(blocking):
+            return False
+        if self._depth == 0:
+            try:
+                self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            except OSError:
+                self._fd = None
+            try:
+                if self._fd is None:
+                    pass
+                elif fcntl is not None:
+                    fcntl.flock(self._fd, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+                elif msvcrt is not None:
+                    msvcrt.locking(self._fd, msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK, 1)
+            except BaseException as e:
+                os.close(self._fd)
+                self._fd = None
+                self._thread_lock.release()
+                if not blocking and isinstance(e, OSError):
+                    return False
+                raise
+        self._depth += 1
+        return True
+
+    def release(self) -> None:
+        self._depth -= 1
+        if self._depth == 0 and self._fd is not None:
+            try:
+                if fcntl is not None:
+                    fcntl.flock(self._fd, fcntl.LOCK_UN)
+                elif msvcrt is not None:
+                    os.lseek(self._fd, 0, os.SEEK_SET)
+                    msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+            finally:
+                os.close(self._fd)
+                self._fd = None
+        self._thread_lock.release()
+
+    def __enter__(self) -> 'FileLock':
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
+
+    @contextmanager
+    def hold(self, blocking: bool = True) -> Iterator[None]:
+        """加锁的上下文；blocking 为 False 且锁被占用时抛出 BlockingIOError"""
+        if not self.acquire(blocking):
+            raise BlockingIOError(f"{self.path} 已被占用")
+        try:
+            yield
+        finally:
+            self.release()
@@ -1,19 +1,24 @@
 # core/input_handler.py
 import sys
 import readchar
-from typing import List
+from typing import Callable, List, Optional
 
 class InputHandler:
     """输入处理类，提供带自动补全功能的输入（支持任意标签/关键词）"""
     
     @staticmethod
-    def get_input_with_suggestions(prompt: str, suggestions_list: List[str]) -> str:
+    def get_input_with_suggestions(prompt: str, suggestions_list: Optional[List[str]] = None,
+                                   completer: Optional[Callable[[str], List[str]]] = None,
+                                   separator: Optional[str] = ',') -> str:
         """
         带建议和Tab补全的输入函数（支持关键词/长短语）
         
         Args:
             prompt: 提示信息
             suggestions_list: 建议列表（动态从 DataManager.get_all_tags() 获取）
+            completer: 前缀补全函数（如 DataManager.complete_tags），给出时优先使用，
+                       每次按键的耗时与词表大小无关
+            separator: 多个标签之间的分隔符，只补全最后一段；None 表示整行是一个标签（关键句可含逗号）
             
         Returns:
             用户输入的字符串（可包含任意字符，如空格、标点）
@@ -21,11 +26,14 @@ class InputHandler:
         input_str = ""
         selected_suggestion_index = 0
         while True:
-            current_tag_fragment = input_str.split(',')[-1].strip()
+            current_tag_fragment = (input_str if separator is None else input_str.split(separator)[-1]).strip()
             suggestions = []
             if current_tag_fragment:
-                suggestions = [tag for tag in suggestions_list 
-                             if tag.startswith(current_tag_fragment)]
+                if completer is not None:
+                    suggestions = completer(current_tag_fragment)
+                else:
+                    suggestions = [tag for tag in (suggestions_list or [])
+                                 if tag.startswith(current_tag_fragment)]
                 if selected_suggestion_index >= len(suggestions):
                     selected_suggestion_index = 0
 
@@ -56,7 +64,10 @@ class InputHandler:
             elif key == readchar.key.TAB:
                 if suggestions:
                     selected_suggestion = suggestions[selected_suggestion_index]
-                    last_comma_pos = input_str.rfind(',')
+                    if separator is None:
+                        input_str = selected_suggestion
+                        continue
+                    last_comma_pos = input_str.rfind(separator)
                     if last_comma_pos != -1:
                         base_str = input_str[:last_comma_pos + 1].rstrip() + " "
                         current_fragment = input_str[last_comma_pos + 1:].strip()
@@ -77,7 +88,7 @@ class InputHandler:
             elif key == readchar.key.DOWN:
                 if suggestions and selected_suggestion_index < len(suggestions) - 1:
                     selected_suggestion_index += 1
-            elif key == ',':
+            elif separator is not None and key == separator:
                 input_str += key + " "
             else:
                 if key.isprintable():
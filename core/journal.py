@@ -0,0 +1,59 @@
+# core/journal.py
+import json
+import os
+from typing import Dict, Iterator
+
+from .metrics import metrics
+
+
+class Journal:
+    """追加式变更日志（每行一条 JSON 记录），配合快照文件实现增量持久化"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.record_count = 0
+        # 最近一次 replay 是否遇到了不完整的记录（需要尽快压缩）
+        self.damaged = False
+
+    def append(self, record: Dict) -> None:
+        """追加一条记录并落盘（写入量只与本条记录大小有关）"""
+        data = (json.dumps(record, ensure_ascii=False, separators=(',', ':')) + "\n").encode('utf-8')
+        with open(self.path, 'ab') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        self.record_count += 1
+        metrics.count("storage.journal_bytes", len(data))
+
+    def replay(self) -> Iterator[Dict]:
+        """按顺序读出全部记录；末尾因崩溃写了一半的记录会被忽略"""
+        self.record_count = 0
+        self.damaged = False
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    self.damaged = True
+                    break
+                self.record_count += 1
+                yield record
+
+    def rotate(self) -> None:
+        """快照写入成功后把日志轮转为 <path>.1，保留上一代记录供其他进程增量同步"""
+        if os.path.exists(self.path):
+            os.replace(self.path, self.path + ".1")
+        self.record_count = 0
+        self.damaged = False
+
+    def clear(self) -> None:
+        """快照写入成功后清空日志"""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self.record_count = 0
+        self.damaged = False
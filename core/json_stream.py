@@ -0,0 +1,101 @@
+# core/json_stream.py
+import json
+from typing import Any, Iterator, TextIO
+
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = _WHITESPACE + ",]}"
+
+
+class _StreamReader:
+    """按块读取文本的游标，缓冲区只保留尚未解析的部分"""
+
+    def __init__(self, f: TextIO, chunk_size: int):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """读入下一块；已到文件末尾时返回 False"""
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        # 丢弃已解析的前缀，避免缓冲区随文件增长
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """跳过空白并返回下一个字符；文件结束时返回空串"""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise json.JSONDecodeError(f"期望 '{char}'，实际为 '{found}'", self.buf, self.pos)
+        self.pos += 1
+
+    def decode_value(self, decoder: json.JSONDecoder) -> Any:
+        """解析一个完整的 JSON 值；值跨越块边界时继续读入后重试"""
+        first = self.peek()
+        if first == '-' or first.isdigit():
+            # 数字可能在块尾被截断（如 "1." 与 "1.5e3"），需读到分隔符才能确认完整
+            while not any(c in _DELIMITERS for c in self.buf[self.pos:]) and self.fill():
+                pass
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+                continue
+            self.pos = end
+            return value
+
+
+def iter_json_array(f: TextIO, key: str, chunk_size: int = 1 << 16) -> Iterator[Any]:
+    """
+    流式遍历顶层 JSON 对象中 key 对应数组的元素
+
+    只在内存中保留一个读取块和当前元素，适合很大的数据文件；
+    key 之前的其他顶层字段会被完整解析后丢弃，key 不存在时不产生任何元素。
+    """
+    decoder = json.JSONDecoder()
+    reader = _StreamReader(f, chunk_size)
+
+    reader.expect('{')
+    if reader.peek() == '}':
+        return
+    while True:
+        name = reader.decode_value(decoder)
+        reader.expect(':')
+        if name == key and reader.peek() == '[':
+            reader.expect('[')
+            if reader.peek() == ']':
+                reader.pos += 1
+            else:
+                while True:
+                    yield reader.decode_value(decoder)
+                    if reader.peek() == ',':
+                        reader.pos += 1
+                        continue
+                    reader.expect(']')
+                    break
+        else:
+            reader.decode_value(decoder)
+
+        if reader.peek() == ',':
+            reader.pos += 1
+            continue
+        reader.expect('}')
+        return
@@ -0,0 +1,144 @@
+# core/metrics.py
+"""
+轻量埋点：耗时区间（span）与计数器，可导出为 JSON 或 Prometheus 文本格式
+
+默认关闭，关闭时 timed() 包装的函数只多一次属性判断。开启方式：
+    环境变量 ARTICLE_METRICS=<输出文件>    开启并在进程退出时写出（.prom 为 Prometheus 格式，否则 JSON）
+    环境变量 ARTICLE_PROFILE=<区间名>      用 cProfile 采集该区间，结果写到 ARTICLE_PROFILE_OUT
+                                          （默认 profile_<区间名>.prof，可用 python -m pstats 查看）
+命令行模式下也可用 --metrics / --profile 参数开启。
+"""
+import atexit
+import cProfile
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Callable, Dict, Iterator, Optional
+
+_NULL_SPAN = nullcontext()
+
+
+class Metrics:
+    """进程内的埋点数据：每个区间记录调用次数、总耗时与最大耗时，计数器只做累加"""
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        # 区间名 -> [次数, 总耗时, 最大耗时]
+        self._spans: Dict[str, list] = {}
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.profile_span: Optional[str] = None
+        self.profile_output: Optional[str] = None
+        self._profiler: Optional[cProfile.Profile] = None
+
+    def reset(self) -> None:
+        with self._lock:
+            self._spans.clear()
+            self._counters.clear()
+
+    def _record(self, name: str, elapsed: float) -> None:
+        with self._lock:
+            entry = self._spans.get(name)
+            if entry is None:
+                self._spans[name] = [1, elapsed, elapsed]
+            else:
+                entry[0] += 1
+                entry[1] += elapsed
+                if elapsed > entry[2]:
+                    entry[2] = elapsed
+
+    @contextmanager
+    def _timed_span(self, name: str) -> Iterator[None]:
+        profiler = None
+        if name == self.profile_span and self._profiler is None:
+            profiler = self._profiler = cProfile.Profile()
+            profiler.enable()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._record(name, time.perf_counter() - start)
+            if profiler is not None:
+                profiler.disable()
+                self._profiler = None
+                profiler.dump_stats(self.profile_output or f"profile_{name}.prof")
+
+    def span(self, name: str):
+        """计时区间（上下文管理器）；关闭时返回空操作"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return self._timed_span(name)
+
+    def timed(self, name: str) -> Callable:
+        """装饰器：把整个函数调用记为一个区间"""
+        def decorator(func: Callable) -> Callable:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with self._timed_span(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def count(self, name: str, value: int = 1) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def to_dict(self) -> Dict:
+        with self._lock:
+            return {
+                "spans": {name: {"count": count, "total_s": round(total, 6),
+                                 "avg_ms": round(total / count * 1000, 3), "max_ms": round(longest * 1000, 3)}
+                          for name, (count, total, longest) in sorted(self._spans.items())},
+                "counters": dict(sorted(self._counters.items())),
+            }
+
+    def to_prometheus(self) -> str:
+        """Prometheus 文本格式：区间导出为 summary 式的 _count / _sum，计数器导出为 counter"""
+        lines = ["# TYPE article_span_seconds summary"]
+        with self._lock:
+            spans = sorted(self._spans.items())
+            counters = sorted(self._counters.items())
+        for name, (count, total, _) in spans:
+            lines.append(f'article_span_seconds_count{{span="{name}"}} {count}')
+            lines.append(f'article_span_seconds_sum{{span="{name}"}} {total:.6f}')
+        lines.append("# TYPE article_span_seconds_max gauge")
+        for name, (_, _, longest) in spans:
+            lines.append(f'article_span_seconds_max{{span="{name}"}} {longest:.6f}')
+        lines.append("# TYPE article_events_total counter")
+        for name, value in counters:
+            lines.append(f'article_events_total{{name="{name}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path: str) -> None:
+        """写出全部指标；扩展名为 .prom 时用 Prometheus 格式，否则为 JSON"""
+        if path.endswith(".prom"):
+            text = self.to_prometheus()
+        else:
+            text = json.dumps(self.to_dict(), ensure_ascii=False, indent=2) + "\n"
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+    def configure(self, output: Optional[str] = None, profile_span: Optional[str] = None,
+                  profile_output: Optional[str] = None) -> None:
+        """开启埋点；给出 output 时在进程退出时写出指标，给出 profile_span 时对该区间采集 cProfile"""
+        self.enabled = True
+        if profile_span:
+            self.profile_span = profile_span
+            self.profile_output = profile_output
+        if output:
+            atexit.register(self.dump, output)
+
+
+# 全局实例，各模块共用
+metrics = Metrics()
+
+if os.environ.get("ARTICLE_METRICS") or os.environ.get("ARTICLE_PROFILE"):
+    metrics.configure(os.environ.get("ARTICLE_METRICS"), os.environ.get("ARTICLE_PROFILE"),
+                      os.environ.get("ARTICLE_PROFILE_OUT"))
@@ -0,0 +1,223 @@
+# core/parallel_search.py
+"""
+分片并行搜索：把语料按显示顺序切成连续的分片，每个分片由一个常驻工作进程负责
+
+分片的标签文本与归一化标题拼接成缓冲区写入共享内存，工作进程只在分片重建时读取一次；
+每次查询只向各进程发送关键词，取回命中文章在分片内的序号，不传递文章数据。
+分片按显示顺序排列，依次拼接各分片的结果即为原顺序。
+"""
+import multiprocessing
+import os
+import threading
+from bisect import bisect_right
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# 文章之间、同一文章的标签之间的分隔符（关键词中不会出现这两个控制字符）
+_ARTICLE_SEP = "\x1e"
+_TAG_SEP = "\x1f"
+FIELDS = ("tags", "title")
+
+
+def _read_segment(name: str, size: int) -> str:
+    """从共享内存读出分片文本；读完即断开，内存由主进程释放"""
+    segment = shared_memory.SharedMemory(name=name)
+    try:
+        return bytes(segment.buf[:size]).decode("utf-8")
+    finally:
+        segment.close()
+
+
+class _Shard:
+    """工作进程中的一个分片：每个字段一个拼接缓冲区及各篇文章的起始偏移"""
+
+    def __init__(self, texts: Dict[str, str]):
+        self.buffers = texts
+        self.starts: Dict[str, List[int]] = {}
+        for field, text in texts.items():
+            starts = [0]
+            pos = text.find(_ARTICLE_SEP)
+            while pos != -1:
+                starts.append(pos + 1)
+                pos = text.find(_ARTICLE_SEP, pos + 1)
+            self.starts[field] = starts
+
+    def search(self, field: str, keywords: List[str]) -> List[int]:
+        """返回每个关键词都出现在该字段中的文章序号（升序）"""
+        buffer, starts = self.buffers[field], self.starts[field]
+        # 最长的关键词最有区分度：只用它扫描缓冲区，其余关键词在命中的文章上校验
+        keywords = sorted(keywords, key=len, reverse=True)
+        first, rest = keywords[0], keywords[1:]
+        found: List[int] = []
+        count = len(starts) - 1
+        pos = buffer.find(first)
+        while pos != -1:
+            i = bisect_right(starts, pos) - 1
+            if i >= count:
+                break
+            text = buffer[starts[i]:starts[i + 1]]
+            if all(kw in text for kw in rest):
+                found.append(i)
+            # 一篇文章命中一次即可，直接跳到下一篇
+            pos = buffer.find(first, starts[i + 1])
+        return found
+
+
+def _worker_main(connection) -> None:
+    """工作进程主循环：load 载入分片，search 执行查询，stop 退出"""
+    shard: Optional[_Shard] = None
+    while True:
+        try:
+            message = connection.recv()
+        except EOFError:
+            break
+        command = message[0]
+        if command == "stop":
+            break
+        try:
+            if command == "load":
+                shard = _Shard({field: _read_segment(name, size) for field, (name, size) in message[1].items()})
+                connection.send(("ok", None))
+            elif command == "search":
+                connection.send(("ok", shard.search(message[1], message[2])))
+            else:
+                connection.send(("error", f"未知命令 {command}"))
+        except Exception as e:
+            connection.send(("error", f"{type(e).__name__}: {e}"))
+    connection.close()
+
+
+class ShardedSearchExecutor:
+    """
+    常驻进程池上的分片 AND 子串搜索
+
+    load() 按显示顺序切分语料并写入共享内存，search() 并行查询全部分片后按原顺序合并；
+    语料变化后须重新 load()（由调用方根据语料版本号决定）。
+    """
+
+    def __init__(self, workers: Optional[int] = None):
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        # 载入时的语料版本号，调用方据此判断分片是否过期
+        self.revision: Optional[int] = None
+        self._ids: List[str] = []
+        self._shard_starts: List[int] = []
+        self._segments: List[shared_memory.SharedMemory] = []
+        self._processes = []
+        self._connections = []
+        # 查询要依次收发每个进程的管道，同一时刻只允许一个调用方
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> 'ShardedSearchExecutor':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _start(self) -> None:
+        # spawn：不继承主进程的线程与锁，各平台行为一致
+        context = multiprocessing.get_context("spawn")
+        for _ in range(self.workers):
+            parent_end, child_end = context.Pipe()
+            process = context.Process(target=_worker_main, args=(child_end,),
+                                      name="ShardedSearchWorker", daemon=True)
+            process.start()
+            child_end.close()
+            self._processes.append(process)
+            self._connections.append(parent_end)
+
+    def _receive(self, connection):
+        status, result = connection.recv()
+        if status != "ok":
+            raise RuntimeError(f"搜索进程出错: {result}")
+        return result
+
+    def _share(self, text: str) -> Tuple[str, int]:
+        data = text.encode("utf-8")
+        # 共享内存不能为 0 字节
+        segment = shared_memory.SharedMemory(create=True, size=max(1, len(data)))
+        segment.buf[:len(data)] = data
+        self._segments.append(segment)
+        return segment.name, len(data)
+
+    def _release_segments(self) -> None:
+        for segment in self._segments:
+            segment.close()
+            segment.unlink()
+        self._segments = []
+
+    def load(self, entries: Sequence[Tuple[str, str, Sequence[str]]], revision: int = 0) -> None:
+        """
+        按显示顺序载入语料
+
+        Args:
+            entries: 每篇文章的 (ID, 归一化标题, 标签列表)
+            revision: 语料版本号，记录在 self.revision 中
+        """
+        with self._lock:
+            if not self._processes:
+                self._start()
+            shard_size = -(-len(entries) // self.workers) or 1
+            self._ids = [entry[0] for entry in entries]
+            self._shard_starts = []
+            try:
+                for number, connection in enumerate(self._connections):
+                    start = number * shard_size
+                    shard = entries[start:start + shard_size]
+                    self._shard_starts.append(start)
+                    segments = {
+                        "tags": self._share("".join(_TAG_SEP.join(tags) + _ARTICLE_SEP for _, _, tags in shard)),
+                        "title": self._share("".join(title + _ARTICLE_SEP for _, title, _ in shard)),
+                    }
+                    connection.send(("load", segments))
+                for connection in self._connections:
+                    self._receive(connection)
+            except Exception:
+                # 管道中可能残留未读的应答，整个进程池作废，下次载入时重新启动
+                self._shutdown()
+                raise
+            finally:
+                # 各进程已把分片读入自己的内存，共享内存随即释放
+                self._release_segments()
+            self.revision = revision
+
+    def search(self, field: str, keywords: List[str]) -> List[str]:
+        """在全部分片上并行执行 AND 子串搜索，按显示顺序返回命中的文章 ID"""
+        if field not in FIELDS:
+            raise ValueError(f"不支持的搜索字段: {field}")
+        keywords = [kw for kw in keywords if kw]
+        if not keywords:
+            return list(self._ids)
+        with self._lock:
+            if self.revision is None:
+                raise RuntimeError("尚未载入语料")
+            try:
+                for connection in self._connections:
+                    connection.send(("search", field, keywords))
+                found: List[str] = []
+                for start, connection in zip(self._shard_starts, self._connections):
+                    found.extend(self._ids[start + i] for i in self._receive(connection))
+            except Exception:
+                self._shutdown()
+                raise
+            return found
+
+    def _shutdown(self) -> None:
+        for connection in self._connections:
+            try:
+                connection.send(("stop",))
+            except OSError:
+                pass
+            connection.close()
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self._connections = []
+        self._processes = []
+        self._release_segments()
+        self.revision = None
+
+    def close(self) -> None:
+        """停止工作进程（可重复调用）"""
+        with self._lock:
+            self._shutdown()
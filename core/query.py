@@ -0,0 +1,419 @@
+# core/query.py
+"""
+查询语言：布尔组合、短语、正则与字段限定，编译为先用索引裁剪候选、再单趟校验的查询计划
+
+语法（优先级 NOT > AND > OR，相邻条件之间省略 AND）:
+    机器学习 深度             标题或任一标签包含“机器学习”，且包含“深度”
+    a OR b / NOT a / (a OR b) c
+    "neural network"          短语（可含空格，\\" 转义双引号）
+    /^第[0-9]+章/i            正则（匹配原始文本，i 表示忽略大小写）
+    title:学习  tag:入门      只在标题 / 任一标签中匹配；tag:=入门 为完整标签精确匹配
+    title:(a OR /b/)          字段作用于括号内未单独指定字段的条件
+
+标题子串匹配前做与标题搜索相同的归一化（全角/半角、大小写等），标签子串区分大小写，
+与现有的标签模糊搜索一致。AND/OR/NOT 须大写，小写视为普通关键词。
+"""
+import re
+from functools import lru_cache
+from typing import Callable, Dict, List, NamedTuple, Optional, Set, Tuple, Union
+
+from .article import Article
+from .tag_index import TagNgramIndex, TagPostingIndex
+from .title_search import TitleSearchIndex, normalize_text
+
+FIELDS = {"title": "title", "tag": "tag", "tags": "tag"}
+_OPERATORS = ("AND", "OR", "NOT")
+_FIELD_PREFIX = re.compile(r"(title|tags?):")
+_WORD_END = re.compile(r"[\s()\"]")
+
+
+class QuerySyntaxError(ValueError):
+    """查询语句无法解析（位置从 0 开始计）"""
+
+
+class Term(NamedTuple):
+    """
+    单个匹配条件
+
+    field 为 "title"、"tag" 或 None（标题或任一标签）；kind 为 "substring"、"regex" 或 "exact"（仅标签）
+    """
+    field: Optional[str]
+    kind: str
+    value: str
+    flags: str = ""
+
+
+class And(NamedTuple):
+    children: Tuple["Node", ...]
+
+
+class Or(NamedTuple):
+    children: Tuple["Node", ...]
+
+
+class Not(NamedTuple):
+    child: "Node"
+
+
+Node = Union[Term, And, Or, Not]
+
+
+# ---------- 解析 ----------
+
+def _tokenize(text: str) -> List[Tuple[str, object, int]]:
+    """切分为 (类型, 值, 位置)；类型为 ( ) op field term"""
+    tokens = []
+    pos = 0
+    while pos < len(text):
+        char = text[pos]
+        if char.isspace():
+            pos += 1
+        elif char in "()":
+            tokens.append((char, char, pos))
+            pos += 1
+        elif _FIELD_PREFIX.match(text, pos):
+            match = _FIELD_PREFIX.match(text, pos)
+            tokens.append(("field", FIELDS[match.group(1)], pos))
+            pos = match.end()
+            if text.startswith("=", pos) and tokens[-1][1] == "tag":
+                tokens[-1] = ("field", "tag=", tokens[-1][2])
+                pos += 1
+        elif char == '"':
+            end = pos + 1
+            value = []
+            while end < len(text) and text[end] != '"':
+                if text[end] == "\\" and end + 1 < len(text):
+                    end += 1
+                value.append(text[end])
+                end += 1
+            if end >= len(text):
+                raise QuerySyntaxError(f"位置 {pos}：短语缺少结尾的双引号")
+            tokens.append(("term", ("substring", "".join(value), ""), pos))
+            pos = end + 1
+        elif char == "/":
+            end = pos + 1
+            while end < len(text) and text[end] != "/":
+                # 保留转义，交给 re 解释；\/ 表示正则中的斜杠
+                end += 2 if text[end] == "\\" else 1
+            if end >= len(text):
+                raise QuerySyntaxError(f"位置 {pos}：正则缺少结尾的 /")
+            pattern = text[pos + 1:end].replace("\\/", "/")
+            flags_end = end + 1
+            while flags_end < len(text) and text[flags_end] in "i":
+                flags_end += 1
+            tokens.append(("term", ("regex", pattern, text[end + 1:flags_end]), pos))
+            pos = flags_end
+        else:
+            match = _WORD_END.search(text, pos)
+            end = match.start() if match else len(text)
+            word = text[pos:end]
+            if word in _OPERATORS:
+                tokens.append(("op", word, pos))
+            else:
+                tokens.append(("term", ("substring", word, ""), pos))
+            pos = end
+    return tokens
+
+
+class _Parser:
+    """递归下降：or := and (OR and)*；and := not (AND? not)*；not := NOT not | [field] primary"""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.tokens = _tokenize(text)
+        self.index = 0
+
+    def _peek(self) -> Optional[Tuple[str, object, int]]:
+        return self.tokens[self.index] if self.index < len(self.tokens) else None
+
+    def _error(self, message: str) -> QuerySyntaxError:
+        token = self._peek()
+        where = token[2] if token else len(self.text)
+        return QuerySyntaxError(f"位置 {where}：{message}")
+
+    def parse(self) -> Node:
+        if not self.tokens:
+            raise QuerySyntaxError("查询为空")
+        node = self._or(None)
+        if self._peek() is not None:
+            raise self._error("多余的右括号" if self._peek()[0] == ")" else "无法解析的内容")
+        return node
+
+    def _or(self, field: Optional[str]) -> Node:
+        children = [self._and(field)]
+        while self._peek() is not None and self._peek()[:2] == ("op", "OR"):
+            self.index += 1
+            children.append(self._and(field))
+        return children[0] if len(children) == 1 else Or(tuple(children))
+
+    def _and(self, field: Optional[str]) -> Node:
+        children = [self._not(field)]
+        while True:
+            token = self._peek()
+            if token is None or token[0] == ")" or token[:2] == ("op", "OR"):
+                break
+            if token[:2] == ("op", "AND"):
+                self.index += 1
+            children.append(self._not(field))
+        return children[0] if len(children) == 1 else And(tuple(children))
+
+    def _not(self, field: Optional[str]) -> Node:
+        token = self._peek()
+        if token is not None and token[:2] == ("op", "NOT"):
+            self.index += 1
+            return Not(self._not(field))
+        return self._primary(field)
+
+    def _primary(self, field: Optional[str]) -> Node:
+        token = self._peek()
+        if token is None:
+            raise self._error("查询不完整")
+        kind, value, _ = token
+        if kind == "field":
+            self.index += 1
+            field = value
+            token = self._peek()
+            if token is None or token[0] not in ("(", "term"):
+                raise self._error(f"{value.rstrip('=')}: 之后缺少匹配条件")
+            kind, value, _ = token
+            if kind == "(" and field == "tag=":
+                raise self._error("tag:= 之后只能跟单个标签")
+        if kind == "(":
+            self.index += 1
+            node = self._or(field)
+            if self._peek() is None or self._peek()[0] != ")":
+                raise self._error("缺少右括号")
+            self.index += 1
+            return node
+        if kind == "term":
+            term_kind, text, flags = value
+            if field == "tag=" and term_kind == "regex":
+                raise self._error("tag:= 不能与正则一起使用")
+            self.index += 1
+            if field == "tag=":
+                return Term("tag", "exact", text)
+            if term_kind == "regex":
+                _compile_regex(text, flags)
+            return Term(field, term_kind, text, flags)
+        raise self._error(f"此处不能出现 {value}")
+
+
+@lru_cache(maxsize=256)
+def _compile_regex(pattern: str, flags: str) -> "re.Pattern":
+    try:
+        return re.compile(pattern, re.IGNORECASE if "i" in flags else 0)
+    except re.error as e:
+        raise QuerySyntaxError(f"正则 /{pattern}/ 有误：{e}") from None
+
+
+def format_query(node: Node) -> str:
+    """规范化的查询文本（等价的写法得到相同的文本，用作结果缓存的键）"""
+    if isinstance(node, Term):
+        prefix = {"title": "title:", "tag": "tag:"}.get(node.field, "")
+        if node.kind == "exact":
+            prefix = "tag:="
+        if node.kind == "regex":
+            return f"{prefix}/{node.value.replace('/', chr(92) + '/')}/{node.flags}"
+        value = node.value
+        # 以 = 开头的值不加引号会被读成 tag:= 精确匹配，与子串匹配得到同一个缓存键
+        if not value or _WORD_END.search(value) or value in _OPERATORS \
+                or value.startswith(("/", "=")) or _FIELD_PREFIX.match(value):
+            value = '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+        return prefix + value
+    if isinstance(node, Not):
+        inner = format_query(node.child)
+        return "NOT " + (f"({inner})" if isinstance(node.child, (And, Or)) else inner)
+    if isinstance(node, And):
+        return " ".join(f"({format_query(child)})" if isinstance(child, Or) else format_query(child)
+                        for child in node.children)
+    return " OR ".join(format_query(child) for child in node.children)
+
+
+# ---------- 校验谓词 ----------
+
+# 参数为 (文章, 以 TAG_SEPARATOR 拼接的标签, 归一化标题)；拼接后标签子串判断只需一次 in
+Predicate = Callable[[Article, str, str], bool]
+TAG_SEPARATOR = "\x1f"
+
+
+def _predicate(node: Node) -> Predicate:
+    if isinstance(node, And):
+        parts = [_predicate(child) for child in node.children]
+        return lambda article, tags, title: all(part(article, tags, title) for part in parts)
+    if isinstance(node, Or):
+        parts = [_predicate(child) for child in node.children]
+        return lambda article, tags, title: any(part(article, tags, title) for part in parts)
+    if isinstance(node, Not):
+        part = _predicate(node.child)
+        return lambda article, tags, title: not part(article, tags, title)
+
+    if node.kind == "exact":
+        tag = node.value
+        return lambda article, tags, title: article.has_tag(tag)
+    if node.kind == "regex":
+        # 正则逐个标签匹配，^ / $ 对应单个标签的首尾
+        search = _compile_regex(node.value, node.flags).search
+        if node.field == "title":
+            return lambda article, tags, title: search(article.title) is not None
+        if node.field == "tag":
+            return lambda article, tags, title: any(search(tag) for tag in article.tag_tuple)
+        return lambda article, tags, title: (search(article.title) is not None
+                                             or any(search(tag) for tag in article.tag_tuple))
+    keyword, title_keyword = node.value, normalize_text(node.value)
+    if node.field == "title":
+        return lambda article, tags, title: title_keyword in title
+    if node.field == "tag":
+        return lambda article, tags, title: keyword in tags
+    return lambda article, tags, title: title_keyword in title or keyword in tags
+
+
+# ---------- 查询计划 ----------
+
+class IndexStep(NamedTuple):
+    """
+    候选集计算步骤
+
+    op: "title"（标题索引，结果精确）、"ngram"（标签 n-gram 索引，超集）、"posting"（标签倒排表，精确）、
+        "any"（标题索引 ∪ 标签 n-gram 候选）、"and"（children 求交后减去 excluded 各项）、"or"（children 求并）
+    """
+    op: str
+    keyword: str = ""
+    children: Tuple["IndexStep", ...] = ()
+    excluded: Tuple["IndexStep", ...] = ()
+
+
+class QueryIndexes(NamedTuple):
+    """执行查询计划可用的内存索引；标签 n-gram 索引构建代价高，用到时才取"""
+    title_index: TitleSearchIndex
+    tag_postings: TagPostingIndex
+    tag_ngrams: Callable[[], TagNgramIndex]
+
+
+def _plan(node: Node) -> Tuple[Optional[IndexStep], Optional[Node]]:
+    """
+    把条件拆成 (候选集步骤, 剩余条件)：候选集为 None 表示无法用索引裁剪（全部文章），
+    剩余条件为 None 表示候选集即为精确结果，无需逐篇校验
+    """
+    if isinstance(node, Term):
+        if node.kind == "exact":
+            return IndexStep("posting", node.value), None
+        if node.kind == "regex" or not node.value:
+            # 正则无法用子串索引裁剪；空关键词匹配全部文章
+            return None, (node if node.kind == "regex" else None)
+        if node.field == "title":
+            return IndexStep("title", node.value), None
+        if node.field == "tag":
+            return IndexStep("ngram", node.value), node
+        return IndexStep("any", node.value), node
+    if isinstance(node, Not):
+        return None, node
+    if isinstance(node, Or):
+        planned = [_plan(child) for child in node.children]
+        if any(step is None for step, _ in planned):
+            return None, node
+        step = IndexStep("or", children=tuple(step for step, _ in planned))
+        return step, (node if any(rest is not None for _, rest in planned) else None)
+
+    included: List[IndexStep] = []
+    excluded: List[Tuple[IndexStep, Node]] = []
+    residual: List[Node] = []
+    for child in node.children:
+        if isinstance(child, Not):
+            inner_step, inner_rest = _plan(child.child)
+            if inner_step is not None and inner_rest is None:
+                # 被否定的条件可由索引精确求出时，直接从候选集中减去
+                excluded.append((inner_step, child))
+                continue
+        step, rest = _plan(child)
+        if step is not None:
+            included.append(step)
+        if rest is not None:
+            residual.append(rest)
+    if len(included) == 1 and not excluded:
+        step = included[0]
+    elif included:
+        step = IndexStep("and", children=tuple(included), excluded=tuple(step for step, _ in excluded))
+    else:
+        # 没有可裁剪的正向条件（没有可减的候选集），否定条件只能逐篇校验
+        step = None
+        residual.extend(child for _, child in excluded)
+    if not residual:
+        return step, None
+    return step, residual[0] if len(residual) == 1 else And(tuple(residual))
+
+
+class QueryPlan:
+    """编译后的查询：与语料无关，可缓存复用；每次执行时按计划查索引并逐篇校验剩余条件"""
+
+    def __init__(self, text: str):
+        self.root = _Parser(text).parse()
+        # 规范化文本，用作结果缓存的键
+        self.text = format_query(self.root)
+        self.index_step, self.residual = _plan(self.root)
+        self.residual_text = format_query(self.residual) if self.residual is not None else ""
+        self.match: Optional[Predicate] = _predicate(self.residual) if self.residual is not None else None
+
+    def candidates(self, indexes: QueryIndexes,
+                   explain: Optional[List[Dict]] = None) -> Optional[Set[str]]:
+        """按计划求候选 ID 集合（None 表示全部文章）；给出 explain 时逐步记录候选数"""
+        if self.index_step is None:
+            return None
+        return _run_step(self.index_step, indexes, explain)
+
+
+# 求交时各类步骤的计算顺序
+_STEP_COST = {"posting": 0, "title": 1, "ngram": 2, "any": 3, "and": 4, "or": 5}
+
+
+def _describe(step: IndexStep) -> str:
+    if step.op == "and":
+        text = " AND ".join(_describe(child) for child in step.children)
+        if step.excluded:
+            text += " AND NOT " + " AND NOT ".join(_describe(child) for child in step.excluded)
+        return f"({text})"
+    if step.op == "or":
+        return "(" + " OR ".join(_describe(child) for child in step.children) + ")"
+    return {"title": "title:", "ngram": "tag:", "posting": "tag:=", "any": ""}[step.op] + step.keyword
+
+
+def _run_step(step: IndexStep, indexes: QueryIndexes, explain: Optional[List[Dict]]) -> Set[str]:
+    """计算一个步骤的候选集；返回的集合可能是索引内部对象，调用方只能读取"""
+    if step.op == "title":
+        found = indexes.title_index.search([step.keyword])
+        result, label = (found if found is not None else set()), "标题索引"
+    elif step.op == "ngram":
+        found = indexes.tag_ngrams().candidates([step.keyword])
+        result, label = (found if found is not None else set()), "标签 n-gram 索引（候选）"
+    elif step.op == "posting":
+        result, label = indexes.tag_postings.posting(step.keyword), "标签倒排表"
+    elif step.op == "any":
+        titles = indexes.title_index.search([step.keyword]) or set()
+        tags = indexes.tag_ngrams().candidates([step.keyword]) or set()
+        result, label = titles | tags, "标题索引 ∪ 标签 n-gram 索引（候选）"
+    elif step.op == "or":
+        result = set()
+        for child in step.children:
+            result = result | _run_step(child, indexes, explain)
+        label = "OR 求并"
+    else:
+        # 精确且通常较小的步骤先算，交集为空即停止，其余步骤不必再查索引
+        result = None
+        for child in sorted(step.children, key=lambda child: _STEP_COST[child.op]):
+            part = _run_step(child, indexes, explain)
+            result = part if result is None else result & part
+            if not result:
+                break
+        for child in step.excluded:
+            if not result:
+                break
+            result = result - _run_step(child, indexes, explain)
+        label = "AND 求交" + ("并排除 NOT 条件" if step.excluded else "")
+    if explain is not None:
+        explain.append({"step": label, "detail": _describe(step), "candidates": len(result)})
+    return result
+
+
+@lru_cache(maxsize=256)
+def compile_query(text: str) -> QueryPlan:
+    """解析并编译查询（按原始文本缓存，语法错误抛出 QuerySyntaxError）"""
+    return QueryPlan(text)
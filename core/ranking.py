@@ -0,0 +1,105 @@
+# core/ranking.py
+import heapq
+import math
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Tuple
+
+from .title_search import normalize_text
+
+# 连续的中日韩字符 / 连续的字母数字
+_TOKEN_PATTERN = re.compile(r"[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff]+|[a-z0-9]+")
+_CJK_START = "\u3040"
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    分词：英文/数字按单词切分，中日韩文本切成字符双字组（单字成段时保留单字）
+    """
+    tokens = []
+    for run in _TOKEN_PATTERN.findall(normalize_text(text)):
+        if run[0] >= _CJK_START:
+            if len(run) == 1:
+                tokens.append(run)
+            else:
+                tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+        else:
+            tokens.append(run)
+    return tokens
+
+
+class BM25Index:
+    """基于 BM25 的相关度索引（标题 + 标签），支持增量增删"""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75, title_weight: int = 2):
+        """
+        Args:
+            k1, b: BM25 参数
+            title_weight: 标题中词项的计数倍数，使标题命中比标签命中更重要
+        """
+        self.k1 = k1
+        self.b = b
+        self.title_weight = title_weight
+        # 词项 -> {文章 ID: 词频}
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._doc_len: Dict[str, int] = {}
+        self._total_len = 0
+
+    def _term_counts(self, title: str, tags: Iterable[str]) -> Counter:
+        counts = Counter()
+        for token in tokenize(title):
+            counts[token] += self.title_weight
+        for tag in tags:
+            counts.update(tokenize(tag))
+        return counts
+
+    def add(self, article_id: str, title: str, tags: Iterable[str]) -> None:
+        counts = self._term_counts(title, tags)
+        for term, tf in counts.items():
+            self._postings.setdefault(term, {})[article_id] = tf
+        length = sum(counts.values())
+        self._doc_len[article_id] = length
+        self._total_len += length
+
+    def remove(self, article_id: str, title: str, tags: Iterable[str]) -> None:
+        """移除文章；title/tags 须与 add 时一致"""
+        if article_id not in self._doc_len:
+            return
+        for term in self._term_counts(title, tags):
+            posting = self._postings.get(term)
+            if posting is None:
+                continue
+            posting.pop(article_id, None)
+            if not posting:
+                del self._postings[term]
+        self._total_len -= self._doc_len.pop(article_id)
+
+    def clear(self) -> None:
+        self._postings.clear()
+        self._doc_len.clear()
+        self._total_len = 0
+
+    def search(self, query: str, top_k: int = 10) -> List[Tuple[str, float]]:
+        """
+        返回得分最高的 top_k 个 (文章 ID, 得分)，按得分降序
+
+        只遍历查询词项的倒排表，耗时与命中规模相关，与语料总量无关
+        """
+        doc_count = len(self._doc_len)
+        if not doc_count or top_k <= 0:
+            return []
+        avg_len = self._total_len / doc_count or 1.0
+
+        scores: Dict[str, float] = {}
+        for term in set(tokenize(query)):
+            posting = self._postings.get(term)
+            if not posting:
+                continue
+            df = len(posting)
+            idf = math.log(1 + (doc_count - df + 0.5) / (df + 0.5))
+            for article_id, tf in posting.items():
+                norm = self.k1 * (1 - self.b + self.b * self._doc_len[article_id] / avg_len)
+                scores[article_id] = scores.get(article_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+
+        # 用堆取前 k 个，无需对全部命中排序
+        return heapq.nlargest(top_k, scores.items(), key=lambda item: item[1])
@@ -0,0 +1,72 @@
+# core/search_cache.py
+import json
+import os
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+
+class SearchCache:
+    """
+    搜索结果 LRU 缓存：键为归一化后的 (搜索类型, 关键词...)，值只保存文章 ID
+
+    每个条目记录写入时的语料版本号，版本变化（文章被修改）后条目自动失效。
+    """
+
+    def __init__(self, capacity: int = 128):
+        self.capacity = capacity
+        self._entries: "OrderedDict[Hashable, Tuple[int, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, revision: int) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != revision:
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key: Hashable, revision: int, value: Any) -> None:
+        self._entries[key] = (revision, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SavedSearchStore:
+    """已保存的搜索：所有记录存于同一个 JSON 文件，每条只保存查询条件与命中的文章 ID"""
+
+    def __init__(self, path: str = "saved_searches.json"):
+        self.path = path
+
+    def load(self) -> List[Dict]:
+        if not os.path.exists(self.path):
+            return []
+        with open(self.path, 'r', encoding='utf-8') as f:
+            return json.load(f).get("searches", [])
+
+    def save(self, search_type: str, keywords: List[str], article_ids: List[str]) -> Dict:
+        """追加一条保存的搜索并原子写回文件，返回新记录"""
+        searches = self.load()
+        entry = {
+            "search_type": search_type,
+            "keywords": keywords,
+            "search_time": datetime.now().isoformat(timespec="seconds"),
+            "article_ids": article_ids,
+        }
+        searches.append(entry)
+        tmp_file = self.path + ".tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({"searches": searches}, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_file, self.path)
+        return entry
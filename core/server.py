@@ -0,0 +1,332 @@
+# core/server.py
+"""
+基于 asyncio 的 HTTP/JSON 查询服务（仅用标准库）：语料只加载一次，并发响应查询
+
+    GET    /articles/<id>                 按 ID 查看文章
+    GET    /search/tags?q=注意力&q=轻量     标签模糊 AND 搜索（加 exact=1 为精确匹配）
+    GET    /search/title?q=Transformer    标题模糊 AND 搜索
+    GET    /search/rank?q=注意力&top=10     相关度排序搜索
+    GET    /search/query?q=tag:=入门 NOT 草稿  查询语言搜索（加 explain=1 返回执行计划）
+    GET    /zero-tags                     零标签文章
+    GET    /stats                         语料统计
+    GET    /metrics                       埋点指标（需开启，见 core/metrics.py；加 format=prometheus 为文本格式）
+    POST   /articles                      添加文章，请求体 {"title": ..., "tags": [...]}
+    PUT    /articles/<id>                 修改标题和/或标签，请求体同上
+    DELETE /articles/<id>                 删除文章
+
+读请求直接在事件循环中执行（均为内存索引查询），彼此不互相阻塞；
+写请求进入队列，由唯一的写入任务在线程池中依次执行。读写锁保证读请求不会看到写了一半的数据。
+"""
+import asyncio
+import json
+import signal
+import sys
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from .article import Article
+from .data_manager import ConflictError, DataManager
+from .metrics import metrics
+from .query import QuerySyntaxError
+
+_REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found",
+            405: "Method Not Allowed", 409: "Conflict", 413: "Payload Too Large",
+            500: "Internal Server Error"}
+MAX_BODY = 1 << 20
+
+
+class _Text(str):
+    """以纯文本（而非 JSON）返回的响应体"""
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class _ReadWriteLock:
+    """asyncio 读写锁：读者共享，写者独占；有写者等待时新读者让行，避免写请求饿死"""
+
+    def __init__(self):
+        self._cond = asyncio.Condition()
+        self._readers = 0
+        self._writing = False
+        self._writers_waiting = 0
+
+    @asynccontextmanager
+    async def read(self):
+        async with self._cond:
+            await self._cond.wait_for(lambda: not self._writing and not self._writers_waiting)
+            self._readers += 1
+        try:
+            yield
+        finally:
+            async with self._cond:
+                self._readers -= 1
+                self._cond.notify_all()
+
+    @asynccontextmanager
+    async def write(self):
+        async with self._cond:
+            self._writers_waiting += 1
+            await self._cond.wait_for(lambda: not self._writing and not self._readers)
+            self._writers_waiting -= 1
+            self._writing = True
+        try:
+            yield
+        finally:
+            async with self._cond:
+                self._writing = False
+                self._cond.notify_all()
+
+
+class ArticleService:
+    """把 DataManager 的查询与修改映射为 HTTP 接口"""
+
+    def __init__(self, data_manager: DataManager, refresh_interval: float = 2.0):
+        self.data_manager = data_manager
+        self.refresh_interval = refresh_interval
+        self._lock = _ReadWriteLock()
+        self._writes: "asyncio.Queue[Tuple[Callable[[], Any], asyncio.Future]]" = asyncio.Queue()
+
+    # ---------- 写入：单一写入任务 ----------
+
+    async def _writer(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            job, future = await self._writes.get()
+            async with self._lock.write():
+                try:
+                    result = await loop.run_in_executor(None, job)
+                except Exception as e:
+                    if not future.cancelled():
+                        future.set_exception(e)
+                else:
+                    if not future.cancelled():
+                        future.set_result(result)
+            self._writes.task_done()
+
+    def _submit(self, job: Callable[[], Any]) -> Awaitable[Any]:
+        future = asyncio.get_running_loop().create_future()
+        self._writes.put_nowait((job, future))
+        return future
+
+    async def _refresher(self) -> None:
+        """定期合并其他进程写入的修改（同样经由写入队列执行）"""
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            await self._submit(self.data_manager.refresh)
+
+    # ---------- 请求处理 ----------
+
+    @staticmethod
+    def _keywords(query: Dict[str, List[str]]) -> List[str]:
+        keywords = [kw.strip() for kw in query.get("q", []) if kw.strip()]
+        if not keywords:
+            raise HttpError(400, "缺少查询参数 q")
+        return keywords
+
+    @staticmethod
+    def _article_payload(body: Optional[Dict]) -> Tuple[Optional[str], Optional[List[str]]]:
+        if not isinstance(body, dict):
+            raise HttpError(400, "请求体须为 JSON 对象")
+        title = body.get("title")
+        tags = body.get("tags")
+        if title is not None and (not isinstance(title, str) or not title.strip()):
+            raise HttpError(400, "title 须为非空字符串")
+        if tags is not None and (not isinstance(tags, list) or not all(isinstance(t, str) for t in tags)):
+            raise HttpError(400, "tags 须为字符串数组")
+        return (title.strip() if title else None), tags
+
+    def _read(self, path: List[str], query: Dict[str, List[str]]) -> Any:
+        dm = self.data_manager
+        if path[:1] == ["articles"] and len(path) == 2:
+            article = dm.find_article_by_id(path[1])
+            if article is None:
+                raise HttpError(404, f"未找到 ID 为 '{path[1]}' 的文章")
+            return article.to_dict()
+        if path == ["search", "tags"]:
+            keywords = self._keywords(query)
+            if query.get("exact", ["0"])[0] in ("1", "true"):
+                results = dm.search_articles_by_tags(keywords)
+            else:
+                results = dm.fuzzy_search_by_tags(keywords)
+            return [a.to_dict() for a in results]
+        if path == ["search", "title"]:
+            return [a.to_dict() for a in dm.search_titles(self._keywords(query))]
+        if path == ["search", "rank"]:
+            try:
+                top = int(query.get("top", ["10"])[0])
+            except ValueError:
+                raise HttpError(400, "top 须为整数")
+            return [dict(a.to_dict(), score=round(score, 4))
+                    for a, score in dm.ranked_search(" ".join(self._keywords(query)), top)]
+        if path == ["search", "query"]:
+            text = " ".join(self._keywords(query))
+            try:
+                if query.get("explain", ["0"])[0] in ("1", "true"):
+                    return dm.explain_query(text)
+                return [a.to_dict() for a in dm.query(text)]
+            except QuerySyntaxError as e:
+                raise HttpError(400, f"查询语法错误：{e}")
+        if path == ["zero-tags"]:
+            return [a.to_dict() for a in dm.get_zero_tag_articles()]
+        if path == ["stats"]:
+            return dm.get_statistics()
+        if path == ["metrics"]:
+            if not metrics.enabled:
+                raise HttpError(404, "未开启埋点（设置环境变量 ARTICLE_METRICS 或使用 --metrics）")
+            if query.get("format", [""])[0] == "prometheus":
+                return _Text(metrics.to_prometheus())
+            return metrics.to_dict()
+        raise HttpError(404, "未知的接口")
+
+    def _write_job(self, method: str, path: List[str], body: Optional[Dict]) -> Callable[[], Tuple[int, Any]]:
+        dm = self.data_manager
+        if method == "POST" and path == ["articles"]:
+            title, tags = self._article_payload(body)
+            if title is None:
+                raise HttpError(400, "缺少 title")
+
+            def add() -> Tuple[int, Any]:
+                article = Article(title, tags or [], existing_ids=dm)
+                dm.add_article(article)
+                return 201, article.to_dict()
+            return add
+
+        if path[:1] != ["articles"] or len(path) != 2:
+            raise HttpError(404, "未知的接口")
+        article_id = path[1]
+
+        if method == "DELETE":
+            def remove() -> Tuple[int, Any]:
+                if not dm.remove_article(article_id):
+                    raise HttpError(404, f"未找到 ID 为 '{article_id}' 的文章")
+                return 200, {"id": article_id, "deleted": True}
+            return remove
+
+        title, tags = self._article_payload(body)
+
+        def update() -> Tuple[int, Any]:
+            article = dm.find_article_by_id(article_id)
+            if article is None:
+                raise HttpError(404, f"未找到 ID 为 '{article_id}' 的文章")
+            if title is not None:
+                dm.update_article_title(article, title)
+            if tags is not None:
+                dm.update_article_tags(article, tags)
+            return 200, article.to_dict()
+        return update
+
+    async def handle(self, method: str, target: str, body: Optional[Dict]) -> Tuple[int, Any]:
+        url = urlsplit(target)
+        path = [unquote(part) for part in url.path.split("/") if part]
+        query = parse_qs(url.query)
+        if method == "GET":
+            async with self._lock.read():
+                return 200, self._read(path, query)
+        if method in ("POST", "PUT", "DELETE"):
+            try:
+                return await self._submit(self._write_job(method, path, body))
+            except ConflictError as e:
+                raise HttpError(409, str(e))
+        raise HttpError(405, f"不支持的方法 {method}")
+
+    # ---------- HTTP/1.1 连接 ----------
+
+    async def _serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self._respond(writer, 400, {"error": "请求行格式错误"}, keep_alive=False)
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                keep_alive = (headers.get("connection", "").lower() != "close"
+                              and version.upper() == "HTTP/1.1")
+
+                status, payload = 200, None
+                try:
+                    length = int(headers.get("content-length", "0"))
+                    if length > MAX_BODY:
+                        raise HttpError(413, "请求体过大")
+                    body = None
+                    if length:
+                        raw = await reader.readexactly(length)
+                        try:
+                            body = json.loads(raw)
+                        except ValueError:
+                            raise HttpError(400, "请求体不是合法的 JSON")
+                    status, payload = await self.handle(method.upper(), target, body)
+                except HttpError as e:
+                    status, payload = e.status, {"error": str(e)}
+                except ValueError:
+                    status, payload = 400, {"error": "Content-Length 格式错误"}
+                except Exception as e:
+                    status, payload = 500, {"error": f"服务器内部错误: {e}"}
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _respond(writer: asyncio.StreamWriter, status: int, payload: Any, keep_alive: bool) -> None:
+        if isinstance(payload, _Text):
+            body, content_type = payload.encode("utf-8"), "text/plain; version=0.0.4; charset=utf-8"
+        else:
+            body, content_type = json.dumps(payload, ensure_ascii=False).encode("utf-8"), "application/json; charset=utf-8"
+        head = (f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+    async def serve(self, host: str, port: int, ready: Optional[Callable[[], None]] = None) -> None:
+        """运行服务直到收到 SIGINT/SIGTERM；退出前处理完已排队的写请求"""
+        loop = asyncio.get_running_loop()
+        stop = loop.create_future()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, lambda: stop.done() or stop.set_result(None))
+            except (NotImplementedError, RuntimeError):  # Windows 或非主线程
+                pass
+        tasks = [asyncio.create_task(self._writer())]
+        if self.refresh_interval > 0:
+            tasks.append(asyncio.create_task(self._refresher()))
+        server = await asyncio.start_server(self._serve_connection, host, port)
+        if ready is not None:
+            ready()
+        try:
+            async with server:
+                await stop
+        finally:
+            server.close()
+            await self._writes.join()
+            for task in tasks:
+                task.cancel()
+
+
+def run_server(data_manager: DataManager, host: str = "127.0.0.1", port: int = 8080,
+               refresh_interval: float = 2.0) -> None:
+    service = ArticleService(data_manager, refresh_interval)
+
+    def ready() -> None:
+        print(f"服务已启动：http://{host}:{port}/（Ctrl+C 停止）", file=sys.stderr, flush=True)
+
+    asyncio.run(service.serve(host, port, ready))
@@ -0,0 +1,619 @@
+# core/storage.py
+"""
+存储后端：DataManager 只通过 StorageBackend 接口读写持久化数据
+
+- JsonStorage: JSON 快照 + 追加式变更日志（默认）
+- BinaryStorage: 紧凑二进制快照（字符串表 + 记录索引，可内存映射）+ 追加式变更日志
+- SqliteStorage: SQLite 规范化表（文章表 + 标签表），附带 FTS5 三元组全文索引
+
+多个进程可同时使用同一份数据：写入前持有 lock()，并先用 changes() 合并其他进程的写入；
+每次写入使数据版本号递增，据此判断其他进程的修改能否增量合并。
+"""
+import io
+import json
+import os
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager, nullcontext
+from typing import (BinaryIO, Callable, ContextManager, Dict, Iterable, Iterator, List, MutableMapping, Optional,
+                    Set, Tuple)
+
+from .article import Article
+from .binary_snapshot import BinarySnapshot, SnapshotArticles, write_snapshot
+from .file_lock import FileLock
+from .journal import Journal
+from .json_stream import iter_json_array
+from .metrics import metrics
+from .title_search import normalize_text
+
+SQLITE_EXTENSIONS = (".db", ".sqlite", ".sqlite3")
+BINARY_EXTENSIONS = (".snap",)
+
+
+class StorageBackend:
+    """存储后端接口"""
+
+    # 加载后是否需要立即整体保存一次（如日志尾部损坏）
+    needs_compact = False
+    # 本进程已同步到的数据版本
+    version = 0
+
+    def __init__(self, path: str, log: Callable[[str], None] = print):
+        self.path = path
+        self._log = log
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def load_snapshot(self) -> Iterator[Article]:
+        """按显示顺序逐篇读出已保存的文章"""
+        raise NotImplementedError
+
+    def open_articles(self) -> Optional[MutableMapping[str, Article]]:
+        """
+        代替 load_snapshot()：返回按显示顺序的 id -> Article 映射，文章在被取出时才解码
+
+        后端不支持时返回 None，由调用方用 load_snapshot() 完整读取
+        """
+        return None
+
+    def replay(self) -> Iterator[Dict]:
+        """读出快照之后的变更记录（{"op": add/update/remove, ...}），没有则为空"""
+        return iter(())
+
+    def lock(self, blocking: bool = True) -> ContextManager:
+        """
+        进程间写锁（可重入）；读取变更与写入期间持有，保证看到并写入一致的状态
+
+        Args:
+            blocking: 为 False 时锁已被其他线程或进程持有则不等待，抛出 BlockingIOError
+        """
+        return nullcontext()
+
+    def changes(self) -> Optional[List[Dict]]:
+        """
+        其他进程在本进程上次同步之后写入的变更记录（按版本顺序，须持有 lock）
+
+        Returns:
+            变更记录列表；None 表示无法增量合并（如数据已被整体重写），需要重新加载
+        """
+        return []
+
+    def append(self, record: Dict) -> bool:
+        """
+        持久化一条变更记录（须持有 lock 且已合并 changes）
+
+        Returns:
+            是否需要调用 save_all 整体保存（如日志已累计到压缩阈值）
+        """
+        raise NotImplementedError
+
+    def save_all(self, articles: Iterable[Article], compacting: bool = False,
+                 tombstones: Optional[Dict[str, Tuple[int, int]]] = None) -> None:
+        """
+        用给定文章整体替换已保存的数据
+
+        Args:
+            compacting: 内容与已写入的变更记录一致、只是压缩日志时为 True；
+                否则视为一次新的写入，其他进程需要重新加载
+            tombstones: 同时整体替换的删除记录；None 表示保留原有的删除记录
+        """
+        raise NotImplementedError
+
+    def load_tombstones(self) -> Dict[str, Tuple[int, int]]:
+        """已删除文章的 ID -> (修订号, 删除时间戳)，供增量导出删除操作"""
+        return {}
+
+    def find_articles(self, article_ids: Iterable[str]) -> Optional[Dict[str, Optional[Article]]]:
+        """
+        不加载全部数据，只按 ID 读取少数文章（如命令行 get）
+
+        Returns:
+            ID -> 文章（不存在为 None）；None 表示后端做不到，需要完整加载
+        """
+        return None
+
+    def search_tags(self, keywords: List[str]) -> Optional[Set[str]]:
+        """标签子串 AND 搜索的候选 ID；返回 None 表示后端无法处理，由内存索引负责"""
+        return None
+
+    def search_titles(self, keywords: List[str]) -> Optional[Set[str]]:
+        """标题子串 AND 搜索的候选 ID（关键词已归一化）；返回 None 含义同上"""
+        return None
+
+    def close(self) -> None:
+        pass
+
+
+class JsonStorage(StorageBackend):
+    """
+    JSON 快照（原子替换写入）+ 追加式日志，日志累计到阈值后压缩进快照
+
+    快照开头记录 "version"，日志中每条记录带递增的 "version"；压缩时旧日志轮转为 .1 保留一代，
+    落后不多的进程只需读取日志即可增量合并，无需重新解析快照。
+    """
+
+    _VERSION_HEAD = re.compile(r'\s*\{\s*"version"\s*:\s*(\d+)')
+
+    def __init__(self, path: str, journaled: bool = True, compact_threshold: int = 200,
+                 log: Callable[[str], None] = print):
+        super().__init__(path, log)
+        self.journal = Journal(path + ".log") if journaled else None
+        # 删除记录单独存放（每行一条），快照与日志中只有现存的文章
+        self.tombstone_log = Journal(path + ".deleted")
+        self.compact_threshold = compact_threshold
+        self._file_lock = FileLock(path + ".lock")
+        # 上次同步时快照与日志文件的状态，不变则无需读取
+        self._stamp: Optional[Tuple] = None
+
+    def lock(self, blocking: bool = True) -> ContextManager:
+        return self._file_lock.hold(blocking)
+
+    def _snapshot_version(self) -> int:
+        """只读取快照开头的版本号（旧格式快照没有版本号，视为 0）"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                match = self._VERSION_HEAD.match(f.read(256))
+        except OSError:
+            return 0
+        return int(match.group(1)) if match else 0
+
+    def _current_stamp(self) -> Tuple:
+        stamp = []
+        for path in (self.path, self.path + ".log"):
+            try:
+                st = os.stat(path)
+                stamp.append((st.st_ino, st.st_size, st.st_mtime_ns))
+            except OSError:
+                stamp.append(None)
+        return tuple(stamp)
+
+    def load_snapshot(self) -> Iterator[Article]:
+        self.version = self._snapshot_version()
+        with open(self.path, 'r', encoding='utf-8') as f:
+            # 流式解析 articles 数组，逐条构建 Article，不在内存中保留整份 JSON 文本和对象树
+            for article_data in iter_json_array(f, "articles"):
+                yield Article.from_dict(article_data)
+
+    def replay(self) -> Iterator[Dict]:
+        if self.journal:
+            snapshot_version = self.version
+            for record in self.journal.replay():
+                version = record.get("version")
+                if version is not None:
+                    # 快照已包含的记录（压缩后其他进程又读到的旧记录）跳过
+                    if version <= snapshot_version:
+                        continue
+                    self.version = max(self.version, version)
+                yield record
+            if self.journal.damaged:
+                self._log(f"警告：{self.journal.path} 中存在不完整的记录，已忽略其后的内容。")
+            if self.journal.record_count:
+                self._log(f"已从 {self.journal.path} 重放 {self.journal.record_count} 条变更记录。")
+            # 日志尾部损坏时立即压缩，避免后续追加的记录被一并丢弃
+            self.needs_compact = self.journal.damaged
+        self._stamp = self._current_stamp()
+
+    def changes(self) -> Optional[List[Dict]]:
+        stamp = self._current_stamp()
+        if stamp == self._stamp:
+            return []
+        records: List[Dict] = []
+        if self.journal:
+            for journal in (Journal(self.journal.path + ".1"), self.journal):
+                records.extend(record for record in journal.replay()
+                               if record.get("version", 0) > self.version)
+        # 记录必须从本进程的版本起连续，且快照中没有日志之外的修改，才能增量合并
+        expected = self.version + 1
+        for record in records:
+            if record["version"] != expected:
+                return None
+            expected += 1
+        if self._snapshot_version() >= expected:
+            return None
+        self.version = expected - 1
+        self._stamp = stamp
+        return records
+
+    def load_tombstones(self) -> Dict[str, Tuple[int, int]]:
+        tombstones = {}
+        for entry in self.tombstone_log.replay():
+            tombstones[entry["id"]] = (entry["revision"], entry["modified"])
+        return tombstones
+
+    def _append_tombstone(self, record: Dict) -> None:
+        if record.get("op") == "remove" and "revision" in record:
+            self.tombstone_log.append({"id": record["id"], "revision": record["revision"],
+                                       "modified": record.get("modified", 0)})
+
+    def append(self, record: Dict) -> bool:
+        self.version += 1
+        self._append_tombstone(record)
+        if not self.journal:
+            return True
+        self.journal.append(dict(record, version=self.version))
+        self._stamp = self._current_stamp()
+        return self.journal.record_count >= self.compact_threshold
+
+    def save_all(self, articles: Iterable[Article], compacting: bool = False,
+                 tombstones: Optional[Dict[str, Tuple[int, int]]] = None) -> None:
+        if not compacting:
+            self.version += 1
+        if tombstones is not None:
+            self._write_tombstones(tombstones)
+        tmp_file = self.path + ".tmp"
+        with open(tmp_file, 'wb') as f:
+            self._write_snapshot(f, articles)
+            f.flush()
+            os.fsync(f.fileno())
+            metrics.count("storage.snapshot_bytes", f.tell())
+        os.replace(tmp_file, self.path)
+        if self.journal:
+            self.journal.rotate()
+        self.needs_compact = False
+        self._stamp = self._current_stamp()
+
+    def _write_tombstones(self, tombstones: Dict[str, Tuple[int, int]]) -> None:
+        tmp_file = self.tombstone_log.path + ".tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            for article_id, (revision, modified) in tombstones.items():
+                f.write(json.dumps({"id": article_id, "revision": revision, "modified": modified},
+                                   ensure_ascii=False, separators=(',', ':')) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.tombstone_log.path)
+
+    def _write_snapshot(self, f: BinaryIO, articles: Iterable[Article]) -> None:
+        text = io.TextIOWrapper(f, encoding='utf-8')
+        data = {
+            "version": self.version,
+            "articles": [article.to_dict() for article in articles]
+        }
+        json.dump(data, text, ensure_ascii=False, indent=4)
+        text.flush()
+        text.detach()
+
+
+class BinaryStorage(JsonStorage):
+    """二进制快照 + 追加式日志；日志、加锁与版本同步的方式与 JsonStorage 相同"""
+
+    def _snapshot_version(self) -> int:
+        try:
+            with BinarySnapshot(self.path) as snapshot:
+                return snapshot.version
+        except (OSError, ValueError):
+            return 0
+
+    def load_snapshot(self) -> Iterator[Article]:
+        with BinarySnapshot(self.path) as snapshot:
+            self.version = snapshot.version
+            yield from snapshot
+
+    def open_articles(self) -> Optional[SnapshotArticles]:
+        """保持快照打开，文章按需解码；有重复 ID 时返回 None，改为完整读取后重新分配 ID"""
+        # Windows 上被映射的文件不能被替换，而整体保存会替换快照，只能读入内存
+        snapshot = BinarySnapshot(self.path, in_memory=os.name == "nt")
+        try:
+            articles = SnapshotArticles(snapshot)
+        except ValueError:
+            snapshot.close()
+            return None
+        self.version = snapshot.version
+        return articles
+
+    def find_articles(self, article_ids: Iterable[str]) -> Optional[Dict[str, Optional[Article]]]:
+        """在快照的 ID 索引上二分查找（其余文章不解码），再叠加日志中对这些文章的后续修改"""
+        found: Dict[str, Optional[Article]] = dict.fromkeys(article_ids)
+        # 持锁：避免读完快照、读日志之前被其他进程压缩（日志已轮转）而漏掉修改
+        with self.lock():
+            try:
+                snapshot = BinarySnapshot(self.path)
+            except FileNotFoundError:
+                return found
+            with snapshot:
+                for article_id in found:
+                    found[article_id] = snapshot.find(article_id)
+                snapshot_version = snapshot.version
+            if self.journal:
+                for record in Journal(self.journal.path).replay():
+                    if record.get("version", snapshot_version + 1) <= snapshot_version:
+                        continue
+                    if record.get("op") == "remove":
+                        if record.get("id") in found:
+                            found[record["id"]] = None
+                    elif record.get("article", {}).get("id") in found:
+                        found[record["article"]["id"]] = Article.from_dict(record["article"])
+        return found
+
+    def _write_snapshot(self, f: BinaryIO, articles: Iterable[Article]) -> None:
+        write_snapshot(f, articles, self.version)
+
+
+class SqliteStorage(StorageBackend):
+    """
+    SQLite 存储：articles(文章) 与 tags(文章-标签) 两张规范化表，每次修改只写受影响的行
+
+    article_fts 为 FTS5 trigram 全文索引（标题已归一化，标签以换行分隔），
+    用于子串搜索求候选集；少于 3 个字符的关键词无法用三元组匹配，交回内存索引处理。
+    changes 表按版本号记录每次写入涉及的文章（article_id 为空表示整体重写），供其他进程增量合并。
+    deleted 表记录已删除文章的修订号与删除时间，供增量导出删除操作。
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS articles (
+            seq INTEGER PRIMARY KEY,
+            id TEXT NOT NULL UNIQUE,
+            title TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            revision INTEGER NOT NULL DEFAULT 0,
+            modified INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE TABLE IF NOT EXISTS tags (
+            article_seq INTEGER NOT NULL REFERENCES articles(seq) ON DELETE CASCADE,
+            position INTEGER NOT NULL,
+            tag TEXT NOT NULL,
+            PRIMARY KEY (article_seq, position)
+        );
+        CREATE TABLE IF NOT EXISTS changes (
+            version INTEGER PRIMARY KEY AUTOINCREMENT,
+            article_id TEXT
+        );
+        CREATE TABLE IF NOT EXISTS deleted (
+            id TEXT PRIMARY KEY,
+            revision INTEGER NOT NULL,
+            modified INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS tags_by_tag ON tags(tag);
+        CREATE INDEX IF NOT EXISTS articles_by_position ON articles(position);
+    """
+    _MIN_TRIGRAM = 3
+    # 等待其他进程写事务的最长时间
+    _BUSY_TIMEOUT_MS = 30000
+    # changes 表保留的最近记录数，落后更多的进程需要重新加载
+    _CHANGES_KEPT = 1000
+
+    def __init__(self, path: str, log: Callable[[str], None] = print):
+        super().__init__(path, log)
+        self._existed = os.path.exists(path)
+        self._conn = sqlite3.connect(path, timeout=self._BUSY_TIMEOUT_MS / 1000, check_same_thread=False)
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.executescript(self._SCHEMA)
+        self._migrate()
+        try:
+            self._conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS article_fts "
+                "USING fts5(title, tags, tokenize='trigram case_sensitive 1')")
+            self.fts = True
+        except sqlite3.OperationalError:
+            # 编译时未启用 FTS5 或版本过旧（trigram 需 3.34+），搜索全部交给内存索引
+            self.fts = False
+        self._conn.commit()
+        self._thread_lock = threading.RLock()
+        self._lock_depth = 0
+        # 其他连接提交后 PRAGMA data_version 会变化，不变则无需查询 changes 表
+        self._data_version: Optional[int] = None
+
+    def _migrate(self) -> None:
+        """旧版数据库的 articles 表没有修订号与修改时间列，补上（默认 0）"""
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(articles)")}
+        for column in ("revision", "modified"):
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE articles ADD COLUMN {column} INTEGER NOT NULL DEFAULT 0")
+
+    def exists(self) -> bool:
+        return self._existed
+
+    def load_tombstones(self) -> Dict[str, Tuple[int, int]]:
+        return {article_id: (revision, modified) for article_id, revision, modified
+                in self._conn.execute("SELECT id, revision, modified FROM deleted")}
+
+    @contextmanager
+    def lock(self, blocking: bool = True) -> Iterator[None]:
+        """写事务（BEGIN IMMEDIATE），由 SQLite 自身的文件锁保证多进程互斥"""
+        if not self._thread_lock.acquire(blocking):
+            raise BlockingIOError(f"{self.path} 正被本进程的其他线程写入")
+        try:
+            if self._lock_depth:
+                self._lock_depth += 1
+                try:
+                    yield
+                finally:
+                    self._lock_depth -= 1
+                return
+            if blocking:
+                self._conn.execute("BEGIN IMMEDIATE")
+            else:
+                # 不等待其他进程的写事务
+                self._conn.execute("PRAGMA busy_timeout = 0")
+                try:
+                    self._conn.execute("BEGIN IMMEDIATE")
+                except sqlite3.OperationalError as e:
+                    raise BlockingIOError(f"{self.path} 正被其他进程写入") from e
+                finally:
+                    self._conn.execute(f"PRAGMA busy_timeout = {self._BUSY_TIMEOUT_MS}")
+            self._lock_depth = 1
+            changes = self._conn.total_changes
+            try:
+                yield
+            except BaseException:
+                self._lock_depth = 0
+                self._conn.rollback()
+                raise
+            self._lock_depth = 0
+            self._conn.commit()
+            # SQLite 的写入量以行数计
+            metrics.count("storage.sqlite_rows", self._conn.total_changes - changes)
+        finally:
+            self._thread_lock.release()
+
+    def _sync_point(self) -> None:
+        row = self._conn.execute("SELECT COALESCE(MAX(version), 0) FROM changes").fetchone()
+        self.version = row[0]
+        self._data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def load_snapshot(self) -> Iterator[Article]:
+        self._sync_point()
+        rows = self._conn.execute(
+            "SELECT a.seq, a.id, a.title, a.revision, a.modified, t.tag FROM articles a "
+            "LEFT JOIN tags t ON t.article_seq = a.seq "
+            "ORDER BY a.position, t.position")
+        current_seq = None
+        article: Optional[Article] = None
+        for seq, article_id, title, revision, modified, tag in rows:
+            if seq != current_seq:
+                if article is not None:
+                    yield article
+                current_seq = seq
+                article = Article(title, article_id=article_id, revision=revision, modified=modified)
+            if tag is not None:
+                article.add_tag(tag)
+        if article is not None:
+            yield article
+
+    def _read_article(self, article_id: str) -> Optional[Article]:
+        row = self._conn.execute("SELECT seq, title, revision, modified FROM articles WHERE id = ?",
+                                 (article_id,)).fetchone()
+        if row is None:
+            return None
+        tags = [tag for (tag,) in self._conn.execute(
+            "SELECT tag FROM tags WHERE article_seq = ? ORDER BY position", (row[0],))]
+        return Article(row[1], tags, article_id=article_id, revision=row[2], modified=row[3])
+
+    def find_articles(self, article_ids: Iterable[str]) -> Optional[Dict[str, Optional[Article]]]:
+        return {article_id: self._read_article(article_id) for article_id in article_ids}
+
+    def changes(self) -> Optional[List[Dict]]:
+        data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        if data_version == self._data_version:
+            return []
+        rows = self._conn.execute("SELECT version, article_id FROM changes WHERE version > ? ORDER BY version",
+                                  (self.version,)).fetchall()
+        if not rows:
+            self._data_version = data_version
+            return []
+        # 中间的记录已被清理，或其他进程整体重写过数据
+        if rows[0][0] != self.version + 1 or any(article_id is None for _, article_id in rows):
+            return None
+        records = []
+        # 同一篇文章多次修改只需读取一次当前状态
+        for article_id in dict.fromkeys(article_id for _, article_id in rows):
+            article = self._read_article(article_id)
+            if article is None:
+                record = {"op": "remove", "id": article_id}
+                tombstone = self._conn.execute("SELECT revision, modified FROM deleted WHERE id = ?",
+                                               (article_id,)).fetchone()
+                if tombstone is not None:
+                    record["revision"], record["modified"] = tombstone
+                records.append(record)
+            else:
+                records.append({"op": "update", "article": article.to_dict()})
+        self.version = rows[-1][0]
+        self._data_version = data_version
+        return records
+
+    def _record_change(self, article_id: Optional[str]) -> None:
+        cursor = self._conn.execute("INSERT INTO changes(article_id) VALUES (?)", (article_id,))
+        self.version = cursor.lastrowid
+        if self.version % self._CHANGES_KEPT == 0:
+            self._conn.execute("DELETE FROM changes WHERE version <= ?", (self.version - self._CHANGES_KEPT,))
+
+    def _write_tags_and_fts(self, seq: int, article: Article) -> None:
+        tags = article.tag_tuple
+        self._conn.executemany("INSERT INTO tags(article_seq, position, tag) VALUES (?, ?, ?)",
+                               [(seq, position, tag) for position, tag in enumerate(tags)])
+        if self.fts:
+            self._conn.execute("INSERT INTO article_fts(rowid, title, tags) VALUES (?, ?, ?)",
+                               (seq, normalize_text(article.title), "\n".join(tags)))
+
+    def _delete_fts(self, seq: int) -> None:
+        if self.fts:
+            self._conn.execute("DELETE FROM article_fts WHERE rowid = ?", (seq,))
+
+    def _seq_of(self, article_id: str) -> Optional[int]:
+        row = self._conn.execute("SELECT seq FROM articles WHERE id = ?", (article_id,)).fetchone()
+        return row[0] if row else None
+
+    def append(self, record: Dict) -> bool:
+        with self.lock():
+            if record.get("op") == "remove":
+                article_id = record.get("id")
+                seq = self._seq_of(article_id)
+                if seq is not None:
+                    self._delete_fts(seq)
+                    self._conn.execute("DELETE FROM articles WHERE seq = ?", (seq,))
+                if "revision" in record:
+                    self._conn.execute("INSERT OR REPLACE INTO deleted(id, revision, modified) VALUES (?, ?, ?)",
+                                       (article_id, record["revision"], record.get("modified", 0)))
+                self._record_change(article_id)
+                return False
+
+            article = Article.from_dict(record.get("article", {}))
+            seq = self._seq_of(article.id)
+            if seq is None:
+                cursor = self._conn.execute(
+                    "INSERT INTO articles(id, title, position, revision, modified) "
+                    "VALUES (?, ?, (SELECT COALESCE(MAX(position), -1) + 1 FROM articles), ?, ?)",
+                    (article.id, article.title, article.revision, article.modified))
+                seq = cursor.lastrowid
+            else:
+                # 更新时保留原有位置
+                self._conn.execute("UPDATE articles SET title = ?, revision = ?, modified = ? WHERE seq = ?",
+                                   (article.title, article.revision, article.modified, seq))
+                self._conn.execute("DELETE FROM tags WHERE article_seq = ?", (seq,))
+                self._delete_fts(seq)
+            self._write_tags_and_fts(seq, article)
+            self._record_change(article.id)
+        return False
+
+    def save_all(self, articles: Iterable[Article], compacting: bool = False,
+                 tombstones: Optional[Dict[str, Tuple[int, int]]] = None) -> None:
+        with self.lock():
+            if self.fts:
+                self._conn.execute("DELETE FROM article_fts")
+            self._conn.execute("DELETE FROM tags")
+            self._conn.execute("DELETE FROM articles")
+            for position, article in enumerate(articles):
+                cursor = self._conn.execute(
+                    "INSERT INTO articles(id, title, position, revision, modified) VALUES (?, ?, ?, ?, ?)",
+                    (article.id, article.title, position, article.revision, article.modified))
+                self._write_tags_and_fts(cursor.lastrowid, article)
+            if tombstones is not None:
+                self._conn.execute("DELETE FROM deleted")
+                self._conn.executemany("INSERT INTO deleted(id, revision, modified) VALUES (?, ?, ?)",
+                                       [(article_id, revision, modified)
+                                        for article_id, (revision, modified) in tombstones.items()])
+            if not compacting:
+                self._record_change(None)
+        self._existed = True
+
+    def _fts_search(self, column: str, keywords: List[str]) -> Optional[Set[str]]:
+        if not self.fts or not keywords or any(len(kw) < self._MIN_TRIGRAM for kw in keywords):
+            return None
+        # 每个关键词作为一个短语（三元组序列），即子串匹配；短语内的双引号需成对转义
+        match = " AND ".join(f'{column} : "{kw.replace(chr(34), chr(34) * 2)}"' for kw in keywords)
+        rows = self._conn.execute(
+            "SELECT a.id FROM article_fts f JOIN articles a ON a.seq = f.rowid "
+            "WHERE article_fts MATCH ?", (match,))
+        return {article_id for (article_id,) in rows}
+
+    def search_tags(self, keywords: List[str]) -> Optional[Set[str]]:
+        return self._fts_search("tags", keywords)
+
+    def search_titles(self, keywords: List[str]) -> Optional[Set[str]]:
+        return self._fts_search("title", keywords)
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def open_storage(path: str, journaled: bool = True, compact_threshold: int = 200,
+                 log: Callable[[str], None] = print) -> StorageBackend:
+    """按扩展名选择后端：.db/.sqlite/.sqlite3 使用 SQLite，.snap 使用二进制快照，其余按 JSON 快照处理"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext in SQLITE_EXTENSIONS:
+        return SqliteStorage(path, log)
+    if ext in BINARY_EXTENSIONS:
+        return BinaryStorage(path, journaled, compact_threshold, log)
+    return JsonStorage(path, journaled, compact_threshold, log)
@@ -0,0 +1,163 @@
+# core/tag_index.py
+from typing import Dict, FrozenSet, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+_EMPTY: FrozenSet[str] = frozenset()
+
+
+class TagNgramIndex:
+    """标签字符 n-gram 倒排索引（单字 + 双字），用于标签子串模糊搜索的候选裁剪"""
+
+    def __init__(self):
+        # gram -> 包含该 gram 的文章 ID 集合
+        self._postings: Dict[str, Set[str]] = {}
+
+    @staticmethod
+    def _grams(text: str) -> Set[str]:
+        """提取文本中的全部单字与相邻双字"""
+        grams = set(text)
+        grams.update(text[i:i + 2] for i in range(len(text) - 1))
+        return grams
+
+    @classmethod
+    def _query_grams(cls, keyword: str) -> Set[str]:
+        """关键词的查询 gram：单字关键词用单字，否则用全部双字"""
+        if len(keyword) == 1:
+            return {keyword}
+        return {keyword[i:i + 2] for i in range(len(keyword) - 1)}
+
+    def add(self, article_id: str, tags: Iterable[str]) -> None:
+        grams: Set[str] = set()
+        for tag in tags:
+            grams |= self._grams(tag)
+        for gram in grams:
+            self._postings.setdefault(gram, set()).add(article_id)
+
+    def remove(self, article_id: str, tags: Iterable[str]) -> None:
+        grams: Set[str] = set()
+        for tag in tags:
+            grams |= self._grams(tag)
+        for gram in grams:
+            posting = self._postings.get(gram)
+            if posting is None:
+                continue
+            posting.discard(article_id)
+            if not posting:
+                del self._postings[gram]
+
+    def clear(self) -> None:
+        self._postings.clear()
+
+    def candidates(self, keywords: List[str]) -> Optional[Set[str]]:
+        """
+        返回可能满足所有关键词的文章 ID 集合（超集，需再做子串校验）
+
+        Returns:
+            候选 ID 集合；关键词全为空时返回 None，表示无法裁剪
+        """
+        postings = []
+        for keyword in keywords:
+            if not keyword:
+                continue
+            for gram in self._query_grams(keyword):
+                posting = self._postings.get(gram)
+                if not posting:
+                    return set()
+                postings.append(posting)
+
+        if not postings:
+            return None
+
+        # 从最短的倒排表开始求交集
+        postings.sort(key=len)
+        result = set(postings[0])
+        for posting in postings[1:]:
+            result &= posting
+            if not result:
+                break
+        return result
+
+
+class TagQuery(NamedTuple):
+    """精确标签查询：all_of 全部包含 AND（any_of 至少一个）AND NOT（none_of 任一）"""
+    all_of: Tuple[str, ...] = ()
+    any_of: Tuple[str, ...] = ()
+    none_of: Tuple[str, ...] = ()
+
+
+class TagPostingIndex:
+    """标签 -> 文章 ID 的倒排表，用于精确标签查询"""
+
+    def __init__(self):
+        self._postings: Dict[str, Set[str]] = {}
+
+    def add(self, article_id: str, tags: Iterable[str]) -> None:
+        for tag in tags:
+            self._postings.setdefault(tag, set()).add(article_id)
+
+    def remove(self, article_id: str, tags: Iterable[str]) -> None:
+        for tag in tags:
+            posting = self._postings.get(tag)
+            if posting is None:
+                continue
+            posting.discard(article_id)
+            if not posting:
+                del self._postings[tag]
+
+    def clear(self) -> None:
+        self._postings.clear()
+
+    def __len__(self) -> int:
+        return len(self._postings)
+
+    def all_tags(self) -> List[str]:
+        return list(self._postings)
+
+    def frequencies(self) -> Iterator[Tuple[str, int]]:
+        """逐个给出 (标签, 使用该标签的文章数)"""
+        return ((tag, len(posting)) for tag, posting in self._postings.items())
+
+    def posting(self, tag: str) -> Set[str]:
+        """返回包含该标签的文章 ID 集合（只读，请勿修改）"""
+        return self._postings.get(tag, _EMPTY)
+
+    def evaluate(self, query: TagQuery, universe: Iterable[str],
+                 cache: Optional[Dict[str, Set[str]]] = None) -> Set[str]:
+        """
+        计算查询命中的文章 ID 集合
+
+        Args:
+            query: 查询条件
+            universe: 全部文章 ID，仅在查询只含 NOT 或为空时使用
+            cache: 批量查询时共享的倒排表缓存
+        """
+        if cache is None:
+            cache = {}
+
+        def lookup(tag: str) -> Set[str]:
+            if tag not in cache:
+                cache[tag] = self.posting(tag)
+            return cache[tag]
+
+        result: Optional[Set[str]] = None
+        if query.all_of:
+            # 从最短的倒排表开始求交集
+            postings = sorted((lookup(tag) for tag in query.all_of), key=len)
+            result = set(postings[0])
+            for posting in postings[1:]:
+                if not result:
+                    break
+                result &= posting
+
+        if query.any_of and (result is None or result):
+            union: Set[str] = set()
+            for tag in query.any_of:
+                union |= lookup(tag)
+            result = union if result is None else result & union
+
+        if result is None:
+            result = set(universe)
+        for tag in query.none_of:
+            if not result:
+                break
+            result -= lookup(tag)
+        return result
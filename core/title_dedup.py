@@ -0,0 +1,131 @@
+# core/title_dedup.py
+import hashlib
+import re
+import unicodedata
+from typing import Dict, Set, Tuple
+
+from .title_search import normalize_text
+
+# 常见的会议、期刊与出版方缩写（已归一化为小写）
+_VENUES = (
+    "aaai", "accv", "acl", "acmmm", "arxiv", "bmvc", "cvpr", "eccv", "elsevier", "emnlp", "iccv", "icip",
+    "icassp", "iclr", "icme", "icml", "icra", "ieee", "ijcai", "ijcv", "iros", "kdd", "naacl", "neurips",
+    "nips", "pr", "sigir", "springer", "tcsvt", "tetci", "tgrs", "tip", "tmm", "tnnls", "tpami", "wacv",
+)
+_VENUE = "(?:" + "|".join(_VENUES) + ")(?![a-z])"
+_YEAR = r"(?<!\d)(?:\d{4}|\d{2})(?!\d)"
+# 标题开头的会议/期刊前缀，如 "(AAAI 2025)"、"【CVPR 2025】"、"ICCV 2025 Oral |"、"CVPR25 |"（已归一化为小写半角）；
+# 括号内须以已知缩写开头或含有年份；不带括号时须是已知缩写或后跟四位年份。
+# "(Re)thinking"、"[Survey]" 这类括号与 "GenDet:"、"FlashDepth |" 这类模型名不算前缀
+_VENUE_PREFIX = re.compile(
+    r"^\s*(?:[(\[【]\s*(?:" + _VENUE + r"|[^)\]】]{0,30}?" + _YEAR + r")[^)\]】]{0,30}[)\]】]\s*[|:]?\s*"
+    r"|(?:" + _VENUE + r"\s*(?:\d{4}|\d{2})?|[a-z]{2,10}\s+\d{4})"
+    r"(?:\s*(?:oral|spotlight|highlight))?\s*[|:]\s*)"
+)
+_SHINGLE_SIZE = 3
+_HASH_BITS = 64
+_BANDS = 4
+_BAND_BITS = _HASH_BITS // _BANDS
+
+
+def title_key(title: str) -> str:
+    """去掉会议前缀、标点与空白后的归一化标题，用于判断"实质相同"的标题"""
+    text = _VENUE_PREFIX.sub("", normalize_text(title), count=1)
+    return "".join(ch for ch in text if unicodedata.category(ch)[0] in "LN")
+
+
+# 把一个字节的 8 个位展开到 8 条 16 位"通道"，多个哈希值相加即可按位计数
+_LANE_BITS = 16
+_BYTE_SPREAD = [sum(((byte >> i) & 1) << (i * _LANE_BITS) for i in range(8)) for byte in range(256)]
+_LANE_MASK = (1 << _LANE_BITS) - 1
+
+
+def simhash(text: str) -> int:
+    """基于字符 3-gram 的 64 位 SimHash"""
+    if len(text) <= _SHINGLE_SIZE:
+        shingles = {text}
+    else:
+        shingles = {text[i:i + _SHINGLE_SIZE] for i in range(len(text) - _SHINGLE_SIZE + 1)}
+    # 各位上为 1 的次数，打包在一个大整数的各通道中
+    bit_counts = 0
+    for shingle in shingles:
+        value = int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+        for k in range(8):
+            bit_counts += _BYTE_SPREAD[value >> (8 * k) & 0xFF] << (8 * k * _LANE_BITS)
+    # 多数位为 1 则指纹该位取 1
+    total = len(shingles)
+    fingerprint = 0
+    for bit in range(_HASH_BITS):
+        if 2 * (bit_counts >> (bit * _LANE_BITS) & _LANE_MASK) > total:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+class TitleDedupIndex:
+    """
+    标题查重索引：归一化键的哈希表 + SimHash 近似重复检测
+
+    SimHash 分成 4 段各 16 位建表；海明距离不超过 3 的两个指纹至少有一段完全相同，
+    因此只需比较同段命中的候选，无需与全部标题逐一比对。
+    """
+
+    def __init__(self, max_distance: int = 3):
+        self.max_distance = max_distance
+        self._by_key: Dict[str, Set[str]] = {}
+        self._fingerprints: Dict[str, int] = {}
+        self._bands: Dict[Tuple[int, int], Set[str]] = {}
+
+    @staticmethod
+    def _band_keys(fingerprint: int):
+        mask = (1 << _BAND_BITS) - 1
+        return [(band, fingerprint >> (band * _BAND_BITS) & mask) for band in range(_BANDS)]
+
+    def add(self, article_id: str, title: str) -> None:
+        key = title_key(title)
+        self._by_key.setdefault(key, set()).add(article_id)
+        fingerprint = simhash(key)
+        self._fingerprints[article_id] = fingerprint
+        for band_key in self._band_keys(fingerprint):
+            self._bands.setdefault(band_key, set()).add(article_id)
+
+    def remove(self, article_id: str, title: str) -> None:
+        """移除文章；title 须与 add 时一致"""
+        key = title_key(title)
+        group = self._by_key.get(key)
+        if group is not None:
+            group.discard(article_id)
+            if not group:
+                del self._by_key[key]
+        fingerprint = self._fingerprints.pop(article_id, None)
+        if fingerprint is None:
+            return
+        for band_key in self._band_keys(fingerprint):
+            bucket = self._bands.get(band_key)
+            if bucket is not None:
+                bucket.discard(article_id)
+                if not bucket:
+                    del self._bands[band_key]
+
+    def clear(self) -> None:
+        self._by_key.clear()
+        self._fingerprints.clear()
+        self._bands.clear()
+
+    def find(self, title: str) -> Tuple[Set[str], Set[str]]:
+        """
+        查找与 title 重复的文章
+
+        Returns:
+            (归一化键相同的 ID 集合, 仅近似相似的 ID 集合)
+        """
+        key = title_key(title)
+        same_key = set(self._by_key.get(key, ()))
+        if not key:
+            return same_key, set()
+        fingerprint = simhash(key)
+        candidates: Set[str] = set()
+        for band_key in self._band_keys(fingerprint):
+            candidates |= self._bands.get(band_key, set())
+        similar = {article_id for article_id in candidates - same_key
+                   if bin(self._fingerprints[article_id] ^ fingerprint).count("1") <= self.max_distance}
+        return same_key, similar
@@ -0,0 +1,102 @@
+# core/title_search.py
+import unicodedata
+from bisect import bisect_right
+from typing import Dict, List, Optional, Set
+
+try:
+    from opencc import OpenCC  # 可选依赖：繁体转简体
+    _to_simplified = OpenCC('t2s').convert
+except ImportError:
+    _to_simplified = None
+
+# 拼接缓冲区中标题之间的分隔符（输入的关键词不会包含它）
+_SEPARATOR = "\x00"
+
+
+def normalize_text(text: str) -> str:
+    """
+    搜索用的文本归一化：全角转半角（NFKC）+ 大小写折叠；
+    安装了 opencc 时额外将繁体转为简体
+    """
+    text = unicodedata.normalize("NFKC", text).casefold()
+    if _to_simplified is not None:
+        text = _to_simplified(text)
+    return text
+
+
+class TitleSearchIndex:
+    """
+    标题搜索引擎：维护归一化后的标题列，并拼接成一个大缓冲区；
+    每个关键词只需在缓冲区上反复 str.find，不必在 Python 层逐篇循环
+    """
+
+    def __init__(self):
+        # id -> 归一化标题
+        self._normalized: Dict[str, str] = {}
+        # 拼接缓冲区及每个标题的起始偏移，修改后在下次搜索时按需重建
+        self._buffer = ""
+        self._starts: List[int] = []
+        self._ids: List[str] = []
+        self._dirty = False
+
+    def add(self, article_id: str, title: str) -> None:
+        self._normalized[article_id] = normalize_text(title)
+        self._dirty = True
+
+    def remove(self, article_id: str) -> None:
+        if self._normalized.pop(article_id, None) is not None:
+            self._dirty = True
+
+    def clear(self) -> None:
+        self._normalized.clear()
+        self._dirty = True
+
+    def normalized_title(self, article_id: str) -> str:
+        """文章归一化后的标题"""
+        return self._normalized[article_id]
+
+    def _rebuild(self) -> None:
+        self._ids = list(self._normalized)
+        self._starts = []
+        offset = 0
+        for title in self._normalized.values():
+            self._starts.append(offset)
+            offset += len(title) + len(_SEPARATOR)
+        self._buffer = _SEPARATOR.join(self._normalized.values())
+        self._dirty = False
+
+    def _scan(self, keyword: str) -> Set[str]:
+        """在拼接缓冲区中查找包含关键词的全部标题"""
+        if self._dirty:
+            self._rebuild()
+        found: Set[str] = set()
+        buffer, starts, ids = self._buffer, self._starts, self._ids
+        pos = buffer.find(keyword)
+        while pos != -1:
+            i = bisect_right(starts, pos) - 1
+            found.add(ids[i])
+            # 一个标题命中一次即可，直接跳到下一个标题
+            if i + 1 >= len(starts):
+                break
+            pos = buffer.find(keyword, starts[i + 1])
+        return found
+
+    def search(self, keywords: List[str]) -> Optional[Set[str]]:
+        """
+        返回标题包含全部关键词（归一化后子串匹配）的文章 ID 集合
+
+        Returns:
+            命中的 ID 集合；关键词全为空时返回 None，表示不做过滤
+        """
+        normalized = [normalize_text(kw) for kw in keywords]
+        normalized = [kw for kw in normalized if kw]
+        if not normalized:
+            return None
+        # 最长的关键词通常最有区分度：只对它扫描缓冲区，其余关键词在候选上校验
+        normalized.sort(key=len, reverse=True)
+        result = self._scan(normalized[0])
+        for kw in normalized[1:]:
+            if not result:
+                break
+            result = {article_id for article_id in result if kw in self._normalized[article_id]}
+        return result
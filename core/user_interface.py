@@ -1,29 +1,141 @@
 # core/user_interface.py
-import json
 import os
-from datetime import datetime
-from typing import List, Optional
+import sys
+from typing import Iterable, List, Optional, Sized
 
 from .article import Article
-from .data_manager import DataManager
+from .data_manager import ConflictError, DataManager
+from .metrics import metrics
+from .query import QuerySyntaxError
+from .search_cache import SavedSearchStore
+
+try:
+    from .input_handler import InputHandler  # 可选依赖 readchar：标签输入时按 Tab 补全
+except ImportError:
+    InputHandler = None
 
 
 class UserInterface:
     """用户界面类（支持模糊搜索 + 结果保存）"""
 
-    def __init__(self, data_manager: DataManager):
+    def __init__(self, data_manager: DataManager, page_size: int = 10):
         self.data_manager = data_manager
+        self.page_size = page_size
+        # 分页浏览时是否使用紧凑的单行格式
+        self.compact = False
+        # 已保存的搜索与数据文件放在同一目录
+        data_dir = os.path.dirname(os.path.abspath(data_manager.data_file))
+        self.saved_searches = SavedSearchStore(os.path.join(data_dir, "saved_searches.json"))
+
+    def sync_external_changes(self) -> None:
+        """合并其他用户（进程）保存的修改，有变化时提示"""
+        changed = self.data_manager.refresh()
+        if changed:
+            print(f"🔄 已同步其他用户的修改（{changed} 篇文章）。")
+        for message in self.data_manager.take_conflicts():
+            print(f"⚠️  {message}")
+
+    def _read_line(self, prompt: str, completer) -> str:
+        """读取一行输入；在终端中按前缀给出补全建议（Tab/↑↓ 选择），否则退回普通 input"""
+        if InputHandler is None or not sys.stdin.isatty():
+            return input(prompt).strip()
+        return InputHandler.get_input_with_suggestions(prompt, completer=completer, separator=None).strip()
+
+    def _read_tag(self) -> str:
+        """读取一个标签（关键句），补全已有标签"""
+        return self._read_line("🏷️  > ", self.data_manager.complete_tags)
+
+    def _print_article(self, number: int, article: Article) -> None:
+        if self.compact:
+            print(f"{number:>4}. {article.summary_line()}")
+        else:
+            print(f"\n{number}. {article}")
+            print("-" * 30)
+
+    def display_articles(self, articles: Optional[Iterable[Article]] = None) -> bool:
+        """
+        分页显示文章：只格式化当前页，超过一页时进入翻页模式
+
+        Args:
+            articles: 要显示的文章（列表或生成器），默认为全部文章
+
+        Returns:
+            是否有文章可显示
+        """
+        if articles is None:
+            source, total = self.data_manager.iter_articles(), len(self.data_manager)
+        else:
+            source, total = articles, len(articles) if isinstance(articles, Sized) else None
+        iterator = iter(source)
+        # 已从来源中取出的文章（只保存引用，翻回前页时无需重新取）
+        fetched: List[Article] = []
+        exhausted = False
+
+        def fetch_until(count: int) -> None:
+            nonlocal exhausted
+            while not exhausted and len(fetched) < count:
+                try:
+                    fetched.append(next(iterator))
+                except StopIteration:
+                    exhausted = True
 
-    def display_articles(self, articles: List[Article] = None) -> bool:
-        target_articles = articles if articles is not None else self.data_manager.articles
         print("\n--- 📄 文章列表 ---")
-        if not target_articles:
+        fetch_until(1)
+        if not fetched:
             print("📭 当前没有任何文章。")
             return False
 
-        for i, article in enumerate(target_articles):
-            print(f"\n{i + 1}. {article}")
-            print("-" * 30)
+        page = 0
+        while True:
+            start = page * self.page_size
+            with metrics.span("ui.render_page"):
+                # 多取一篇，用来判断是否还有下一页
+                fetch_until(start + self.page_size + 1)
+                for i, article in enumerate(fetched[start:start + self.page_size], start + 1):
+                    self._print_article(i, article)
+            has_next = len(fetched) > start + self.page_size
+
+            if page == 0 and not has_next:
+                print("-" * 30)
+                return True
+
+            if exhausted:
+                total = len(fetched)
+            total_text = f"/共 {(total - 1) // self.page_size + 1} 页" if total else ""
+            print(f"\n📖 第 {page + 1} 页{total_text}"
+                  " [回车/n 下一页, p 上一页, g 页码 跳转, s 数量 每页条数, c 紧凑/详细, q 结束浏览]")
+            command = input("翻页> ").strip().lower()
+
+            if command in ("", "n"):
+                if has_next:
+                    page += 1
+                else:
+                    print("📌 已是最后一页。")
+                    if command == "":
+                        break
+            elif command == "p":
+                if page > 0:
+                    page -= 1
+                else:
+                    print("📌 已是第一页。")
+            elif command.startswith("g") and command[1:].strip().isdigit():
+                target = max(int(command[1:].strip()), 1) - 1
+                fetch_until(target * self.page_size + 1)
+                last_page = (len(fetched) - 1) // self.page_size
+                if target > last_page:
+                    print(f"📌 共 {last_page + 1} 页，已跳到最后一页。")
+                page = min(target, last_page)
+            elif command.startswith("s") and command[1:].strip().isdigit() and int(command[1:].strip()) > 0:
+                self.page_size = int(command[1:].strip())
+                # 保持当前页第一篇文章仍然可见
+                page = start // self.page_size
+            elif command == "c":
+                self.compact = not self.compact
+            elif command == "q":
+                break
+            else:
+                print("❌ 无效的翻页命令。")
+
         print("-" * 30)
         return True
 
@@ -45,7 +157,7 @@ class UserInterface:
             seen_tags = set()
             
             while True:
-                tag = input("🏷️  > ").strip()
+                tag = self._read_tag()
                 if tag == "":
                     break
                 if tag:
@@ -55,17 +167,13 @@ class UserInterface:
                         seen_tags.add(tag)
                         tags.append(tag)
 
-            # ✅ 新增：跨文章重复检测
-            duplicate_found = False
-            similar_articles = []
-            
-            for existing_article in self.data_manager.articles:
-                if existing_article.title == title:  # 只比对标题！
-                    similar_articles.append(existing_article)
-                    duplicate_found = True
+            # ✅ 跨文章重复检测（完全相同 + 去掉会议前缀/标点后相同 + 近似标题）
+            duplicates = self.data_manager.find_duplicate_titles(title)
+            similar_articles = duplicates["exact"] + duplicates["normalized"] + duplicates["similar"]
 
-            if duplicate_found:
-                print(f"\n🚨 警告：发现 {len(similar_articles)} 篇标题重复的文章！")
+            if similar_articles:
+                print(f"\n🚨 警告：发现 {len(duplicates['exact'])} 篇标题重复、"
+                      f"{len(duplicates['normalized']) + len(duplicates['similar'])} 篇标题相似的文章！")
                 for art in similar_articles:
                     print(f"   ID: {art.id}")
                     print(f"   标题: {art.title}")
@@ -82,7 +190,7 @@ class UserInterface:
                     print("↩️  已取消添加。")
                     continue  # 跳过本次添加，继续下一轮
 
-            article = Article(title, tags)
+            article = Article(title, tags, existing_ids=self.data_manager)
             self.data_manager.add_article(article)
             
             print(f"\n🎉 文章 '{title}' (ID: {article.id}) 添加成功！")
@@ -120,9 +228,12 @@ class UserInterface:
                     print("⛔ 标题不能为空。")
                 else:
                     old_title = article.title
-                    article.title = new_title
+                    try:
+                        self.data_manager.update_article_title(article, new_title)
+                    except ConflictError as e:
+                        print(f"⚠️  {e}")
+                        continue
                     print(f"✅ 标题已从 '{old_title}' 修改为 '{new_title}'。")
-                    self.data_manager.save_data()
                     break
 
             elif choice == '2':
@@ -147,7 +258,7 @@ class UserInterface:
         seen_tags = set()
         
         while True:
-            tag = input("🏷️  > ").strip()
+            tag = self._read_tag()
             if tag == "":
                 break
             if tag:
@@ -157,14 +268,17 @@ class UserInterface:
                     seen_tags.add(tag)
                     new_tags.append(tag)
 
-        article.tags = new_tags  # Article 构造函数内去重已无必要，但保留兼容
+        try:
+            self.data_manager.update_article_tags(article, new_tags)
+        except ConflictError as e:
+            print(f"⚠️  {e}")
+            return
         print("✅ 标签已更新:")
         if article.tags:
             for tag in article.tags:
                 print(f"      {tag}")
         else:
             print("      （已清空）")
-        self.data_manager.save_data()
 
     def delete_article_interactive(self) -> None:
         if not self.display_articles():
@@ -190,37 +304,62 @@ class UserInterface:
                 break
 
     def _save_search_results(self, search_type: str, keywords: List[str], results: List[Article]) -> None:
-        """保存搜索结果到 JSON 文件"""
+        """把查询条件与命中的文章 ID 追加到已保存的搜索（不复制文章内容）"""
         if not results:
             print("📭 无结果可保存。")
             return
 
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"search_result_{timestamp}.json"
-
-        data = {
-            "search_type": search_type,
-            "keywords": keywords,
-            "search_time": datetime.now().isoformat(),
-            "results": [article.to_dict() for article in results]
-        }
-
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=4)
-            print(f"💾 搜索结果已保存到: {filename}")
+            self.saved_searches.save(search_type, keywords, [article.id for article in results])
+            print(f"💾 搜索结果已保存到: {self.saved_searches.path}")
         except Exception as e:
             print(f"❌ 保存失败: {e}")
 
+    def show_saved_searches(self) -> None:
+        """列出已保存的搜索，选择后按保存的文章 ID 显示结果"""
+        try:
+            searches = self.saved_searches.load()
+        except (OSError, ValueError) as e:
+            print(f"❌ 读取已保存的搜索失败: {e}")
+            return
+        if not searches:
+            print("📭 还没有保存过搜索结果。")
+            return
+
+        print("\n--- 💾 已保存的搜索 ---")
+        labels = {"tag_search": "标签", "title_search": "标题", "ranked_search": "相关度", "query_search": "高级查询"}
+        for i, entry in enumerate(searches, 1):
+            label = labels.get(entry["search_type"], entry["search_type"])
+            print(f"{i:>3}. [{label}] {', '.join(entry['keywords'])}"
+                  f"  ({len(entry['article_ids'])} 篇, {entry['search_time']})")
+
+        choice = input("🔢 输入序号查看结果（直接回车返回）: ").strip()
+        if not choice:
+            return
+        if not choice.isdigit() or not 1 <= int(choice) <= len(searches):
+            print("⚠️  无效的序号。")
+            return
+
+        entry = searches[int(choice) - 1]
+        found = [self.data_manager.find_article_by_id(article_id) for article_id in entry["article_ids"]]
+        articles = [article for article in found if article is not None]
+        if articles:
+            self.display_articles(articles)
+        missing = len(found) - len(articles)
+        if missing:
+            print(f"⚠️  有 {missing} 篇文章已被删除。")
+        elif not articles:
+            print("📭 没有可显示的文章。")
+
     def search_by_tags_interactive(self) -> None:
-        if not self.data_manager.articles:
+        if not len(self.data_manager):
             print("📭 当前没有文章可供搜索。")
             return
 
         print("\n🔎 按标签模糊搜索（每行输入一个关键词，空行结束）:")
         search_keywords = []
         while True:
-            keyword = input("🔍 > ").strip()
+            keyword = self._read_line("🔍 > ", self.data_manager.complete_tags)
             if keyword == "":
                 break
             if keyword:
@@ -230,23 +369,8 @@ class UserInterface:
             print("⛔ 未输入任何搜索关键词。")
             return
 
-        # 模糊 AND 匹配：每篇文章必须满足每个关键词至少在一个标签中出现
-        found_articles = []
-        for article in self.data_manager.articles:
-            # 检查是否满足所有关键词
-            all_keywords_matched = True
-            for kw in search_keywords:
-                keyword_matched = False
-                for tag in article.tags:
-                    if kw in tag:  # 模糊匹配
-                        keyword_matched = True
-                        break
-                if not keyword_matched:
-                    all_keywords_matched = False
-                    break
-
-            if all_keywords_matched:
-                found_articles.append(article)
+        # 模糊 AND 匹配：每篇文章必须满足每个关键词至少在一个标签中出现（走 n-gram 索引）
+        found_articles = self.data_manager.fuzzy_search_by_tags(search_keywords)
 
         print(f"\n--- 📌 标签模糊搜索结果 (必须包含: {', '.join(search_keywords)}) ---")
         if found_articles:
@@ -261,14 +385,14 @@ class UserInterface:
             self._save_search_results("tag_search", search_keywords, found_articles)
 
     def search_by_title_interactive(self) -> None:
-        if not self.data_manager.articles:
+        if not len(self.data_manager):
             print("📭 当前没有任何文章。")
             return
 
         print("\n🔎 按标题模糊搜索（每行输入一个关键词，空行结束）:")
         search_keywords = []
         while True:
-            keyword = input("🔍 > ").strip()
+            keyword = self._read_line("🔍 > ", self.data_manager.complete_titles)
             if keyword == "":
                 break
             if keyword:
@@ -278,16 +402,8 @@ class UserInterface:
             print("⛔ 未输入任何搜索关键词。")
             return
 
-        # 模糊 AND 匹配：标题必须包含所有关键词
-        found_articles = []
-        for article in self.data_manager.articles:
-            all_matched = True
-            for kw in search_keywords:
-                if kw not in article.title:  # 模糊匹配
-                    all_matched = False
-                    break
-            if all_matched:
-                found_articles.append(article)
+        # 模糊 AND 匹配：标题必须包含所有关键词（忽略大小写与全角/半角差异）
+        found_articles = self.data_manager.search_titles(search_keywords)
 
         print(f"\n--- 📌 标题模糊搜索结果 (必须包含: {', '.join(search_keywords)}) ---")
         if found_articles:
@@ -301,6 +417,75 @@ class UserInterface:
         if save_choice == 'y':
             self._save_search_results("title_search", search_keywords, found_articles)
 
+    def ranked_search_interactive(self) -> None:
+        if not len(self.data_manager):
+            print("📭 当前没有文章可供搜索。")
+            return
+
+        query = input("\n🔎 请输入检索内容（在标题和标签中按相关度排序）: ").strip()
+        if not query:
+            print("⛔ 未输入任何检索内容。")
+            return
+
+        top_k_input = input("🔢 显示前几条结果？(默认 10): ").strip()
+        top_k = int(top_k_input) if top_k_input.isdigit() and int(top_k_input) > 0 else 10
+
+        results = self.data_manager.ranked_search(query, top_k)
+        print(f"\n--- 📊 相关度排序结果 (检索: {query}) ---")
+        if not results:
+            print("📭 未找到相关的文章。")
+            print("-" * 50)
+            return
+
+        for i, (article, score) in enumerate(results):
+            print(f"\n{i + 1}. [相关度 {score:.2f}] {article}")
+            print("-" * 30)
+        print("-" * 50)
+
+        save_choice = input("是否保存此次搜索结果？(y/n, 默认 n): ").strip().lower()
+        if save_choice == 'y':
+            self._save_search_results("ranked_search", [query], [article for article, _ in results])
+
+    def query_search_interactive(self) -> None:
+        if not len(self.data_manager):
+            print("📭 当前没有文章可供搜索。")
+            return
+
+        print("\n🔎 高级查询：空格分隔表示 AND，可用 OR / NOT / 括号组合")
+        print('   "短语"  /正则/i  title:关键词  tag:关键词  tag:=完整标签；以 ? 结尾显示执行计划')
+        query = input("🔍 > ").strip()
+        explain = query.endswith("?")
+        if explain:
+            query = query[:-1].strip()
+        if not query:
+            print("⛔ 未输入任何查询。")
+            return
+
+        try:
+            found_articles = self.data_manager.query(query)
+            plan = self.data_manager.explain_query(query) if explain else None
+        except QuerySyntaxError as e:
+            print(f"❌ 查询语法错误：{e}")
+            return
+
+        if plan is not None:
+            print(f"\n--- 🧭 执行计划 ({plan['query']}) ---")
+            for step in plan["steps"]:
+                detail = f" {step['detail']}" if step["detail"] else ""
+                scanned = f"（校验 {step['scanned']} 篇）" if step.get("scanned") else ""
+                print(f"  {step['step']}{detail} → {step['candidates']} 篇{scanned}")
+
+        print(f"\n--- 📌 高级查询结果 ({query}) ---")
+        if found_articles:
+            self.display_articles(found_articles)
+        else:
+            print("📭 未找到匹配的文章。")
+        print("-" * 50)
+
+        save_choice = input("是否保存此次搜索结果？(y/n, 默认 n): ").strip().lower()
+        if save_choice == 'y':
+            self._save_search_results("query_search", [query], found_articles)
+
     def handle_zero_tag_articles_interactive(self) -> None:
         zero_tag_articles = self.data_manager.get_zero_tag_articles()
         print("\n--- 🆘 零标签文章 ---")
@@ -317,9 +502,8 @@ class UserInterface:
                 break
 
             article = self.data_manager.find_article_by_id(article_id)
-            is_zero_tag = any(z.id == article_id for z in zero_tag_articles)
 
-            if not article or not is_zero_tag:
+            if not article or not self.data_manager.is_zero_tag(article_id):
                 print(f"❌ 未在零标签列表中找到 ID '{article_id}'。")
                 continue
 
@@ -328,7 +512,7 @@ class UserInterface:
             seen_tags = set()
             
             while True:
-                tag = input("🏷️  > ").strip()
+                tag = self._read_tag()
                 if tag == "":
                     break
                 if tag:
@@ -338,12 +522,55 @@ class UserInterface:
                         seen_tags.add(tag)
                         tags.append(tag)
 
-            article.tags = tags
+            try:
+                self.data_manager.update_article_tags(article, tags)
+            except ConflictError as e:
+                print(f"⚠️  {e}")
+                continue
             print("✅ 已添加标签:")
             if article.tags:
                 for tag in article.tags:
                     print(f"      {tag}")
             else:
                 print("      （无）")
-            self.data_manager.save_data()
-            break
\ No newline at end of file
+            break
+
+    def show_statistics(self) -> None:
+        stats = self.data_manager.get_statistics()
+        print("\n--- 📊 语料统计 ---")
+        print(f"📄 文章总数: {stats['article_count']}")
+        print(f"🏷️  标签总数: {stats['tag_count']}（不重复 {stats['distinct_tag_count']}）")
+        print(f"🆘 零标签文章: {stats['zero_tag_count']}")
+
+        print("\n📈 每篇文章的标签数分布:")
+        for tag_count, article_count in stats["tag_count_histogram"].items():
+            print(f"   {tag_count} 个标签: {article_count} 篇")
+
+        if stats["top_tags"] and stats["top_tags"][0][1] > 1:
+            print("\n🔥 使用最多的标签:")
+            for tag, count in stats["top_tags"]:
+                if count > 1:
+                    print(f"   [{count} 篇] {tag}")
+
+        duplicates = stats["duplicate_titles"]
+        if duplicates:
+            print(f"\n🚨 重复标题 {len(duplicates)} 组:")
+            for title, article_ids in duplicates.items():
+                print(f"   {title}")
+                print(f"      ID: {', '.join(article_ids)}")
+        else:
+            print("\n✅ 没有重复标题。")
+
+        if metrics.enabled:
+            self._show_metrics()
+        print("-" * 30)
+
+    def _show_metrics(self) -> None:
+        data = metrics.to_dict()
+        print("\n⏱️  各操作耗时（本次运行）:")
+        for name, span in data["spans"].items():
+            print(f"   {name:<22} {span['count']:>6} 次  平均 {span['avg_ms']:.3f} ms  最长 {span['max_ms']:.3f} ms")
+        if data["counters"]:
+            print("\n🔢 计数:")
+            for name, value in data["counters"].items():
+                print(f"   {name:<28} {value}")
@@ -1,19 +1,79 @@
 # main.py
-from core.data_manager import DataManager
-from core.user_interface import UserInterface
+import os
+import signal
+import sys
+
+from core.background_loader import BackgroundLoader
 
 class ArticleManagerApp:
     """极简主应用（无标签管理菜单）"""
     
-    def __init__(self, data_file: str = "article_data.json"):
-        self.data_manager = DataManager(data_file)
-        self.ui = UserInterface(self.data_manager)
+    def __init__(self, data_file: str = "article_data.json", eager: bool = False):
+        """
+        Args:
+            data_file: 数据文件路径
+            eager: 为 True 时先加载完数据再显示菜单；默认在后台加载，菜单立即可用
+        """
+        self.data_file = data_file
+        self._data_manager = None
+        self._ui = None
+        self._progress = ("正在读取数据", 0)
+        self._waited = False
+        self._loader = BackgroundLoader(self._load).start()
+        if eager:
+            # 访问即等待加载完成
+            self.data_manager
+    
+    def _load(self):
+        # 数据模块在后台线程中才导入，不拖慢第一个菜单
+        import io
+        from core.data_manager import DataManager
+        # 加载期间的提示先缓存起来，首次使用数据时再显示，避免打断菜单输入
+        self._load_log = io.StringIO()
+        # 修改由后台线程延迟写入：累计 20 次或 2 秒后落盘，交互操作不必等待磁盘
+        return DataManager(self.data_file, log_stream=self._load_log, flush_every=20, flush_interval=2.0,
+                           on_progress=self._on_progress)
+    
+    def _on_progress(self, phase: str, count: int) -> None:
+        self._progress = (phase, count)
+    
+    def _show_progress(self, elapsed: float) -> None:
+        self._waited = True
+        phase, count = self._progress
+        print(f"\r⏳ {phase}… 已读取 {count} 篇（{elapsed:.1f} 秒）", end="", flush=True)
+    
+    @property
+    def data_manager(self):
+        """数据管理器；后台加载尚未完成时显示进度并等待"""
+        if self._data_manager is None:
+            data_manager = self._loader.result(self._show_progress)
+            if self._waited:
+                print()
+            print(self._load_log.getvalue(), end="")
+            data_manager.log_stream = None
+            self._data_manager = data_manager
+        return self._data_manager
+    
+    @property
+    def ui(self):
+        if self._ui is None:
+            from core.user_interface import UserInterface
+            self._ui = UserInterface(self.data_manager)
+        return self._ui
     
     def run(self):
-        self.main_menu()
+        try:
+            self.main_menu()
+        finally:
+            # 正常退出、Ctrl+C 或收到终止信号时都写入剩余修改
+            # （已在后台加载完但从未使用的数据管理器由它自己注册的 atexit 钩子关闭）
+            if self._data_manager is not None:
+                self._data_manager.close()
     
     def main_menu(self):
         while True:
+            if self._loader.done:
+                self.ui.sync_external_changes()
             print("\n" + "="*40)
             print("     📚 文章关键句标签管理系统")
             print("="*40)
@@ -21,14 +81,19 @@ class ArticleManagerApp:
             print("2. 按标签搜索")
             print("3. 按标题搜索")
             print("4. 查看零标签文章")
+            print("5. 相关度排序搜索")
+            print("6. 查看统计信息")
+            print("7. 查看已保存的搜索")
+            print("8. 高级查询（AND/OR/NOT、正则）")
             print("0. 退出并保存")
             print("-"*40)
             
             choice = input("请选择: ").strip()
             
             if choice == '0':
-                print("💾 正在保存数据...")
-                self.data_manager.save_data()
+                if self._data_manager is not None and self._data_manager.dirty:
+                    print("💾 正在保存数据...")
+                    self.data_manager.flush()
                 print("👋 程序已退出。")
                 break
             elif choice == '1':
@@ -39,11 +104,20 @@ class ArticleManagerApp:
                 self.ui.search_by_title_interactive()
             elif choice == '4':
                 self.ui.handle_zero_tag_articles_interactive()
+            elif choice == '5':
+                self.ui.ranked_search_interactive()
+            elif choice == '6':
+                self.ui.show_statistics()
+            elif choice == '7':
+                self.ui.show_saved_searches()
+            elif choice == '8':
+                self.ui.query_search_interactive()
             else:
                 print("❌ 无效选项，请重新输入。")
     
     def article_menu(self):
         while True:
+            self.ui.sync_external_changes()
             print("\n" + "-"*30)
             print("    📄 文章管理")
             print("-"*30)
@@ -70,8 +144,20 @@ class ArticleManagerApp:
                 print("❌ 无效选项。")
 
 def main():
-    app = ArticleManagerApp()
-    app.run()
+    # 带参数运行时进入非交互命令行模式，例如: python main.py tags 注意力
+    if len(sys.argv) > 1:
+        from core.cli import main as cli_main
+        sys.exit(cli_main(sys.argv[1:]))
+    # 终止/挂断信号按正常退出处理，使 run() 中的 finally 得以写入剩余修改
+    for name in ("SIGTERM", "SIGHUP"):
+        if hasattr(signal, name):
+            signal.signal(getattr(signal, name), lambda signum, frame: sys.exit(128 + signum))
+    # ARTICLE_EAGER_LOAD=1：先加载完数据再显示菜单（旧行为，便于对比启动耗时）
+    app = ArticleManagerApp(eager=os.environ.get("ARTICLE_EAGER_LOAD") == "1")
+    try:
+        app.run()
+    except KeyboardInterrupt:
+        print("\n👋 程序已退出。")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,152 @@
+# tests/test_concurrent_merge.py
+"""两个 DataManager 共用同一数据文件（相当于两个进程），检查延迟写入下的合并与冲突处理"""
+import io
+import time
+
+import pytest
+
+from core.article import Article
+from core.data_manager import ConflictError, DataManager
+
+
+def _open(path, **kwargs) -> DataManager:
+    # flush_every 很大：修改停留在待写队列中，由测试决定何时写入（模拟 write-behind 窗口内的并发修改）
+    return DataManager(str(path), log_stream=io.StringIO(), flush_every=1000, **kwargs)
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    path = tmp_path / "articles.json"
+    dm = DataManager(str(path), log_stream=io.StringIO())
+    dm.add_article(Article("原标题", ["t"], article_id="x"))
+    dm.add_article(Article("另一篇", ["u"], article_id="y"))
+    dm.close()
+    return path
+
+
+def _state(path, article_id="x"):
+    dm = DataManager(str(path), log_stream=io.StringIO())
+    try:
+        article = dm.find_article_by_id(article_id)
+        return None if article is None else (article.title, article.tags)
+    finally:
+        dm.close()
+
+
+def test_edits_to_different_fields_are_merged(data_file):
+    a, b = _open(data_file), _open(data_file)
+    try:
+        a.update_article_title(a.find_article_by_id("x"), "A 的标题")
+        b.update_article_tags(b.find_article_by_id("x"), ["b"])
+        b.flush()
+        a.flush()
+        assert a.take_conflicts()
+        b.refresh()
+        assert (b.find_article_by_id("x").title, b.find_article_by_id("x").tags) == ("A 的标题", ["b"])
+    finally:
+        a.close()
+        b.close()
+    assert _state(data_file) == ("A 的标题", ["b"])
+
+
+def test_same_field_conflict_keeps_newer_edit(data_file):
+    a, b = _open(data_file), _open(data_file)
+    try:
+        a.update_article_title(a.find_article_by_id("x"), "A 的标题")
+        # 修改时间戳以毫秒计，确保 B 的修改较新
+        time.sleep(0.01)
+        b.update_article_title(b.find_article_by_id("x"), "B 的标题")
+        b.flush()
+        a.flush()
+        conflicts = a.take_conflicts()
+        assert len(conflicts) == 1 and "标题" in conflicts[0]
+    finally:
+        a.close()
+        b.close()
+    assert _state(data_file)[0] == "B 的标题"
+
+
+def test_remote_delete_vs_older_local_edit(data_file):
+    a, b = _open(data_file), _open(data_file)
+    try:
+        a.update_article_tags(a.find_article_by_id("x"), ["a"])
+        time.sleep(0.01)
+        b.remove_article("x")
+        b.flush()
+        a.flush()
+        assert a.find_article_by_id("x") is None
+        assert a.take_conflicts()
+    finally:
+        a.close()
+        b.close()
+    assert _state(data_file) is None
+
+
+def test_local_delete_vs_newer_remote_edit(data_file):
+    a, b = _open(data_file), _open(data_file)
+    try:
+        a.remove_article("x")
+        time.sleep(0.01)
+        b.update_article_title(b.find_article_by_id("x"), "B 的标题")
+        b.flush()
+        a.flush()
+        assert a.find_article_by_id("x").title == "B 的标题"
+    finally:
+        a.close()
+        b.close()
+    assert _state(data_file) == ("B 的标题", ["t"])
+
+
+def test_pending_edit_of_touched_article_raises_conflict(data_file):
+    a, b = _open(data_file), _open(data_file)
+    try:
+        article = a.find_article_by_id("x")
+        b.update_article_tags(b.find_article_by_id("x"), ["b"])
+        b.flush()
+        with pytest.raises(ConflictError):
+            a.update_article_title(article, "A 的标题")
+    finally:
+        a.close()
+        b.close()
+
+
+def test_background_flush_does_not_touch_memory(data_file):
+    a, b = _open(data_file), _open(data_file)
+    try:
+        a.update_article_title(a.find_article_by_id("x"), "A 的标题")
+        it = a.iter_articles()
+        next(it)
+        b.add_article(Article("B 新增", [], article_id="z"))
+        b.update_article_tags(b.find_article_by_id("x"), ["b"])
+        b.flush()
+        # 后台写入线程：只读取不合并，与之冲突的修改暂不写入
+        a.flush(background=True)
+        assert "z" not in a
+        assert next(it).id == "y"
+        assert a._pending
+        assert _state(data_file) == ("原标题", ["b"])
+        # 界面线程合并后再写入
+        a.refresh()
+        a.flush()
+        assert not a._pending and "z" in a
+    finally:
+        a.close()
+        b.close()
+    assert _state(data_file) == ("A 的标题", ["b"])
+    assert _state(data_file, "z") == ("B 新增", [])
+
+
+def test_background_flush_writes_unrelated_edits(data_file):
+    a, b = _open(data_file), _open(data_file)
+    try:
+        a.update_article_title(a.find_article_by_id("y"), "A 改 y")
+        b.update_article_tags(b.find_article_by_id("x"), ["b"])
+        b.flush()
+        assert a.flush(background=True)
+        assert not a._pending
+        assert a.find_article_by_id("x").tags == ["t"]
+    finally:
+        a.close()
+        b.close()
+    assert _state(data_file, "y") == ("A 改 y", ["u"])
+    assert _state(data_file) == ("原标题", ["b"])
@@ -0,0 +1,102 @@
+# tests/test_find_articles.py
+"""不完整加载、只按 ID 读取文章：结果须与完整加载后的 DataManager 一致"""
+import io
+import json
+import os
+
+import pytest
+
+from core import cli
+from core.article import Article
+from core.data_manager import DataManager
+from core.storage import open_storage
+
+IDS = ["a00", "a01", "a02", "a03", "new", "missing"]
+
+
+def _write_data(path):
+    dm = DataManager(path, log_stream=io.StringIO())
+    for i in range(50):
+        dm.add_article(Article(f"文章{i}", [f"t{i % 3}", "共同"], article_id=f"a{i:02d}"))
+    dm.save_data()
+    # 以下修改只写入变更日志，快照中仍是旧内容
+    dm.update_article_title(dm.find_article_by_id("a01"), "改过的标题")
+    dm.update_article_tags(dm.find_article_by_id("a02"), ["新标签"])
+    dm.remove_article("a03")
+    dm.add_article(Article("新文章", ["x"], article_id="new"))
+    dm.close()
+    return path
+
+
+@pytest.fixture(params=["articles.snap", "articles.db"])
+def data_file(request, tmp_path):
+    return _write_data(str(tmp_path / request.param))
+
+
+def _loaded(path):
+    dm = DataManager(path, log_stream=io.StringIO())
+    try:
+        return {article_id: dm.find_article_by_id(article_id) for article_id in IDS}
+    finally:
+        dm.close()
+
+
+def _as_dicts(found):
+    return {article_id: article and article.to_dict() for article_id, article in found.items()}
+
+
+def test_matches_full_load(data_file):
+    if data_file.endswith(".snap"):
+        assert os.path.getsize(data_file + ".log") > 0
+    storage = open_storage(data_file, log=lambda message: None)
+    try:
+        found = storage.find_articles(IDS)
+    finally:
+        storage.close()
+    assert _as_dicts(found) == _as_dicts(_loaded(data_file))
+    assert found["a01"].title == "改过的标题" and found["a03"] is None and found["missing"] is None
+
+
+def test_json_storage_needs_full_load(tmp_path):
+    storage = open_storage(str(tmp_path / "articles.json"), log=lambda message: None)
+    assert storage.find_articles(["a00"]) is None
+
+
+def test_cli_get_does_not_load_everything(data_file, monkeypatch, capsys):
+    def no_full_load(self):
+        raise AssertionError("不应完整加载")
+
+    monkeypatch.setattr(DataManager, "load_data", no_full_load)
+    assert cli.main(["--data", data_file, "get", "a01", "new"]) == 0
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [(line["id"], line["title"]) for line in lines] == [("a01", "改过的标题"), ("new", "新文章")]
+    assert cli.main(["--data", data_file, "get", "a03"]) == 1
+
+
+def _content(article):
+    data = article if isinstance(article, dict) else article.to_dict()
+    return data["id"], data["title"], data["tags"], data.get("revision")
+
+
+def test_snapshot_articles_are_decoded_on_demand(tmp_path):
+    snap = DataManager(_write_data(str(tmp_path / "articles.snap")), log_stream=io.StringIO())
+    reference = DataManager(_write_data(str(tmp_path / "articles.json")), log_stream=io.StringIO())
+    try:
+        # 建立索引、统计与全量查询都不把快照中的文章解码成 Article，只有日志中修改过的文章（a01、a02、new）是
+        assert snap._articles.decoded_count == 3
+        assert snap.get_statistics() == reference.get_statistics()
+        assert snap.explain_query("title:/文章1/") == reference.explain_query("title:/文章1/")
+        assert snap._articles.decoded_count == 3
+        # 只有返回的文章才解码
+        found = snap.query("t1 AND title:/文章1/")
+        assert [article.id for article in found] == [article.id for article in reference.query("t1 AND title:/文章1/")]
+        assert snap._articles.decoded_count == 3 + len(found)
+        assert snap.find_article_by_id("a10") is snap.find_article_by_id("a10")
+        # 两份数据分别写入，修改时间戳不同
+        assert [_content(article) for article in snap.iter_articles()] == \
+            [_content(article) for article in reference.iter_articles()]
+        assert [_content(data) for data in snap.export_changes()["articles"]] == \
+            [_content(data) for data in reference.export_changes()["articles"]]
+    finally:
+        snap.close()
+        reference.close()
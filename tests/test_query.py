@@ -0,0 +1,95 @@
+# tests/test_query.py
+"""查询语言：规范化文本（缓存键）的唯一性，以及索引裁剪后的结果与逐篇暴力校验一致"""
+import io
+import random
+
+import pytest
+
+from core.article import Article
+from core.data_manager import DataManager
+from core.query import TAG_SEPARATOR, QuerySyntaxError, _Parser, _predicate, compile_query, format_query
+from core.title_search import normalize_text
+
+WORDS = ["学习", "深度", "机器", "网络", "Net", "net", "=x", "a", "ab", "图像", "入门"]
+
+
+@pytest.fixture
+def dm(tmp_path):
+    rng = random.Random(3)
+    manager = DataManager(str(tmp_path / "articles.json"), log_stream=io.StringIO())
+    for i in range(300):
+        title = " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 4)))
+        tags = list(dict.fromkeys(rng.choice(WORDS) + rng.choice(["", "1", "ab"])
+                                  for _ in range(rng.randint(0, 3))))
+        manager.add_article(Article(title, tags, article_id=f"a{i:03d}"))
+    yield manager
+    manager.close()
+
+
+def _brute_force(dm, text):
+    match = _predicate(_Parser(text).parse())
+    return [article.id for article in dm.iter_articles()
+            if match(article, TAG_SEPARATOR.join(article.tags), normalize_text(article.title))]
+
+
+def _random_query(rng, depth=0):
+    roll = rng.random()
+    if depth < 3 and roll < 0.35:
+        op = rng.choice([" ", " AND ", " OR "])
+        return "(" + op.join(_random_query(rng, depth + 1) for _ in range(rng.randint(2, 3))) + ")"
+    if depth < 3 and roll < 0.45:
+        return "NOT " + _random_query(rng, depth + 1)
+    word = rng.choice(WORDS)
+    return rng.choice([
+        word,
+        f'"{word}"',
+        f"title:{word}",
+        f'tag:"{word}"',
+        f"tag:={word}",
+        f"/^{word}/i",
+        f"tag:/{word}$/",
+    ])
+
+
+def test_equals_prefixed_phrase_is_not_exact_tag(dm):
+    substring, exact = compile_query('tag:"=x"'), compile_query("tag:==x")
+    assert substring.root.kind == "substring" and exact.root.kind == "exact"
+    assert substring.text != exact.text
+    assert compile_query(substring.text).root == substring.root
+    # 先执行精确查询写入缓存，子串查询不能读到它的结果
+    assert dm.query("tag:==x") == [a for a in dm.iter_articles() if a.has_tag("=x")]
+    assert [a.id for a in dm.query('tag:"=x"')] == _brute_force(dm, 'tag:"=x"')
+
+
+def test_format_query_round_trips(dm):
+    # 规范化会展开嵌套的 AND/OR，因此比较再次规范化的文本与查询结果，而不是语法树
+    rng = random.Random(11)
+    for _ in range(300):
+        original = _random_query(rng)
+        text = format_query(_Parser(original).parse())
+        assert format_query(_Parser(text).parse()) == text, original
+        assert _brute_force(dm, text) == _brute_force(dm, original), original
+
+
+def test_planner_matches_brute_force(dm):
+    rng = random.Random(5)
+    for _ in range(300):
+        text = _random_query(rng)
+        dm.search_cache.clear()
+        assert [a.id for a in dm.query(text)] == _brute_force(dm, text), text
+
+
+def test_results_follow_edits(dm):
+    before = [a.id for a in dm.query("tag:=入门 OR title:学习")]
+    article = dm.find_article_by_id("a000")
+    dm.update_article_tags(article, ["入门"])
+    after = [a.id for a in dm.query("tag:=入门 OR title:学习")]
+    assert "a000" in after
+    assert after == _brute_force(dm, "tag:=入门 OR title:学习")
+    assert set(before) <= set(after)
+
+
+@pytest.mark.parametrize("text", ["", "(a", "a)", "tag:", "tag:=(a)", "tag:=/a/", "/(/", '"a'])
+def test_syntax_errors(text):
+    with pytest.raises(QuerySyntaxError):
+        compile_query(text)
@@ -0,0 +1,158 @@
+# tests/test_sync.py
+"""增量变更集：两台机器各自修改后互相同步，检查收敛、重复应用无副作用与删除记录"""
+import io
+import random
+import time
+
+import pytest
+
+from core.article import Article
+from core.data_manager import DataManager
+
+
+def _open(path) -> DataManager:
+    return DataManager(str(path), log_stream=io.StringIO())
+
+
+def _state(dm):
+    return {article.id: (article.title, article.tags) for article in dm.iter_articles()}
+
+
+@pytest.fixture
+def replicas(tmp_path):
+    """两个从同一份数据出发的副本"""
+    origin = _open(tmp_path / "a.json")
+    for i in range(20):
+        origin.add_article(Article(f"文章{i}", [f"t{i % 4}"], article_id=f"a{i:02d}"))
+    b = _open(tmp_path / "b.json")
+    b.apply_changes(origin.export_changes())
+    yield origin, b
+    origin.close()
+    b.close()
+
+
+def _random_edits(dm, rng, count):
+    for _ in range(count):
+        ids = [article.id for article in dm.iter_articles()]
+        roll = rng.random()
+        if roll < 0.2 or not ids:
+            dm.add_article(Article(f"新文章{rng.random():.6f}", ["new"]))
+        elif roll < 0.35:
+            dm.remove_article(rng.choice(ids))
+        elif roll < 0.7:
+            article = dm.find_article_by_id(rng.choice(ids))
+            dm.update_article_title(article, f"{article.title}+{rng.randint(0, 9)}")
+        else:
+            article = dm.find_article_by_id(rng.choice(ids))
+            dm.update_article_tags(article, [f"t{rng.randint(0, 5)}", "x"][:rng.randint(1, 2)])
+        time.sleep(0.002)
+
+
+def test_full_export_copies_everything(replicas):
+    a, b = replicas
+    assert _state(b) == _state(a)
+
+
+def test_replicas_converge_after_concurrent_edits(replicas):
+    a, b = replicas
+    rng = random.Random(1)
+    a_seen, b_seen = a.max_revision, b.max_revision
+    for _ in range(5):
+        _random_edits(a, rng, 10)
+        _random_edits(b, rng, 10)
+        from_a, from_b = a.export_changes(a_seen), b.export_changes(b_seen)
+        b.apply_changes(from_a)
+        a.apply_changes(from_b)
+        # 对方应用后产生的本地修订也在下次导出中，不影响收敛
+        a_seen, b_seen = from_a["until"], from_b["until"]
+    # 最后一轮互相应用引入的变更再同步一次
+    b.apply_changes(a.export_changes(a_seen))
+    a.apply_changes(b.export_changes(b_seen))
+    assert _state(a) == _state(b)
+
+
+def test_apply_is_idempotent(replicas):
+    a, b = replicas
+    since = a.max_revision
+    a.update_article_title(a.find_article_by_id("a01"), "改过的标题")
+    a.remove_article("a02")
+    changes = a.export_changes(since)
+    first = b.apply_changes(changes)
+    assert (first["updated"], first["deleted"]) == (1, 1)
+    state, revision = _state(b), b.max_revision
+    second = b.apply_changes(changes)
+    assert second == {"added": 0, "updated": 0, "deleted": 0, "skipped": 2}
+    assert _state(b) == state and b.max_revision == revision
+
+
+def test_order_of_application_does_not_matter(tmp_path, replicas):
+    a, b = replicas
+    since_a, since_b = a.max_revision, b.max_revision
+    a.update_article_title(a.find_article_by_id("a03"), "A 改的")
+    time.sleep(0.002)
+    b.update_article_title(b.find_article_by_id("a03"), "B 改的")
+    b.remove_article("a04")
+    from_a, from_b = a.export_changes(since_a), b.export_changes(since_b)
+
+    first, second = _open(tmp_path / "c.json"), _open(tmp_path / "d.json")
+    try:
+        base = a.export_changes()
+        for replica in (first, second):
+            replica.apply_changes(base)
+        first.apply_changes(from_a)
+        first.apply_changes(from_b)
+        second.apply_changes(from_b)
+        second.apply_changes(from_a)
+        assert _state(first) == _state(second)
+        assert first.find_article_by_id("a03").title == "B 改的"
+        assert first.find_article_by_id("a04") is None
+    finally:
+        first.close()
+        second.close()
+
+
+def test_delta_contains_only_changes_since_checkpoint(replicas):
+    a, _ = replicas
+    checkpoint = a.max_revision
+    assert a.export_changes(checkpoint)["articles"] == []
+    a.update_article_tags(a.find_article_by_id("a05"), ["改"])
+    a.update_article_tags(a.find_article_by_id("a05"), ["又改"])
+    a.remove_article("a06")
+    delta = a.export_changes(checkpoint)
+    assert [article["id"] for article in delta["articles"]] == ["a05"]
+    assert delta["articles"][0]["tags"] == ["又改"]
+    assert [entry["id"] for entry in delta["deleted"]] == ["a06"]
+    assert delta["until"] == a.max_revision
+    assert a.export_changes(delta["until"])["articles"] == []
+
+
+def test_tombstones_block_stale_edits_and_survive_reload(tmp_path, replicas):
+    a, b = replicas
+    since_a, since_b = a.max_revision, b.max_revision
+    b.update_article_title(b.find_article_by_id("a07"), "删除前的修改")
+    time.sleep(0.002)
+    a.remove_article("a07")
+    stale_edit, deletion = b.export_changes(since_b), a.export_changes(since_a)
+    a.close()
+
+    reopened = _open(tmp_path / "a.json")
+    try:
+        assert "a07" in reopened.tombstones
+        assert reopened.apply_changes(stale_edit)["skipped"] == 1
+        assert reopened.find_article_by_id("a07") is None
+        b.apply_changes(deletion)
+        assert b.find_article_by_id("a07") is None
+
+        # 晚于删除时间的修改会恢复这篇文章
+        time.sleep(0.002)
+        restored = {**stale_edit, "articles": [{**stale_edit["articles"][0], "modified": int(time.time() * 1000)}]}
+        assert reopened.apply_changes(restored)["added"] == 1
+        assert reopened.find_article_by_id("a07").title == "删除前的修改"
+    finally:
+        reopened.close()
+
+
+def test_rejects_unknown_format(replicas):
+    _, b = replicas
+    with pytest.raises(ValueError):
+        b.apply_changes({"format": "something-else"})
@@ -0,0 +1,49 @@
+# tests/test_title_dedup.py
+"""标题查重：会议前缀只去掉真正的会议/期刊缩写，不误伤标题开头的模型名"""
+import io
+
+import pytest
+
+from core.article import Article
+from core.data_manager import DataManager
+from core.title_dedup import title_key
+
+
+@pytest.mark.parametrize("title, key", [
+    ("(AAAI 2025) 注意力机制", "注意力机制"),
+    ("【CVPR 2025】注意力机制", "注意力机制"),
+    ("ICCV 2025 Oral | 注意力机制", "注意力机制"),
+    ("CVPR 26 Highlight | 注意力机制", "注意力机制"),
+    ("NeurIPS2025 | 注意力机制", "注意力机制"),
+    ("TPAMI | 注意力机制", "注意力机制"),
+    ("TGRS 2025 | 注意力机制", "注意力机制"),
+    ("GenDet: 注意力机制", "gendet注意力机制"),
+    ("FlashDepth | 注意力机制", "flashdepth注意力机制"),
+    ("POLAFORMER: 注意力机制", "polaformer注意力机制"),
+    ("YOLOv12: 注意力机制", "yolov12注意力机制"),
+    ("[ICCV'25 Oral] 注意力机制", "注意力机制"),
+    ("(2025 TPAMI) 注意力机制", "注意力机制"),
+    ("【转载】注意力机制", "转载注意力机制"),
+])
+def test_title_key(title, key):
+    assert title_key(title) == key
+
+
+@pytest.mark.parametrize("first, second", [
+    ("(Re)thinking attention", "(Un)thinking attention"),
+    ("[Survey] Diffusion models", "[Benchmark] Diffusion models"),
+])
+def test_leading_brackets_that_are_not_venues_are_kept(first, second):
+    assert title_key(first) != title_key(second)
+
+
+def test_model_names_are_not_duplicates(tmp_path):
+    dm = DataManager(str(tmp_path / "articles.json"), log_stream=io.StringIO())
+    try:
+        dm.add_article(Article("GenDet: 将检测重构为图像生成任务", article_id="gendet"))
+        dm.add_article(Article("CVPR 2025 | 高效的目标检测", article_id="venue"))
+        assert not any(dm.find_duplicate_titles("BarNet: 将检测重构为图像生成任务").values())
+        duplicates = dm.find_duplicate_titles("ICCV 2025 | 高效的目标检测")
+        assert [article.id for article in duplicates["normalized"]] == ["venue"]
+    finally:
+        dm.close()
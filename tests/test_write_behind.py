@@ -0,0 +1,118 @@
+# tests/test_write_behind.py
+"""后台延迟写入：磁盘写入（含等待存储锁、fsync 与日志压缩）期间，界面线程的修改不必等待"""
+import io
+import threading
+import time
+
+import pytest
+
+from core.article import Article
+from core.data_manager import DataManager
+
+SLOW = 0.3
+
+
+def _reopen(path):
+    dm = DataManager(path, log_stream=io.StringIO())
+    try:
+        return {article.id: (article.title, article.tags) for article in dm.iter_articles()}
+    finally:
+        dm.close()
+
+
+def _slow_down(dm, method):
+    """让存储后端的 method 每次调用都耗时 SLOW 秒，返回首次开始调用时置位的事件"""
+    started = threading.Event()
+    original = getattr(dm.storage, method)
+
+    def slow(*args, **kwargs):
+        started.set()
+        time.sleep(SLOW)
+        return original(*args, **kwargs)
+
+    setattr(dm.storage, method, slow)
+    return started
+
+
+@pytest.fixture(params=["articles.json", "articles.snap", "articles.db"])
+def path(request, tmp_path):
+    return str(tmp_path / request.param)
+
+
+def test_edits_do_not_wait_for_a_slow_write(path):
+    dm = DataManager(path, log_stream=io.StringIO(), flush_every=1)
+    try:
+        started = _slow_down(dm, "append")
+        dm.add_article(Article("第一篇", ["a"], article_id="one"))
+        assert started.wait(5)
+        begin = time.monotonic()
+        dm.add_article(Article("第二篇", ["b"], article_id="two"))
+        dm.update_article_title(dm.find_article_by_id("one"), "写入期间改的标题")
+        dm.remove_article("two")
+        assert time.monotonic() - begin < SLOW / 2
+    finally:
+        dm.close()
+    assert _reopen(path) == {"one": ("写入期间改的标题", ["a"])}
+
+
+def test_edits_do_not_wait_for_compaction(path):
+    dm = DataManager(path, log_stream=io.StringIO(), flush_every=1, compact_threshold=3)
+    try:
+        started = _slow_down(dm, "save_all")
+        for i in range(5):
+            dm.add_article(Article(f"文章{i}", [f"t{i}"], article_id=f"a{i}"))
+        if not path.endswith(".db"):
+            # SQLite 没有日志压缩
+            assert started.wait(5)
+        begin = time.monotonic()
+        dm.update_article_tags(dm.find_article_by_id("a0"), ["压缩期间改的"])
+        assert time.monotonic() - begin < SLOW / 2
+    finally:
+        dm.close()
+    state = _reopen(path)
+    assert state["a0"] == ("文章0", ["压缩期间改的"])
+    assert sorted(state) == [f"a{i}" for i in range(5)]
+
+
+def test_other_process_changes_still_merge(path):
+    dm = DataManager(path, log_stream=io.StringIO(), flush_every=1)
+    other = DataManager(path, log_stream=io.StringIO())
+    try:
+        started = _slow_down(dm, "append")
+        dm.add_article(Article("本进程", ["a"], article_id="mine"))
+        assert started.wait(5)
+        # 另一个进程等本进程写完才能写入；本进程在写入期间的修改跳过合并，稍后再合并
+        writer = threading.Thread(target=other.add_article, args=(Article("其他进程", ["b"], article_id="theirs"),))
+        writer.start()
+        dm.update_article_tags(dm.find_article_by_id("mine"), ["c"])
+        writer.join()
+        dm.refresh()
+        assert dm.find_article_by_id("theirs") is not None
+    finally:
+        other.close()
+        dm.close()
+    assert _reopen(path) == {"mine": ("本进程", ["c"]), "theirs": ("其他进程", ["b"])}
+
+
+def test_failed_append_is_saved_in_the_background(path):
+    dm = DataManager(path, log_stream=io.StringIO(), flush_every=1)
+    try:
+        original = dm.storage.append
+        calls = []
+
+        def fail_once(record):
+            calls.append(record)
+            if len(calls) == 1:
+                raise OSError("磁盘已满")
+            return original(record)
+
+        dm.storage.append = fail_once
+        dm.add_article(Article("第一篇", ["a"], article_id="one"))
+        deadline = time.monotonic() + 5
+        while dm.dirty and time.monotonic() < deadline:
+            time.sleep(0.05)
+        # 由后台线程整体保存，不必等到关闭
+        assert not dm.dirty
+        assert _reopen(path) == {"one": ("第一篇", ["a"])}
+    finally:
+        dm.close()